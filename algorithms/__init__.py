@@ -1,11 +1,17 @@
 import abc
+import copy
 import logging
+import multiprocessing
+import time
 
 import numpy as np
+from scipy import stats
 
-from core.distribution import NormalDistribution
+from core import seeding
+from core.corpus import SequenceCorpus
+from core.distribution import KdeDistribution, NormalDistribution
 from core.performance import EnergyDistance, MutualInformationPerformance
-from core.rule import Rule
+from core.rule import Rule, RuleSet
 
 RESULT_MU = "Mu"
 RESULT_SIGMA = "Sigma"
@@ -20,6 +26,10 @@ CONFIDENCE_99 = 2.576
 
 
 class Matcher(abc.ABC):
+    # attributes that do not influence the result of match. All other attributes are part of the key of a PairCache.
+    # Subclasses add attributes that are set from the keyword arguments of every call.
+    _TRANSIENT = frozenset({"_logger", "_sequence", "processes", "cache", "checkpointInterval"})
+
     def __init__(self, name):
         if (name is None):
             name = __name__
@@ -27,98 +37,209 @@ class Matcher(abc.ABC):
         self._logger.setLevel(logging.TRACE)
         self.trimCost = True
         self.zScore = CONFIDENCE_50
+        # number of sequences of a corpus processed in parallel
+        self.processes = multiprocessing.cpu_count()
+        # optional PairCache consulted by match and matchAll
+        self.cache = None
+        # seconds between two checkpoints of matchAll and matchTransitive
+        self.checkpointInterval = 60
+        # evaluate the pdf of the lags in a table when calculating the success of a rule. Faster for many events
+        self.tabulateSuccess = False
         np.set_printoptions(precision=4, linewidth=150, threshold=10000)
 
         self._sequence = None
 
-    def matchAll(self, sequence, alpha=0.05, **kwargs):
-        """ Finds all reasonable correlation in a sequence of events.
-        Check parseArgs for additional parameters. All detected correlations are return as a list and stored in
-        sequence.calculatedRules.
+    def __getstate__(self):
+        # the connection of a PairCache can not be pickled, e.g. for the bound methods used as targets of processes.
+        # Workers only compute matchings, the cache is consulted by the parent process.
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
+
+    def matchAll(self, sequence, alpha=0.05, checkpoint=None, resume=False, **kwargs):
+        """ Finds all reasonable correlation in a sequence of events or a SequenceCorpus.
+        Check parseArgs for additional parameters. All detected correlations are returned as a RuleSet containing at
+        most one rule for each pair of event types.
+
+        If checkpoint is a ResultStore, the processed pairs and their rules are written to it every
+        self.checkpointInterval seconds. With resume=True, pairs processed by a previous run are loaded instead of
+        being matched again.
         """
         eventTypes = self.__cleanUpEventTypes(sequence)
-        result = []
-
-        for trigger in eventTypes:
-            for response in eventTypes:
-                # TODO decide A -> B or B -> A
-                rule = self.__matchIfReasonable(sequence, trigger, response, alpha, **kwargs)
-                if (rule is not None):
-                    result.append(rule)
-        return self.__cleanUpResult(result)
+        result = RuleSet()
+
+        fingerprint = None if (checkpoint is None) else \
+            self.__getFingerprint(sequence, eventTypes, method="matchAll", alpha=alpha, kwargs=kwargs)
+        with _Progress(checkpoint, resume, self.checkpointInterval, fingerprint) as progress:
+            for trigger in eventTypes:
+                for response in eventTypes:
+                    # TODO decide A -> B or B -> A
+                    rule = self.__matchOrRestore(progress, sequence, trigger, response, alpha, **kwargs)
+                    if (rule is not None):
+                        result.add(rule)
+        return result
 
-    def matchTransitive(self, sequence, start, alpha=0.05, **kwargs):
+    def matchTransitive(self, sequence, start, alpha=0.05, checkpoint=None, resume=False, **kwargs):
+        """ Finds all correlations reachable from start. See matchAll for checkpoint and resume. """
         nodes = [start]
         visited = []
 
         eventTypes = self.__cleanUpEventTypes(sequence)
-        result = []
+        result = RuleSet()
+
+        fingerprint = None if (checkpoint is None) else \
+            self.__getFingerprint(sequence, eventTypes, method="matchTransitive", start=start, alpha=alpha,
+                                  kwargs=kwargs)
+        with _Progress(checkpoint, resume, self.checkpointInterval, fingerprint) as progress:
+            while (len(nodes)):
+                trigger = nodes.pop()
+                if (trigger in visited):
+                    continue
+                visited.append(trigger)
+                self._logger.info("Testing '{}'".format(trigger))
+
+                for response in eventTypes:
+                    rule = self.__matchOrRestore(progress, sequence, trigger, response, alpha, **kwargs)
+                    if (rule is not None):
+                        result.add(rule)
+                        nodes.append(response)
+        return result
 
-        while (len(nodes)):
-            trigger = nodes.pop()
-            if (trigger in visited):
-                continue
-            visited.append(trigger)
-            self._logger.info("Testing '{}'".format(trigger))
+    def matchIncremental(self, sequence, rules, events, alpha=0.05, threshold=0.1, **kwargs):
+        """ Updates the rules of a sequence after new events were captured. The events are added to sequence.
 
-            for response in eventTypes:
-                rule = self.__matchIfReasonable(sequence, trigger, response, alpha, **kwargs)
+        Only pairs of event types whose number of events changed by more than the relative threshold are tested again.
+        Each unordered pair is matched once, in the orientation of its previous rule if one exists. Pairs with a
+        previous rule are warm started from this rule (see _getWarmStart) and the rule is replaced or removed if the
+        pair is no longer correlated. All other rules are kept unchanged.
+        :param rules: Rules calculated before the events were added, e.g. sequence.calculatedRules
+        :param events: New events
+        :return: RuleSet containing the updated rules
+        """
+        before = sequence.getStatistics()
+        counts = {eventType: before.getCount(eventType) for eventType in before.eventTypes}
+        sequence.addEvents(events)
+        after = sequence.getStatistics()
+        changed = {eventType for eventType in after.eventTypes
+                   if (abs(after.getCount(eventType) - counts.get(eventType, 0)) >
+                       threshold * max(counts.get(eventType, 0), 1))}
+        self._logger.info("Matching event types {} again".format(sorted(changed)))
+
+        existing = RuleSet(rules)
+        eventTypes = self.__cleanUpEventTypes(sequence)
+        matched = set()
+        added = []
+        for i, a in enumerate(eventTypes):
+            for b in eventTypes[i + 1:]:
+                if (a not in changed and b not in changed):
+                    continue
+                # match tests both orientations, hence each unordered pair is matched once
+                previous = existing.get(a, b)
+                if (previous is None):
+                    previous = existing.get(b, a)
+                if (previous is None):
+                    trigger, response, warmStart = a, b, {}
+                else:
+                    trigger, response, warmStart = previous.trigger, previous.response, self._getWarmStart(previous)
+
+                rule = self.__matchIfReasonable(sequence, trigger, response, alpha, **dict(kwargs, **warmStart))
+                matched.add(frozenset((a, b)))
                 if (rule is not None):
-                    result.append(rule)
-                    nodes.append(response)
-        return self.__cleanUpResult(result)
-
-    @staticmethod
-    def __cleanUpResult(result):
-        l = []
-        processed = set()
-        for rule in result:
-            pair = (rule.trigger, rule.response)
-            if (pair in processed):
-                continue
-            processed.add(pair)
-            l.append(rule)
-        return l
+                    added.append(rule)
+
+        # replaced rules are dropped all at once instead of removing them one by one
+        return RuleSet([rule for rule in existing if (frozenset((rule.trigger, rule.response)) not in matched)] +
+                       added)
+
+    def _getWarmStart(self, rule):
+        """ Returns additional keyword arguments for matching the trigger and response of a previously calculated rule
+        again. Matchers with an initial guess use it to start from the previous result. """
+        return {}
+
+    def __getFingerprint(self, sequence, eventTypes, **arguments):
+        """ Identifies a run of matchAll or matchTransitive by the timestamps of all event types, the state of this
+        matcher and the arguments. A checkpoint is only resumed by a run with the same fingerprint. """
+        from algorithms.pairCache import PairCache
+
+        vectors = [seq.asVector(eventType) for seq in Matcher.__getMembers(sequence) for eventType in eventTypes]
+        arguments["eventTypes"] = [str(eventType) for eventType in eventTypes]
+        return PairCache.getMatchKey(self, PairCache.getVectorKey(vectors, []), arguments)
+
+    def __matchOrRestore(self, progress, sequence, trigger, response, alpha, **kwargs):
+        """ Returns the rule of a pair processed by a previous run or matches the pair. """
+        done, rule = progress.get(trigger, response)
+        if (not done):
+            rule = self.__matchIfReasonable(sequence, trigger, response, alpha, **kwargs)
+            progress.add(trigger, response, rule)
+        elif (rule is not None):
+            self._sequence = sequence
+            self.__connectEventPairs(rule.trigger, rule.response, rule.data.get(RESULT_IDX))
+        return rule
 
     # noinspection PyMethodMayBeStatic
     def __cleanUpEventTypes(self, sequence, limit=5):
-        result = []
-        for eventType in sequence.eventTypes:
-            if (len(sequence.getEvents(eventType)) > limit):
-                result.append(eventType)
-        return result
+        statistics = sequence.getStatistics()
+        # sorted, so pairs are matched and seeded in the same order independent of the hash seed of python
+        return sorted((eventType for eventType in sequence.eventTypes if (statistics.getCount(eventType) > limit)),
+                      key=str)
 
-    def __matchIfReasonable(self, sequence, trigger, response, alpha, **kwargs):
+    def __matchIfReasonable(self, sequence, trigger, response, alpha, useCache=True, **kwargs):
         if (trigger == response):
             return None
         self._logger.debug("Matching '{}' with '{}'".format(trigger, response))
 
-        seqTrigger = sequence.asVector(trigger)
-        seqResponse = sequence.asVector(response)
+        members = Matcher.__getMembers(sequence)
+        seqTrigger = [seq.asVector(trigger) for seq in members]
+        seqResponse = [seq.asVector(response) for seq in members]
 
-        performance = EnergyDistance()
-        score, pValue = performance.compute(seqTrigger, seqResponse)
+        score, pValue = self.__getCorrelation(seqTrigger, seqResponse, useCache)
         if (pValue <= alpha):
             self._logger.info("Found correlated events '{}' and '{}'".format(trigger, response))
-            if (len(seqTrigger) < len(sequence.events) / 200 or len(seqResponse) < len(sequence.events) / 200):
+            statistics = sequence.getStatistics()
+            if (statistics.getFrequency(trigger) < 1 / 200 or statistics.getFrequency(response) < 1 / 200):
                 self._logger.warn("Too few samples. Skipping events")
                 return None
 
             # noinspection PyNoneFunctionAssignment
-            rule, data = self.match(sequence, trigger, response, **kwargs)
+            rule, data = self.match(sequence, trigger, response, useCache=useCache, **kwargs)
             return rule
         return None
 
-    def match(self, sequence, trigger, response, enforceNormal=False, **kwargs):
-        """ Computes a correlation of two event types. Check parseArgs for additional parameters. """
+    def match(self, sequence, trigger, response, enforceNormal=False, useCache=True, **kwargs):
+        """ Computes a correlation of two event types. Check parseArgs for additional parameters.
+
+        If sequence is a SequenceCorpus, each sequence is processed separately and in parallel. The lag samples of all
+        sequences are pooled and indices in the result refer to the pooled vectors (see SequenceCorpus.getOffsets).
+
+        If self.cache is set, results of identical vectors, matcher settings and kwargs are loaded from the cache
+        instead. Use useCache=False to bypass the cache.
+        """
         self._sequence = sequence
         self._parseArgs(kwargs)
-        triggerVector = self._sequence.asVector(trigger)
-        responseVector = self._sequence.asVector(response)
-        if (len(triggerVector) == 0 or len(responseVector) == 0):
+        members = Matcher.__getMembers(sequence)
+        triggerVectors = [seq.asVector(trigger) for seq in members]
+        responseVectors = [seq.asVector(response) for seq in members]
+
+        key = None
+        if (useCache and self.cache is not None):
+            arguments = dict(kwargs, enforceNormal=enforceNormal, corpus=isinstance(sequence, SequenceCorpus))
+            key = self.cache.getMatchKey(self, self.cache.getVectorKey(triggerVectors, responseVectors), arguments)
+            cached = self.cache.getMatch(key)
+            if (cached is not None):
+                self._logger.debug("Loaded result of '{}' and '{}' from cache".format(trigger, response))
+                trigger, response, data, score, successTrigger, successResponse = cached
+                rule = self.__createRule(members, trigger, response, data, score, enforceNormal,
+                                         (successTrigger, successResponse))
+                return (rule, data)
+
+        selected = [i for i in range(len(members)) if (len(triggerVectors[i]) > 0 and len(responseVectors[i]) > 0)]
+        if (len(selected) == 0):
             raise ValueError('No events with id {} and/or {} found.'.format(trigger, response))
 
-        data = self._compute(triggerVector, responseVector)
+        if (isinstance(sequence, SequenceCorpus)):
+            data = self.__computeCorpus(members, selected, triggerVectors, responseVectors)
+        else:
+            data = self._compute(triggerVectors[0], responseVectors[0])
 
         samples = data[RESULT_KDE].samples
         if (len(samples[samples < 0]) > len(samples) / 2):
@@ -129,17 +250,124 @@ class Matcher(abc.ABC):
             trigger = response
             response = tmp
 
+        score, pValue = self.__getCorrelation(triggerVectors, responseVectors, useCache)
+        rule = self.__createRule(members, trigger, response, data, score, enforceNormal)
+        if (key is not None):
+            self.cache.putMatch(key, rule, data)
+        return (rule, data)
+
+    def __createRule(self, members, trigger, response, data, score, enforceNormal, success=None):
+        """ Creates the rule for the computed data and links the matched events. """
         dist = NormalDistribution(data[RESULT_MU], data[RESULT_SIGMA]) if enforceNormal else data[RESULT_KDE]
         rule = Rule(trigger, response, dist, data=data)
-
-        performance = EnergyDistance()
-        score, pValue = performance.compute(triggerVector, responseVector)
         rule.likelihood = score
 
-        self.__fillRuleData(self._sequence.asVector(trigger), self._sequence.asVector(response), rule)
+        self.__fillRuleData([seq.asVector(trigger) for seq in members], [seq.asVector(response) for seq in members],
+                            rule, success)
         self.__connectEventPairs(trigger, response, data[RESULT_IDX])
+        return rule
 
-        return (rule, data)
+    @staticmethod
+    def __getMembers(sequence):
+        """ Returns the list of sequences contained in sequence. """
+        if (isinstance(sequence, SequenceCorpus)):
+            return list(sequence)
+        return [sequence]
+
+    def __getCorrelation(self, triggers, responses, useCache):
+        """ Returns the correlation of trigger and response. The result is cached if self.cache is set. """
+        if (not useCache or self.cache is None):
+            return Matcher.__computeCorrelation(triggers, responses)
+        key = self.cache.getVectorKey(triggers, responses)
+        result = self.cache.getCorrelation(key)
+        if (result is None):
+            result = Matcher.__computeCorrelation(triggers, responses)
+            self.cache.putCorrelation(key, *result)
+        return result
+
+    @staticmethod
+    def __computeCorrelation(triggers, responses):
+        """ Computes the energy distance of trigger and response for each sequence. For several sequences the scores
+        are averaged weighted by the number of events and the p-values are combined with Fisher's method. """
+        if (len(triggers) == 1):
+            return EnergyDistance().compute(triggers[0], responses[0])
+
+        scores = []
+        weights = []
+        pValues = []
+        for trigger, response in zip(triggers, responses):
+            if (len(trigger) == 0 or len(response) == 0):
+                continue
+            score, pValue = EnergyDistance().compute(trigger, response)
+            scores.append(score)
+            weights.append(len(trigger) + len(response))
+            pValues.append(pValue)
+        if (len(scores) == 0):
+            return (0, 1)
+        if (len(scores) == 1):
+            return (scores[0], pValues[0])
+        return (np.average(scores, weights=weights), stats.combine_pvalues(pValues)[1])
+
+    def __computeCorpus(self, members, selected, triggers, responses):
+        """ Computes the lags of each selected sequence and pools them. """
+        results = self.__computeMembers(members, selected, triggers, responses)
+        triggerOffsets = np.cumsum([0] + [len(v) for v in triggers])
+        responseOffsets = np.cumsum([0] + [len(v) for v in responses])
+
+        idx = [np.asarray(result[RESULT_IDX]).reshape(-1, 2) + [triggerOffsets[i], responseOffsets[i]]
+               for i, result in zip(selected, results) if (result[RESULT_IDX] is not None)]
+        samples = np.concatenate([result[RESULT_KDE] for result in results])
+        weights = np.array([len(result[RESULT_KDE]) for result in results])
+        mus = np.array([result[RESULT_MU] for result in results])
+        sigmas = np.array([result[RESULT_SIGMA] for result in results])
+
+        # mean and standard deviation of the mixture of all sequences
+        mu = np.average(mus, weights=weights)
+        sigma = np.sqrt(max(np.average(sigmas ** 2 + mus ** 2, weights=weights) - mu ** 2, 0))
+        return {RESULT_MU: mu, RESULT_SIGMA: sigma, RESULT_KDE: KdeDistribution(samples),
+                RESULT_IDX: np.concatenate(idx).astype(int) if (len(idx) > 0) else None, "Sequences": len(selected)}
+
+    def __computeMembers(self, members, selected, triggers, responses):
+        """ Runs _compute for each selected sequence. Up to self.processes sequences are processed in parallel. Each
+        sequence uses its own random number stream, so the result does not depend on the number of processes. """
+        seeds = dict(zip(selected, seeding.spawn(len(selected))))
+        if (self.processes <= 1 or len(selected) == 1):
+            return [self.__computeMember(members[i], triggers[i], responses[i], seeds[i]) for i in selected]
+
+        results = {}
+        queue = multiprocessing.Queue()
+        for start in range(0, len(selected), self.processes):
+            processes = []
+            for i in selected[start:start + self.processes]:
+                process = multiprocessing.Process(target=self.__computeParallel,
+                                                  args=(members[i], triggers[i], responses[i], queue, i, seeds[i],))
+                process.start()
+                processes.append(process)
+            for _ in processes:
+                i, result = queue.get()
+                if (isinstance(result, Exception)):
+                    raise result
+                results[i] = result
+            for process in processes:
+                process.join()
+        return [results[i] for i in selected]
+
+    def __computeParallel(self, sequence, trigger, response, queue, index, seed):
+        self._logger.info("Processing sequence {}".format(index))
+        try:
+            queue.put((index, self.__computeMember(sequence, trigger, response, seed)))
+        except Exception as ex:
+            queue.put((index, ex))
+
+    def __computeMember(self, sequence, trigger, response, seed):
+        """ Computes the lags of a single sequence. A copy of this matcher is used, so state of the computation is not
+        shared between sequences. Only the data required for pooling is returned. """
+        matcher = copy.copy(self)
+        matcher._sequence = sequence
+        with seeding.using(seed):
+            data = matcher._compute(trigger, response)
+        return {RESULT_MU: data[RESULT_MU], RESULT_SIGMA: data[RESULT_SIGMA], RESULT_KDE: data[RESULT_KDE].samples,
+                RESULT_IDX: data[RESULT_IDX]}
 
     def _parseArgs(self, kwargs):
         pass
@@ -162,11 +390,18 @@ class Matcher(abc.ABC):
         return result
 
     # noinspection PyMethodMayBeStatic
-    def __fillRuleData(self, trigger, response, rule):
+    def __fillRuleData(self, trigger, response, rule, success=None):
+        """ Computes statistics of the given rule. trigger and response contain one vector per sequence. success is
+        an optional tuple (successTrigger, successResponse) of a previous computation. """
         distribution = rule.distributionResponse
 
-        rule.successResponse = Matcher.__calculateRuleSuccess(trigger, response, distribution)
-        rule.successTrigger = Matcher.__calculateRuleSuccess(response, trigger, -distribution)
+        if (success is None):
+            rule.successResponse = Matcher.__calculateRuleSuccess(trigger, response, distribution,
+                                                                  tabulate=self.tabulateSuccess)
+            rule.successTrigger = Matcher.__calculateRuleSuccess(response, trigger, -distribution,
+                                                                 tabulate=self.tabulateSuccess)
+        else:
+            rule.successTrigger, rule.successResponse = success
 
         rule.data["Size"] = rule.data[RESULT_IDX].shape[0]
         # rule.data["Performance Range"] = RangePerformance().getValueByDistribution(distribution)
@@ -175,30 +410,127 @@ class Matcher(abc.ABC):
         # rule.data["Performance CondProd"] = CondProbPerformance(samples=distribution.samples).getValueByDistribution(
         #     distribution)
         # rule.data["Performance Entropy"] = EntropyPerformance().getValueByDistribution(distribution)
-        rule.data["Mutual Information"] = MutualInformationPerformance(trigger, response, len(self._sequence)) \
-            .getValueByDistribution(distribution)
+        mutualInformation = MutualInformationPerformance(self._sequence.getStatistics(), rule.trigger, rule.response)
+        rule.data["Mutual Information"] = mutualInformation.getValueByDistribution(distribution)
         rule.data["Likelihood"] = rule.likelihood
         rule.data["Success Response"] = rule.successResponse
         rule.data["Success Trigger"] = rule.successTrigger
 
     @staticmethod
-    def __calculateRuleSuccess(trigger, response, dist, threshold=0.05):
+    def __calculateRuleSuccess(triggers, responses, dist, threshold=0.05, tabulate=False, chunk=1 << 20):
+        """ Returns the fraction of triggers followed by at least one response with a pdf value of the lag above
+        threshold. All candidate lags of a chunk of triggers are evaluated at once.
+
+        If tabulate is set, the pdf is interpolated in a table (see TabulatedDistribution) and only lags within the
+        domain of the table are evaluated. Lags whose interpolated pdf is within the error bound of the table around
+        threshold are evaluated exactly, so the interpolation does not change the result. """
+        table = dist.tabulate() if (tabulate) else None
+        lower, upper = -np.inf, np.inf
+        if (table is not None and table.error < threshold):
+            # outside of the domain, the pdf is below the error bound
+            lower, upper = table.getDomain()
+
         count = 0
-        for t in trigger:
-            for r in response:
-                if (dist.getPDFValue(r - t) > threshold):
-                    count += 1
-                    break
-        return count / len(trigger)
+        for trigger, response in zip(triggers, responses):
+            trigger = np.asarray(trigger, dtype=float)
+            response = np.sort(np.asarray(response, dtype=float))
+            if (len(trigger) == 0 or len(response) == 0):
+                continue
+            begin = np.searchsorted(response, trigger + lower, side="left")
+            end = np.searchsorted(response, trigger + upper, side="right")
+            width = int((end - begin).max())
+            if (width == 0):
+                continue
+
+            offsets = np.arange(width)
+            step = max(1, chunk // width)
+            for start in range(0, len(trigger), step):
+                idx = begin[start:start + step, np.newaxis] + offsets
+                inside = idx < end[start:start + step, np.newaxis]
+                lags = (response[np.minimum(idx, len(response) - 1)] - trigger[start:start + step, np.newaxis]).ravel()
+                pdf = Matcher.__getPDFValues(dist if (table is None) else table, lags)
+                if (table is not None):
+                    uncertain = np.abs(pdf - threshold) <= table.error
+                    if (uncertain.any()):
+                        pdf[uncertain] = Matcher.__getPDFValues(dist, lags[uncertain])
+                found = inside & (pdf.reshape(inside.shape) > threshold)
+                count += np.count_nonzero(found.any(axis=1))
+        return count / sum(len(trigger) for trigger in triggers)
+
+    @staticmethod
+    def __getPDFValues(dist, x):
+        """ Returns the pdf values of dist as an array shaped like x, even if dist returns a scalar for one value. """
+        return np.broadcast_to(np.asarray(dist.getPDFValue(x), dtype=float), x.shape).copy()
 
     def __connectEventPairs(self, trigger, response, idx):
-        # TODO what happens if one event is connected several times?
+        """ Stores the matched pairs in the sequence. For a SequenceCorpus the pooled indices are split by sequence. """
         if (idx is None):
             return
-        t = self._sequence.getEvents(trigger)
-        r = self._sequence.getEvents(response)
-        for idxTrigger, idxResponse in idx:
-            t[idxTrigger].setTriggered(r[idxResponse])
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1, 2)
+        if (not isinstance(self._sequence, SequenceCorpus)):
+            self._sequence.setLinks(trigger, response, idx)
+            return
+        triggerOffsets = self._sequence.getOffsets(trigger)
+        responseOffsets = self._sequence.getOffsets(response)
+        member = np.searchsorted(triggerOffsets, idx[:, 0], side="right") - 1
+        for i, seq in enumerate(self._sequence):
+            seq.setLinks(trigger, response, idx[member == i] - [triggerOffsets[i], responseOffsets[i]])
+
+
+class _Progress:
+    """ Collects the processed pairs of matchAll and writes them periodically to a ResultStore. Without a store,
+    nothing is restored or written. A checkpoint is only resumed if it was created with the same fingerprint. """
+
+    def __init__(self, store, resume, interval, fingerprint=None):
+        self.__store = store
+        self.__interval = interval
+        self.__pending = []
+        self.__lastFlush = time.monotonic()
+        self.__done = {}
+        if (store is None):
+            return
+        if (resume):
+            self.__done = store.getProgress()
+            stored = store.getProgressFingerprint()
+            if (stored != fingerprint and (stored is not None or len(self.__done) > 0)):
+                raise ValueError("The checkpoint was created for another sequence, matcher or arguments")
+        if (len(self.__done) > 0):
+            logging.info("Resuming with {} processed pairs".format(len(self.__done)))
+        else:
+            store.clearProgress(fingerprint)
+
+    def get(self, trigger, response):
+        """ Returns the tuple (done, rule) of a pair processed by a previous run. """
+        key = (str(trigger), str(response))
+        if (key not in self.__done):
+            return (False, None)
+        pair = self.__done[key]
+        if (pair is None):
+            return (True, None)
+        rule = self.__store.getRule(pair[0], pair[1])
+        # a missing rule, e.g. removed manually, is matched again
+        return (rule is not None, rule)
+
+    def add(self, trigger, response, rule):
+        if (self.__store is None):
+            return
+        self.__pending.append((trigger, response, rule))
+        if (time.monotonic() - self.__lastFlush >= self.__interval):
+            self.flush()
+
+    def flush(self):
+        if (len(self.__pending) > 0):
+            self.__store.addProgress(self.__pending)
+            self.__pending = []
+        self.__lastFlush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        # processed pairs are kept if the run is interrupted
+        if (self.__store is not None):
+            self.flush()
 
 
 class InitialGuess(abc.ABC):
@@ -8,13 +8,21 @@ import numpy as np
 from scipy import optimize
 
 from algorithms import Matcher, RESULT_MU, RESULT_SIGMA, RESULT_KDE, RESULT_IDX, InitialGuess, CONFIDENCE_80
+from core import seeding
 from core.distribution import KdeDistribution
 
+_STEP_SIZE = 10
+
 
 class ICE(Matcher):
+    # set from the keyword arguments of every call
+    _TRANSIENT = Matcher._TRANSIENT | {"_ICE__initPose", "_ICE__initLag", "_ICE__initSigma"}
+
     def __init__(self):
         super().__init__(__name__)
         self.__initPose = None
+        self.__initLag = None
+        self.__initSigma = None
         self.__f = None
         self.__maxiter = 50
         self.__threshold = 1e-6
@@ -27,6 +35,10 @@ class ICE(Matcher):
             threshold: Threshold for offset length. If the change of the offset is smaller than threshold,
                 the calculation is considered as converged. Default if 1e-4.
             initPose: Initial guess of the offset. If not provided, initial guess is calculated from input.
+            initLag: Initial guess of the lag between trigger and response. Unlike initPose, it does not depend on
+                which of both vectors is moved.
+            initSigma: Expected spread of the lag, e.g. from a previous result. The search for the optimal offset
+                steps by a multiple of it instead of a fixed step size.
             f: Fraction of src to be used during transformation calculation. This parameter is used to eliminate
                 outliers. Allowed values are:
                     None: No outlier reduction
@@ -38,8 +50,10 @@ class ICE(Matcher):
             self.__maxiter = kwargs["maxiter"]
         if ("threshold" in kwargs):
             self.__threshold = kwargs["threshold"]
-        if ("initPos" in kwargs):
-            self.__initPose = kwargs["initPos"]
+        # the initial guess of a previous pair is not reused
+        self.__initPose = kwargs.get("initPose", kwargs.get("initPos"))
+        self.__initLag = kwargs.get("initLag")
+        self.__initSigma = kwargs.get("initSigma")
         if ("f" in kwargs):
             self.__f = kwargs["f"]
         if ("showVisualization" in kwargs):
@@ -55,6 +69,9 @@ class ICE(Matcher):
             data = model
             model = tmp
 
+        if (self.__initPose is None and self.__initLag is not None):
+            # the shorter vector is moved towards the other one
+            self.__initPose = -self.__initLag if (len(trigger) > len(response)) else self.__initLag
         if (self.__initPose is None):
             # TODO find better method for initial guess
             mean = MeanDistanceInitialGuess().computeOffset(data, model)
@@ -70,6 +87,11 @@ class ICE(Matcher):
         opt = np.array(self.__initPose).astype(np.float32)
         data += opt
 
+        stepSize = _STEP_SIZE
+        if (self.__initSigma is not None and self.__initSigma > 0):
+            # 3 sigma cover nearly all lags of the previous result
+            stepSize = 3 * self.__initSigma
+
         t = None
         for i in range(self.__maxiter):
             if (t is not None and abs(t) < self.__threshold):
@@ -77,7 +99,7 @@ class ICE(Matcher):
 
             subData, selectedIdx = self.__getSubset(data, model)
             idx = ICE._findMinimalDistance(subData, model)
-            t = ICE._findOptimalTransformation(subData, model[idx])
+            t = ICE._findOptimalTransformation(subData, model[idx], stepSize=stepSize)
             data += t
             opt += t
 
@@ -99,6 +121,14 @@ class ICE(Matcher):
         return {RESULT_MU: cost.mean(), RESULT_SIGMA: cost.std(), RESULT_KDE: KdeDistribution(cost), RESULT_IDX: idx,
                 "Offset": opt}
 
+    def _getWarmStart(self, rule):
+        if (RESULT_MU not in rule.data):
+            return {}
+        warmStart = {"initLag": float(rule.data[RESULT_MU])}
+        if (RESULT_SIGMA in rule.data):
+            warmStart["initSigma"] = float(rule.data[RESULT_SIGMA])
+        return warmStart
+
     @staticmethod
     def __visualizeCurrentStep(src, data, dataIdx, model, modelIdx):
         plt.clf()
@@ -125,7 +155,7 @@ class ICE(Matcher):
         return np.argsort(delta, axis=0)[0:k, :].flatten()
 
     @staticmethod
-    def _findOptimalTransformation(data, model, init=False):
+    def _findOptimalTransformation(data, model, init=False, stepSize=_STEP_SIZE):
         # Compute minimum of cost function
         #   sum( (data + t - model)^2 )
         # with t the variable.
@@ -136,7 +166,8 @@ class ICE(Matcher):
         else:
             result = optimize.basinhopping(ICE.__costFunction, np.zeros(1), T=0.9, niter=100,
                                            minimizer_kwargs={'args': (data, model), 'method': 'Newton-CG',
-                                                             'jac': ICE.__jacobiMatrix}, disp=False, stepsize=10)
+                                                             'jac': ICE.__jacobiMatrix}, disp=False, stepsize=stepSize,
+                                           seed=seeding.createGenerator())
         return result.x[0]
 
     @staticmethod
@@ -173,7 +204,8 @@ class ICE(Matcher):
     @staticmethod
     def __jacobiMatrix(t, data, model):
         d = (data + t) - model
-        return np.sum(np.where(d > 0)) - np.sum(np.where(d < 0))
+        # Newton-CG updates its residual in place with the dtype of the jacobian, which therefore has to be float
+        return np.float64(np.sum(np.where(d > 0)) - np.sum(np.where(d < 0)))
 
     # noinspection PyUnusedLocal
     @staticmethod
@@ -198,8 +230,10 @@ class SampleConsensusInitialGuess(InitialGuess):
         self.__minSampleDistance = 0
         self.__distanceThreshold = 50
         self.__kCorrespondence = 2
+        self.__rng = None
 
     def computeOffset(self, data, model):
+        self.__rng = seeding.createGenerator()
         guess = 0
         minError = sys.maxsize
         for i in range(self.__maxIterations):
@@ -223,7 +257,7 @@ class SampleConsensusInitialGuess(InitialGuess):
                 self.__minSampleDistance /= 2
                 iterationsWithoutSample = 0
 
-            d = np.random.choice(data, 1)
+            d = self.__rng.choice(data, 1)
             for i in result:
                 if (abs(d - i) < self.__minSampleDistance):
                     iterationsWithoutSample += 1
@@ -238,7 +272,7 @@ class SampleConsensusInitialGuess(InitialGuess):
         for d in data:
             # noinspection PyProtectedMember
             idx = ICE._findMinimalDistance(d, model, self.__kCorrespondence)
-            result.append(np.random.choice(idx, 1)[0])
+            result.append(self.__rng.choice(idx, 1)[0])
 
         return model[result]
 
@@ -4,37 +4,54 @@ import multiprocessing
 import numpy as np
 
 from algorithms import Matcher, RESULT_MU, RESULT_SIGMA, RESULT_IDX, RESULT_KDE
+from core import seeding
 from core.distribution import UniformDistribution, KdeDistribution
 
 
 class lagEM(Matcher):
+    # set from the keyword arguments of every call
+    _TRANSIENT = Matcher._TRANSIENT | {"_lagEM__threshold", "_lagEM__init"}
+
     def __init__(self):
         super().__init__(__name__)
         self.__threshold = None
+        self.__init = None
 
     def _parseArgs(self, kwargs):
         """
         Additional parameters:
             threshold: Defines a threshold for parameter convergence
+            initMu, initSigma: Optional initial guess of the lag distribution. It replaces the first of all random
+                initializations.
         """
         self.__threshold = kwargs["threshold"]
+        self.__init = (kwargs["initMu"], kwargs["initSigma"]) if ("initMu" in kwargs) else None
+
+    def _getWarmStart(self, rule):
+        if (RESULT_MU not in rule.data or RESULT_SIGMA not in rule.data):
+            return {}
+        return {"initMu": float(rule.data[RESULT_MU]), "initSigma": float(rule.data[RESULT_SIGMA])}
 
     def _compute(self, trigger, response):
         processes = []
         queue = multiprocessing.Queue()
+        # each worker draws its initializations from an independent stream
+        seeds = seeding.spawn(10)
 
         for i in range(10):
-            process = multiprocessing.Process(target=self.__computeParallel, args=(trigger, response, queue, i,))
+            process = multiprocessing.Process(target=self.__computeParallel,
+                                              args=(trigger, response, queue, i, seeds[i],))
             process.start()
             processes.append(process)
 
         result = np.zeros([10, 3])
         assignments = [[]] * 10
         for i in range(10):
-            processes[i].join()
-            res = queue.get()
-            result[i] = res[0]
-            assignments[i] = res[1]
+            index, res = queue.get()
+            result[index] = res[0]
+            assignments[index] = res[1]
+        for process in processes:
+            process.join()
         processes.clear()
         self._logger.info("Results:\n {}".format(result))
 
@@ -48,17 +65,23 @@ class lagEM(Matcher):
         return {RESULT_MU: mu, RESULT_SIGMA: std, "Likelihood": result[:, 2].max(), RESULT_IDX: idx,
                 RESULT_KDE: KdeDistribution(samples)}
 
-    def __computeParallel(self, a, b, queue, index):
+    def __computeParallel(self, a, b, queue, index, seed):
         self._logger.info("Processing batch {}".format(index))
         tmp = np.zeros([20, 3])
         tmp2 = []
+        muSeed, sigmaSeed = seed.spawn(2)
+        muDist = UniformDistribution(0, 100).setSeed(muSeed)
+        sigmaDist = UniformDistribution(3, 25).setSeed(sigmaSeed)
         for j in range(20):
             self._logger.debug("Worker[{}]: Processing round {}".format(index, j))
-            mu = UniformDistribution(0, 100).getRandom()
-            var = UniformDistribution(3, 25).getRandom() ** 2
+            if (index == 0 and j == 0 and self.__init is not None):
+                mu, var = self.__init[0], max(self.__init[1], 3) ** 2
+            else:
+                mu = muDist.getRandom()
+                var = sigmaDist.getRandom() ** 2
             mu, std, likelihood, r = fastLagEM.compute(a, b, mu, var, len(a), len(b))
             tmp[j] = np.array([mu, std, likelihood])
             tmp2.append(r)
 
         idx = np.argmax(tmp[:, 2])
-        queue.put([tmp[idx], tmp2[idx]])
+        queue.put((index, [tmp[idx], tmp2[idx]]))
@@ -21,6 +21,9 @@ class Transformation(Enum):
 
 
 class LpMatcher(Matcher):
+    # set from the keyword arguments of every call
+    _TRANSIENT = Matcher._TRANSIENT | {"_LpMatcher__algorithm"}
+
     def __init__(self):
         super().__init__(__name__)
         self.__algorithm = None
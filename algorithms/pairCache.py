@@ -0,0 +1,216 @@
+""" Persistent cache of matcher results
+
+Matching the same data again, e.g. overlapping captures of a system, computes the same permutation tests and matchings
+again. The results of each pair of event types are stored in a SQLite database. Entries are identified by the hash of
+the timestamps of trigger and response. The correlation of the vectors is independent of the matcher, the results of a
+matcher additionally depend on the matcher class, its state and the keyword arguments of match. All attributes of the
+matcher except the ones declared in Matcher._TRANSIENT are part of the key. The number of entries is bounded, the least
+recently used entries are removed first.
+"""
+
+import enum
+import hashlib
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+import core
+from algorithms import RESULT_IDX, RESULT_KDE
+from core.distribution import Distribution, KdeDistribution
+
+DEFAULT_ENTRIES = 10000
+
+_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS correlations (
+    key TEXT PRIMARY KEY,
+    score REAL NOT NULL,
+    pValue REAL NOT NULL,
+    lastAccess REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS correlationsAccess ON correlations (lastAccess);
+CREATE TABLE IF NOT EXISTS matches (
+    key TEXT PRIMARY KEY,
+    trigger TEXT NOT NULL,
+    response TEXT NOT NULL,
+    score REAL NOT NULL,
+    successTrigger REAL NOT NULL,
+    successResponse REAL NOT NULL,
+    samples BLOB NOT NULL,
+    assignment BLOB,
+    data TEXT NOT NULL,
+    lastAccess REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matchesAccess ON matches (lastAccess);
+"""
+
+
+class PairCache:
+    def __init__(self, filename=":memory:", maxEntries=DEFAULT_ENTRIES):
+        """
+        :param filename: Path of the database. It is created if it does not exist.
+        :param maxEntries: Maximum number of correlations and matches each
+        """
+        self.filename = filename
+        self.maxEntries = maxEntries
+        self.__connection = None
+        self.__getConnection()
+
+    def __getConnection(self):
+        """ Returns the connection to the database. After unpickling, e.g. in a worker process, it is opened again on
+        first use. """
+        if (self.__connection is None):
+            connection = sqlite3.connect(self.filename)
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if (version not in (0, _VERSION)):
+                connection.close()
+                raise ValueError("Unsupported version {} of pair cache '{}'".format(version, self.filename))
+            with connection:
+                connection.executescript(_SCHEMA)
+                connection.execute("PRAGMA user_version = {}".format(_VERSION))
+            self.__connection = connection
+        return self.__connection
+
+    def __getstate__(self):
+        # a connection can not be pickled, an in-memory database starts empty in the other process
+        return {"filename": self.filename, "maxEntries": self.maxEntries}
+
+    def __setstate__(self, state):
+        self.filename = state["filename"]
+        self.maxEntries = state["maxEntries"]
+        self.__connection = None
+
+    @staticmethod
+    def getVectorKey(triggers, responses):
+        """ Returns the key of the given trigger and response vectors. Both contain one vector per sequence. """
+        digest = hashlib.sha256()
+        for vectors in (triggers, responses):
+            digest.update(str(len(vectors)).encode("ascii"))
+            for vector in vectors:
+                vector = np.ascontiguousarray(vector, dtype="<f8")
+                digest.update(str(len(vector)).encode("ascii"))
+                digest.update(vector.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def getMatchKey(matcher, vectorKey, kwargs):
+        """ Returns the key of the result of matcher for the given vectors and keyword arguments. Raises a TypeError if
+        an attribute of the matcher or a keyword argument has a type without canonical representation. """
+        transient = getattr(matcher, "_TRANSIENT", ())
+        settings = {name: _canonicalize(value, name) for name, value in vars(matcher).items()
+                    if (name not in transient)}
+        content = {
+            "version": _VERSION,
+            "matcher": "{}.{}".format(matcher.__class__.__module__, matcher.__class__.__name__),
+            "vectors": vectorKey,
+            "settings": settings,
+            "kwargs": {name: _canonicalize(value, name) for name, value in kwargs.items()}
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def getCorrelation(self, key):
+        """ Returns the tuple (score, p-value) or None. """
+        connection = self.__getConnection()
+        row = connection.execute("SELECT score, pValue FROM correlations WHERE key = ?", (key,)).fetchone()
+        if (row is None):
+            return None
+        self.__touch("correlations", key)
+        return row
+
+    def putCorrelation(self, key, score, pValue):
+        connection = self.__getConnection()
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO correlations VALUES (?, ?, ?, ?)",
+                               (key, float(score), float(pValue), time.time()))
+            self.__evict(connection, "correlations")
+
+    def getMatch(self, key):
+        """ Returns the tuple (trigger, response, data, score, successTrigger, successResponse) or None. data contains
+        the kde and the assignment of the matched events. """
+        row = self.__getConnection().execute(
+            "SELECT trigger, response, data, score, successTrigger, successResponse, samples, assignment FROM matches "
+            "WHERE key = ?", (key,)).fetchone()
+        if (row is None):
+            return None
+        self.__touch("matches", key)
+
+        trigger, response, data, score, successTrigger, successResponse, samples, assignment = row
+        data = json.loads(data)
+        data[RESULT_KDE] = KdeDistribution(np.frombuffer(samples, dtype="<f8"))
+        data[RESULT_IDX] = None if (assignment is None) else \
+            np.frombuffer(assignment, dtype="<i8").reshape(-1, 2).copy()
+        return (trigger, response, data, score, successTrigger, successResponse)
+
+    def putMatch(self, key, rule, data):
+        """ Stores the result of a matcher. data is the result of Matcher._compute. """
+        data = dict(data)
+        samples = np.asarray(data.pop(RESULT_KDE).samples, dtype="<f8").tobytes()
+        assignment = data.pop(RESULT_IDX)
+        if (assignment is not None):
+            assignment = np.asarray(assignment, dtype="<i8").reshape(-1, 2).tobytes()
+        connection = self.__getConnection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(rule.trigger), str(rule.response), float(rule.likelihood), float(rule.successTrigger),
+                 float(rule.successResponse), samples, assignment,
+                 json.dumps(data, default=core.defaultJsonEncoding), time.time()))
+            self.__evict(connection, "matches")
+
+    def __touch(self, table, key):
+        connection = self.__getConnection()
+        with connection:
+            connection.execute("UPDATE {} SET lastAccess = ? WHERE key = ?".format(table), (time.time(), key))
+
+    def __evict(self, connection, table):
+        count = connection.execute("SELECT COUNT(*) FROM {}".format(table)).fetchone()[0]
+        if (count > self.maxEntries):
+            connection.execute("DELETE FROM {0} WHERE key IN (SELECT key FROM {0} ORDER BY lastAccess ASC "
+                               "LIMIT ?)".format(table), (count - self.maxEntries,))
+
+    def clear(self):
+        """ Removes all cached results. """
+        connection = self.__getConnection()
+        with connection:
+            connection.execute("DELETE FROM correlations")
+            connection.execute("DELETE FROM matches")
+
+    def close(self):
+        if (self.__connection is not None):
+            self.__connection.close()
+            self.__connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __len__(self):
+        connection = self.__getConnection()
+        return sum(connection.execute("SELECT COUNT(*) FROM {}".format(table)).fetchone()[0]
+                   for table in ("correlations", "matches"))
+
+
+def _canonicalize(value, name):
+    """ Converts value into a json serializable representation, which is identical for equal values. Arrays are
+    represented by their hash. """
+    if (value is None or isinstance(value, (bool, int, float, str))):
+        return value
+    if (isinstance(value, np.generic)):
+        return value.item()
+    if (isinstance(value, np.ndarray)):
+        value = np.ascontiguousarray(value)
+        return {"dtype": value.dtype.str, "shape": list(value.shape),
+                "data": hashlib.sha256(value.tobytes()).hexdigest()}
+    if (isinstance(value, enum.Enum)):
+        return "{}.{}".format(value.__class__.__name__, value.name)
+    if (isinstance(value, Distribution)):
+        return {"class": value.__class__.__name__, "json": _canonicalize(value.asJson(), name)}
+    if (isinstance(value, (list, tuple))):
+        return [_canonicalize(item, name) for item in value]
+    if (isinstance(value, dict)):
+        return {str(key): _canonicalize(item, name) for key, item in value.items()}
+    raise TypeError("Unable to create a cache key for '{}' of type {}".format(name, type(value).__name__))
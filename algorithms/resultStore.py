@@ -0,0 +1,250 @@
+""" Persistent store for calculated rules
+
+The rules found by a matcher are stored in a SQLite database. Scores are stored as indexed columns, lag samples and
+assignments as binary arrays in separate tables. This allows querying the best rules or a single pair of event types
+without loading the samples and assignments of all rules.
+
+Additionally, the pairs of event types already processed by Matcher.matchAll are stored as progress, so an interrupted
+run can be resumed. The progress is stored together with a fingerprint of the sequence, the matcher and its arguments.
+"""
+
+import json
+import sqlite3
+
+import numpy as np
+
+import core
+from algorithms import RESULT_IDX, RESULT_KDE
+from core import distribution
+from core.distribution import KdeDistribution
+from core.rule import Rule
+
+LIKELIHOOD = "likelihood"
+MUTUAL_INFORMATION = "mutualInformation"
+SUCCESS_TRIGGER = "successTrigger"
+SUCCESS_RESPONSE = "successResponse"
+
+SCORES = [LIKELIHOOD, MUTUAL_INFORMATION, SUCCESS_TRIGGER, SUCCESS_RESPONSE]
+
+_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    trigger TEXT NOT NULL,
+    response TEXT NOT NULL,
+    likelihood REAL,
+    mutualInformation REAL,
+    successTrigger REAL,
+    successResponse REAL,
+    size INTEGER,
+    distribution TEXT,
+    distributionTrigger TEXT,
+    data TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS rulesPair ON rules (trigger, response);
+CREATE INDEX IF NOT EXISTS rulesResponse ON rules (response);
+CREATE INDEX IF NOT EXISTS rulesLikelihood ON rules (likelihood);
+CREATE INDEX IF NOT EXISTS rulesMutualInformation ON rules (mutualInformation);
+CREATE INDEX IF NOT EXISTS rulesSuccessTrigger ON rules (successTrigger);
+CREATE INDEX IF NOT EXISTS rulesSuccessResponse ON rules (successResponse);
+CREATE TABLE IF NOT EXISTS samples (
+    rule INTEGER PRIMARY KEY REFERENCES rules (id) ON DELETE CASCADE,
+    samples BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    rule INTEGER PRIMARY KEY REFERENCES rules (id) ON DELETE CASCADE,
+    assignment BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    trigger TEXT NOT NULL,
+    response TEXT NOT NULL,
+    ruleTrigger TEXT,
+    ruleResponse TEXT,
+    PRIMARY KEY (trigger, response)
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    fingerprint TEXT NOT NULL
+);
+"""
+
+
+class ResultStore:
+    def __init__(self, filename=":memory:"):
+        """
+        :param filename: Path of the database. It is created if it does not exist.
+        """
+        self.__connection = sqlite3.connect(filename)
+        self.__connection.execute("PRAGMA foreign_keys = ON")
+        version = self.__connection.execute("PRAGMA user_version").fetchone()[0]
+        if (version not in (0, _VERSION)):
+            self.__connection.close()
+            raise ValueError("Unsupported version {} of result store '{}'".format(version, filename))
+        with self.__connection:
+            self.__connection.executescript(_SCHEMA)
+            self.__connection.execute("PRAGMA user_version = {}".format(_VERSION))
+
+    def add(self, rule):
+        """ Stores a rule. An existing rule with the same trigger and response is replaced. """
+        self.addAll([rule])
+
+    def addAll(self, rules):
+        """ Stores all given rules in a single transaction. """
+        with self.__connection:
+            for rule in rules:
+                self.__insert(rule)
+
+    def __insert(self, rule):
+        data = dict(rule.data)
+        assignment = data.pop(RESULT_IDX, None)
+        kde = data.pop(RESULT_KDE, None)
+
+        # samples of a kde are stored only once as binary array
+        dist = rule.distributionResponse
+        samples = kde.samples if (isinstance(kde, KdeDistribution)) else None
+        if (isinstance(dist, KdeDistribution)):
+            samples = dist.samples
+            data[RESULT_KDE] = isinstance(kde, KdeDistribution)
+            dist = None
+
+        self.__connection.execute("DELETE FROM rules WHERE trigger = ? AND response = ?",
+                                  (str(rule.trigger), str(rule.response)))
+        cursor = self.__connection.execute(
+            "INSERT INTO rules (trigger, response, likelihood, mutualInformation, successTrigger, successResponse, "
+            "size, distribution, distributionTrigger, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(rule.trigger), str(rule.response), _asFloat(rule.likelihood), _asFloat(data.get("Mutual Information")),
+             _asFloat(rule.successTrigger), _asFloat(rule.successResponse),
+             None if (assignment is None) else len(np.asarray(assignment).reshape(-1, 2)), _asJson(dist),
+             _asJson(rule.distributionTrigger), _asJson(data)))
+        ruleId = cursor.lastrowid
+        if (samples is not None):
+            self.__connection.execute("INSERT INTO samples (rule, samples) VALUES (?, ?)",
+                                      (ruleId, np.asarray(samples, dtype="<f8").tobytes()))
+        if (assignment is not None):
+            self.__connection.execute("INSERT INTO assignments (rule, assignment) VALUES (?, ?)",
+                                      (ruleId, np.asarray(assignment, dtype="<i8").reshape(-1, 2).tobytes()))
+
+    def addProgress(self, pairs):
+        """ Stores processed pairs of event types and their rules in a single transaction. pairs is a list of tuples
+        (trigger, response, rule) with rule being None if no rule was found. """
+        with self.__connection:
+            for trigger, response, rule in pairs:
+                if (rule is not None):
+                    self.__insert(rule)
+                self.__connection.execute("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)", (
+                    str(trigger), str(response), None if (rule is None) else str(rule.trigger),
+                    None if (rule is None) else str(rule.response)))
+
+    def getProgress(self):
+        """ Returns a dictionary mapping all processed pairs (trigger, response) to the pair of trigger and response of
+        the resulting rule or None. """
+        rows = self.__connection.execute("SELECT trigger, response, ruleTrigger, ruleResponse FROM progress")
+        return {(trigger, response): None if (ruleTrigger is None) else (ruleTrigger, ruleResponse)
+                for trigger, response, ruleTrigger, ruleResponse in rows}
+
+    def clearProgress(self, fingerprint=None):
+        """ Removes all processed pairs. fingerprint identifies the run whose progress is stored afterwards. """
+        with self.__connection:
+            self.__connection.execute("DELETE FROM progress")
+            self.__connection.execute("DELETE FROM checkpoint")
+            if (fingerprint is not None):
+                self.__connection.execute("INSERT INTO checkpoint VALUES (0, ?)", (fingerprint,))
+
+    def getProgressFingerprint(self):
+        """ Returns the fingerprint passed to clearProgress or None. """
+        row = self.__connection.execute("SELECT fingerprint FROM checkpoint").fetchone()
+        return None if (row is None) else row[0]
+
+    def getRule(self, trigger, response, assignment=True):
+        """ Returns the rule with the given trigger and response or None. If assignment is False, the assignment of
+        trigger and response events is not loaded. """
+        row = self.__connection.execute(self.__select("WHERE trigger = ? AND response = ?"),
+                                        (str(trigger), str(response))).fetchone()
+        return None if (row is None) else self.__load(row, assignment)
+
+    def getTopRules(self, k, score=LIKELIHOOD, ascending=False, assignment=False):
+        """ Returns the k rules with the highest value of score. Rules without a value for score are omitted. """
+        if (score not in SCORES):
+            raise ValueError("Unknown score '{}'. Please use one of {}".format(score, SCORES))
+        rows = self.__connection.execute(self.__select("WHERE {0} IS NOT NULL ORDER BY {0} {1} LIMIT ?".format(
+            score, "ASC" if ascending else "DESC")), (int(k),)).fetchall()
+        return [self.__load(row, assignment) for row in rows]
+
+    def getRules(self, assignment=False):
+        """ Returns all stored rules. """
+        rows = self.__connection.execute(self.__select("ORDER BY id")).fetchall()
+        return [self.__load(row, assignment) for row in rows]
+
+    def getByTrigger(self, trigger, assignment=False):
+        """ Returns all rules with the given trigger. """
+        rows = self.__connection.execute(self.__select("WHERE trigger = ? ORDER BY id"), (str(trigger),)).fetchall()
+        return [self.__load(row, assignment) for row in rows]
+
+    def getByResponse(self, response, assignment=False):
+        """ Returns all rules with the given response. """
+        rows = self.__connection.execute(self.__select("WHERE response = ? ORDER BY id"), (str(response),)).fetchall()
+        return [self.__load(row, assignment) for row in rows]
+
+    def getPairs(self):
+        """ Returns trigger and response of all stored rules without loading the rules. """
+        return self.__connection.execute("SELECT trigger, response FROM rules ORDER BY id").fetchall()
+
+    @staticmethod
+    def __select(condition):
+        return "SELECT r.id, r.trigger, r.response, r.likelihood, r.successTrigger, r.successResponse, " \
+               "r.distribution, r.distributionTrigger, r.data, s.samples FROM rules r " \
+               "LEFT JOIN samples s ON s.rule = r.id " + condition
+
+    def __load(self, row, assignment):
+        ruleId, trigger, response, likelihood, successTrigger, successResponse, dist, distTrigger, data, samples = row
+        data = json.loads(data)
+        samples = None if (samples is None) else np.frombuffer(samples, dtype="<f8")
+
+        kde = None
+        if (samples is not None):
+            kde = KdeDistribution(samples)
+        if (dist is None):
+            dist = kde
+            if (not data.pop(RESULT_KDE, False)):
+                kde = None
+        else:
+            dist = distribution.load(dist)
+        if (kde is not None):
+            data[RESULT_KDE] = kde
+
+        if (assignment):
+            value = self.__connection.execute("SELECT assignment FROM assignments WHERE rule = ?",
+                                              (ruleId,)).fetchone()
+            if (value is not None):
+                data[RESULT_IDX] = np.frombuffer(value[0], dtype="<i8").reshape(-1, 2)
+
+        rule = Rule(trigger, response, dist, None if (distTrigger is None) else distribution.load(distTrigger),
+                    successTrigger, successResponse, data)
+        rule.likelihood = likelihood
+        return rule
+
+    def remove(self, trigger, response):
+        """ Removes the rule with the given trigger and response. """
+        with self.__connection:
+            self.__connection.execute("DELETE FROM rules WHERE trigger = ? AND response = ?",
+                                      (str(trigger), str(response)))
+
+    def close(self):
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.__connection.execute("SELECT COUNT(*) FROM rules").fetchone()[0]
+
+
+def _asFloat(value):
+    return None if (value is None) else float(value)
+
+
+def _asJson(value):
+    return None if (value is None) else json.dumps(value, default=core.defaultJsonEncoding)
@@ -47,6 +47,6 @@ def defaultJsonEncoding(obj):
     from core import distribution, event, rule
     if (isinstance(obj, (np.ndarray, np.generic))):
         return obj.tolist()
-    if (isinstance(obj, (distribution.Distribution, event.Event, rule.Rule))):
+    if (isinstance(obj, (distribution.Distribution, event.Event, rule.Rule, rule.RuleSet))):
         return obj.asJson()
     raise TypeError('{} Not serializable'.format(obj))
@@ -32,13 +32,13 @@ class BayesianNetwork:
         graph = nx.DiGraph()
         graph.add_nodes_from(self.__sequence.eventTypes if len(self.filter) == 0 else self.filter)
         for rule in self.__sequence.calculatedRules:
-            if (len(self.filter) == 0 or (rule.trigger in self.filter and rule.response in self.filter)):
+            if (self.__isVisible(rule)):
                 graph.add_edge(rule.trigger, rule.response)
         self._dcg = graph
         self.graph = self._dcg
 
     def createGraph(self, root):
-        tree = self.__createTreeFromRules(self.__sequence.calculatedRules)
+        rules = self.__sequence.calculatedRules
         edges = set()
         processed = set()
 
@@ -53,24 +53,23 @@ class BayesianNetwork:
                     continue
                 processed.add(element)
 
-                for event in tree[element]:
-                    graph.add_node(event)
-                    if (self.__sequence.getCalculatedRule(element, event) is not None):
-                        edges.add((element, event))
-                    newElements.append(event)
+                for rule in rules.getByTrigger(element):
+                    if (self.__isVisible(rule)):
+                        graph.add_node(rule.response)
+                        edges.add((element, rule.response))
+                        newElements.append(rule.response)
+                for rule in rules.getByResponse(element):
+                    if (self.__isVisible(rule)):
+                        graph.add_node(rule.trigger)
+                        newElements.append(rule.trigger)
             elements = set(newElements)
 
         graph.add_edges_from(edges)
         self._dcg = graph
         self.graph = self._dcg
 
-    def __createTreeFromRules(self, rules):
-        tree = {}
-        for rule in rules:
-            if (len(self.filter) == 0 or (rule.trigger in self.filter and rule.response in self.filter)):
-                tree.setdefault(rule.trigger, []).append(rule.response)
-                tree.setdefault(rule.response, []).append(rule.trigger)
-        return tree
+    def __isVisible(self, rule):
+        return len(self.filter) == 0 or (rule.trigger in self.filter and rule.response in self.filter)
 
     def learnStructure(self):
         edges = self._dcg.edges()
@@ -132,7 +131,8 @@ class BayesianNetwork:
 
         if (len(variables) == 1 and len(conditions) == 0):
             v = variables[0]
-            p = len(self.__sequence.getEvents(v.event)) / len(self.__sequence.getEvents())
+            statistics = self.__sequence.getStatistics()
+            p = statistics.getCount(v.event) / statistics.size
             return p if v.occurred else 1 - p
 
         if (len(variables) == 1 and len(conditions) == 1):
@@ -0,0 +1,121 @@
+""" Binary sequence format
+
+Stores the columns of a ColumnarStorage as raw arrays together with a json header containing the vocabulary, the rules
+and further meta data. The layout of a file is
+
+    MAGIC | version (uint32) | header size (uint32) | json header | padding | columns
+
+Each column starts at an offset aligned to 8 bytes. When loading, the columns are mapped into memory via numpy.memmap,
+so opening a file is independent of its size and no data is copied until it is accessed.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from core.storage import ColumnarStorage
+
+MAGIC = b"EVSEQBIN"
+VERSION = 1
+EXTENSION = ".bseq"
+
+# name and type of all stored columns
+COLUMNS = [("timestamps", "<f8"), ("codes", "<i4"), ("occurred", "|b1"), ("triggered", "<i8")]
+# type of the timestamps if they are stored as integer ticks
+TICKS = "<i8"
+
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+
+def isBinary(filename):
+    """ Checks the magic bytes of the given file. """
+    try:
+        with open(filename, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except (OSError, IOError):
+        return False
+
+
+def write(filename, storage, header):
+    """ Writes the given storage and the json serializable dictionary header to filename. """
+    import core
+
+    # drop unused event types from the vocabulary
+    codes = storage.codes
+    vocabulary = storage.vocabulary
+    used = np.unique(codes)
+    if (len(used) != len(vocabulary)):
+        mapping = np.zeros(len(vocabulary), dtype=np.int32)
+        mapping[used] = np.arange(len(used))
+        codes = mapping[codes]
+        vocabulary = [vocabulary[code] for code in used]
+
+    types = dict(COLUMNS)
+    if (storage.resolution is not None):
+        types["timestamps"] = TICKS
+
+    columns = {}
+    offset = 0
+    for name, dtype in types.items():
+        columns[name] = {"dtype": dtype, "offset": offset}
+        offset += _align(len(storage) * np.dtype(dtype).itemsize)
+
+    header = dict(header)
+    header["count"] = len(storage)
+    header["vocabulary"] = vocabulary
+    header["columns"] = columns
+    header["resolution"] = storage.resolution
+    content = json.dumps(header, default=core.defaultJsonEncoding).encode("utf-8")
+    start = _align(_PREFIX.size + len(content))
+
+    with open(filename, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, len(content)))
+        file.write(content)
+        file.write(b"\0" * (start - _PREFIX.size - len(content)))
+        for name, dtype in types.items():
+            data = codes if (name == "codes") else getattr(storage, name)
+            data = np.ascontiguousarray(data, dtype=dtype)
+            data.tofile(file)
+            file.write(b"\0" * (_align(data.nbytes) - data.nbytes))
+
+
+def read(filename):
+    """ Opens filename and returns the memory mapped storage and the header. The events stored in the file are expected
+    to be ordered by timestamp. """
+    with open(filename, "rb") as file:
+        prefix = file.read(_PREFIX.size)
+        if (len(prefix) != _PREFIX.size):
+            raise ValueError("File '{}' is not a binary sequence".format(filename))
+        magic, version, size = _PREFIX.unpack(prefix)
+        if (magic != MAGIC):
+            raise ValueError("File '{}' is not a binary sequence".format(filename))
+        if (version != VERSION):
+            raise ValueError("Unsupported version {} of binary sequence".format(version))
+        try:
+            header = json.loads(file.read(size).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as ex:
+            raise ValueError("Invalid header in '{}': {}".format(filename, ex))
+    start = _align(_PREFIX.size + size)
+
+    try:
+        count = int(header["count"])
+        arrays = {}
+        for name, _ in COLUMNS:
+            column = header["columns"][name]
+            if (count == 0):
+                arrays[name] = np.empty(0, dtype=column["dtype"])
+            else:
+                # copy on write protects the file from modifications of the sequence
+                arrays[name] = np.memmap(filename, dtype=column["dtype"], mode="c", offset=start + column["offset"],
+                                         shape=(count,))
+        storage = ColumnarStorage(arrays["timestamps"], arrays["codes"], header["vocabulary"], arrays["occurred"],
+                                  arrays["triggered"], trusted=True, resolution=header.get("resolution"))
+    except KeyError as ex:
+        raise ValueError("Missing parameter {} in header of '{}'".format(ex, filename))
+    return storage, header
+
+
+def _align(size):
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,136 @@
+""" Columnar json sequence format
+
+Stores the columns of a ColumnarStorage as numeric json arrays instead of one json object per event. The header
+containing the rules and further meta data is written first, followed by the columns
+
+    {"format": "columnar", "version": 1, ..., "vocabulary": [...], "columns": {"timestamps": [...], ...}}
+
+The columns are converted to text in chunks and written directly to the file handle, so the complete document is never
+built in memory. When reading a file, the columns are parsed in chunks into arrays preallocated with the size given by
+'count' (see ColumnCollector). Json has no representation for infinite values or NaN, so such timestamps are rejected.
+"""
+
+import json
+
+import numpy as np
+
+from core.storage import ColumnarStorage
+
+FORMAT = "columnar"
+VERSION = 1
+
+# number of values converted to text at once
+CHUNK_SIZE = 1 << 16
+
+_COLUMNS = ("timestamps", "codes", "occurred", "triggered")
+
+
+def isColumnar(content):
+    """ Checks if the parsed header of a sequence file uses the columnar format. """
+    return content.get("format") == FORMAT
+
+
+def write(file, storage, header):
+    """ Writes the given storage and the json serializable dictionary header to the file handle. """
+    import core
+
+    if (storage.resolution is None and not np.isfinite(storage.timestamps).all()):
+        raise ValueError("Unable to store infinite or NaN timestamps as json, use the binary format instead")
+
+    header = dict(header)
+    header["format"] = FORMAT
+    header["version"] = VERSION
+    header["count"] = len(storage)
+    header["vocabulary"] = storage.vocabulary
+    if (storage.resolution is not None):
+        header["resolution"] = storage.resolution
+    content = json.dumps(header, default=core.defaultJsonEncoding)
+
+    # reopen the header object to append the columns
+    file.write(content[:-1])
+    file.write(', "columns": {')
+    columns = [("timestamps", storage.timestamps), ("codes", storage.codes), ("occurred", storage.occurred),
+               ("triggered", storage.triggered)]
+    for i, (name, values) in enumerate(columns):
+        if (i > 0):
+            file.write(", ")
+        file.write('"{}": ['.format(name))
+        _writeValues(file, values)
+        file.write("]")
+    file.write("}}")
+
+
+def _writeValues(file, values):
+    # float.__repr__ returns the shortest representation that is parsed to the identical value
+    formatter = repr if (values.dtype.kind == "f") else str
+    if (values.dtype == bool):
+        values = values.astype(np.int8)
+    for start in range(0, len(values), CHUNK_SIZE):
+        if (start > 0):
+            file.write(",")
+        file.write(",".join(map(formatter, values[start:start + CHUNK_SIZE].tolist())))
+
+
+def _getDtypes(content):
+    resolution = content.get("resolution")
+    return {"timestamps": float if (resolution is None) else np.int64, "codes": np.int32, "occurred": bool,
+            "triggered": np.int64}
+
+
+class ColumnCollector:
+    """ Receives the columns of a file in the columnar format from jsonStream.parse in chunks of number tokens. Each
+    column is written into an array preallocated with the size given by 'count' in the header, so the memory usage
+    does not exceed the size of the storage. """
+
+    def __init__(self):
+        self.columns = {}
+        self.__filled = {}
+
+    def add(self, name, tokens, header):
+        if (header.get("version") != VERSION):
+            raise ValueError("Unsupported version {} of columnar sequence".format(header.get("version")))
+        if (name not in _COLUMNS):
+            raise ValueError("Unknown column '{}' in columnar sequence".format(name))
+        if (name not in self.columns):
+            if ("count" not in header):
+                raise ValueError("Missing parameter 'count' in columnar sequence")
+            self.columns[name] = np.empty(int(header["count"]), dtype=_getDtypes(header)[name])
+            self.__filled[name] = 0
+
+        dtype = np.int8 if (name == "occurred") else self.columns[name].dtype
+        values = np.asarray(tokens, dtype=dtype)
+        start = self.__filled[name]
+        if (start + len(values) > len(self.columns[name])):
+            raise ValueError("Column '{}' contains more values than 'count'".format(name))
+        self.columns[name][start:start + len(values)] = values
+        self.__filled[name] = start + len(values)
+
+    def isComplete(self, name):
+        return self.__filled.get(name) == len(self.columns[name])
+
+
+def read(content, collector=None):
+    """ Creates the storage from the parsed content of a file in the columnar format. The columns are either contained
+    in content or were collected while parsing by collector. """
+    if (content.get("version") != VERSION):
+        raise ValueError("Unsupported version {} of columnar sequence".format(content.get("version")))
+    try:
+        dtypes = _getDtypes(content)
+        if (collector is None):
+            columns = {name: np.asarray(content["columns"][name], dtype=dtypes[name]) for name in _COLUMNS}
+        else:
+            columns = {}
+            for name in _COLUMNS:
+                if (name not in collector.columns):
+                    # empty arrays are never passed to the collector
+                    columns[name] = np.empty(0, dtype=dtypes[name])
+                    if (int(content["count"]) != 0):
+                        raise KeyError(name)
+                elif (not collector.isComplete(name)):
+                    raise ValueError("Column '{}' contains less values than 'count'".format(name))
+                else:
+                    columns[name] = collector.columns[name]
+        return ColumnarStorage(columns["timestamps"], columns["codes"], content["vocabulary"], columns["occurred"],
+                               columns["triggered"], resolution=content.get("resolution"))
+    except KeyError as ex:
+        raise ValueError("Missing parameter {} in columnar sequence".format(ex))
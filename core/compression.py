@@ -0,0 +1,59 @@
+""" Transparent compression of input and output files
+
+Files compressed with gzip, bz2 or lzma are detected by their magic bytes when reading and by their extension when
+writing. The returned file objects decompress and compress incrementally, so memory usage does not depend on the size
+of the file.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+
+# module providing open() for each compression
+_MAGIC = [(b"\x1f\x8b", gzip), (b"BZh", bz2), (b"\xfd7zXZ\x00", lzma)]
+_EXTENSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma, ".lzma": lzma}
+# extensions of files compressed while writing
+EXTENSIONS = tuple(_EXTENSIONS)
+
+# the highest levels compress sequences only slightly better but take several times longer
+GZIP_LEVEL = 6
+LZMA_PRESET = 1
+
+
+def getCodec(filename, mode="r"):
+    """ Returns the module used to (de)compress filename or None if filename is not compressed. Existing files are
+    identified by their magic bytes when reading, otherwise the extension is used. """
+    if ("r" in mode):
+        try:
+            with open(filename, "rb") as file:
+                prefix = file.read(max(len(magic) for magic, _ in _MAGIC))
+            for magic, codec in _MAGIC:
+                if (prefix.startswith(magic)):
+                    return codec
+        except (OSError, IOError):
+            pass
+    return _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def isCompressed(filename):
+    """ Checks if an existing file is compressed. """
+    return getCodec(filename) is not None
+
+
+def openFile(filename, mode="r", **kwargs):
+    """ Opens filename like the builtin open. Compressed files are decompressed while reading and created with the
+    compression given by the extension while writing. Text mode is used unless 'b' is part of mode. """
+    codec = getCodec(filename, mode)
+    if (codec is None):
+        return open(filename, mode, **kwargs)
+    if ("b" not in mode and "t" not in mode):
+        mode += "t"
+    if ("r" not in mode):
+        if (codec is gzip):
+            kwargs.setdefault("compresslevel", GZIP_LEVEL)
+        elif (codec is lzma):
+            kwargs.setdefault("preset", LZMA_PRESET)
+            if (filename.lower().endswith(".lzma")):
+                kwargs.setdefault("format", lzma.FORMAT_ALONE)
+    return codec.open(filename, mode, **kwargs)
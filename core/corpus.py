@@ -0,0 +1,104 @@
+""" Collection of several sequences
+
+Many captures of the same system, e.g. the chunks of a printer log or several generated sequences, are analysed
+together. The sequences are kept separately, so timestamps of different sequences are never compared. All event types
+are mapped to one shared vocabulary and for each event type the offset of every sequence in the pooled vector of
+timestamps is provided.
+"""
+
+import numpy as np
+
+from core import sequence
+from core.sequenceStatistics import SequenceStatistics
+
+
+class SequenceCorpus:
+    def __init__(self, sequences=None):
+        self.vocabulary = []
+        self.__codes = {}
+        self.__sequences = []
+        self.__mappings = []
+        self.__statistics = None
+        self.__memberStatistics = None
+        if (sequences is not None):
+            for seq in sequences:
+                self.add(seq)
+
+    def add(self, seq):
+        """ Adds a sequence. Unknown event types are added to the shared vocabulary. """
+        self.__sequences.append(seq)
+        self.__mappings.append(None)
+        self.__getMapping(len(self.__sequences) - 1)
+
+    def __getMapping(self, idx):
+        """ Returns the code in the shared vocabulary for each code of sequence idx. """
+        vocabulary = self.__sequences[idx].getStorage().vocabulary
+        mapping = self.__mappings[idx]
+        if (mapping is None or len(mapping) != len(vocabulary)):
+            for eventType in vocabulary:
+                if (eventType not in self.__codes):
+                    self.__codes[eventType] = len(self.vocabulary)
+                    self.vocabulary.append(eventType)
+            mapping = np.array([self.__codes[eventType] for eventType in vocabulary], dtype=np.int32)
+            self.__mappings[idx] = mapping
+        return mapping
+
+    def getCode(self, eventType):
+        """ Returns the code of the given event type in the shared vocabulary or None if it is unknown. """
+        # sequences may have grown since they were added
+        for idx in range(len(self.__sequences)):
+            self.__getMapping(idx)
+        return self.__codes.get(str(eventType))
+
+    def getCodes(self, idx):
+        """ Returns the codes in the shared vocabulary of all events of sequence idx. """
+        return self.__getMapping(idx)[self.__sequences[idx].getStorage().codes]
+
+    @property
+    def eventTypes(self):
+        """ Set of all event types used in at least one sequence """
+        result = set()
+        for seq in self.__sequences:
+            result.update(seq.eventTypes)
+        return result
+
+    def getStatistics(self):
+        """ Returns the combined statistics of all sequences. They are recomputed if a sequence changed. """
+        members = [seq.getStatistics() for seq in self.__sequences]
+        if (self.__memberStatistics is None or len(members) != len(self.__memberStatistics) or
+                any(a is not b for a, b in zip(members, self.__memberStatistics))):
+            self.__statistics = SequenceStatistics([seq.getStorage() for seq in self.__sequences],
+                                                   [seq.length for seq in self.__sequences])
+            self.__memberStatistics = members
+        return self.__statistics
+
+    def getCount(self, eventType):
+        """ Returns the number of events with the given event type in all sequences. """
+        return self.getStatistics().getCount(eventType)
+
+    def getEventCount(self):
+        """ Returns the number of events in all sequences. """
+        return self.getStatistics().size
+
+    def getOffsets(self, eventType):
+        """ Returns the position of the first timestamp of each sequence in the pooled vector of the given event type.
+        The last entry is the total number of timestamps. """
+        return np.cumsum([0] + [len(seq.asVector(eventType)) for seq in self.__sequences])
+
+    def asVectors(self, eventType):
+        """ Returns the timestamps of the given event type separately for each sequence. """
+        return [seq.asVector(eventType) for seq in self.__sequences]
+
+    def __getitem__(self, idx):
+        return self.__sequences[idx]
+
+    def __iter__(self):
+        return iter(self.__sequences)
+
+    def __len__(self):
+        return len(self.__sequences)
+
+
+def loadFromFiles(filenames, columnar=False):
+    """ Loads all given sequence files into one corpus. """
+    return SequenceCorpus([sequence.loadFromFile(filename, columnar) for filename in filenames])
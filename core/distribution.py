@@ -5,15 +5,16 @@ This module contains a collection of distributions for creation of random sequen
 
 import abc
 import collections
-import datetime
 import json
+import logging
 import math
 import numbers
 import sys
-import time
 
 import numpy as np
-from scipy import stats, integrate
+from scipy import integrate, special, stats
+
+from core import seeding
 
 STATIC = 1
 NORMAL = 2
@@ -29,6 +30,24 @@ distributions = {
     KDE: 'Kde'
 }
 
+# maximum error of the binned kde relative to the maximum of the pdf
+KDE_TOLERANCE = 1e-4
+# upper limit for the size of the grid used by the binned kde
+_KDE_MAX_BINS = 1 << 22
+# kernels further away than this many bandwidths contribute exactly 0 or 1 to the cdf in double precision
+_KDE_CDF_CUTOFF = 9
+# maximum number of kernels evaluated at once by the cdf
+_KDE_CDF_CHUNK = 1 << 20
+
+# maximum interpolation error of tabulated distributions relative to the maximum of the pdf
+TABLE_TOLERANCE = 1e-3
+TABLE_MAX_POINTS = 1 << 16
+_TABLE_MIN_POINTS = 1 << 8
+_TABLE_MAX_EXTENSIONS = 8
+
+# number of points used to approximate entropy, maximum and mode of a kde
+_KDE_GRID_POINTS = 10000
+
 
 class Distribution(abc.ABC):
     """ Base class for all distributions """
@@ -37,24 +56,55 @@ class Distribution(abc.ABC):
         self.__distType = distType
         self.__param = param
         self._dist = None
-
-        d = datetime.datetime.now()
-        np.random.seed(int(time.mktime(d.timetuple())))
+        self.__rng = None
+        self.__summary = None
+
+    @property
+    def rng(self):
+        """ Generator used for all random values of this distribution. It is created from the root seed (see
+        core.seeding) on first use. """
+        if (self.__rng is None):
+            self.__rng = seeding.createGenerator()
+        return self.__rng
+
+    def setSeed(self, value):
+        """ Seeds the generator of this distribution with an int or a SeedSequence. """
+        self.__rng = seeding.createGenerator(value)
+        return self
 
     def asJson(self):
         return {"name": distributions[self.__distType], "param": self.__param}
 
     def getMaximumPDF(self):
         """ Compute the maximum PDF for normalization """
-        return self._dist.pdf(self._dist.mean())
+        return self._dist.pdf(self.getMode())
+
+    def getMean(self):
+        return self._dist.mean()
+
+    def getMode(self):
+        """ Returns the value with the maximum PDF. Defaults to the mean, which is correct for symmetric unimodal and
+        uniform distributions. """
+        return self.getMean()
 
     def getCompleteInterval(self):
         return self._dist.interval(0.99)
 
+    def getSummary(self):
+        """ Returns the memoised Summary of this distribution. Its values are computed on first access. """
+        if (self.__summary is None):
+            self.__summary = Summary(self)
+        return self.__summary
+
     def getRelativePdf(self, x):
         """ Compute the ratio between x and the maximal pdf value """
         return min(1, self.getPDFValue(x) / self.getMaximumPDF())
 
+    def tabulate(self, tolerance=TABLE_TOLERANCE, maxPoints=TABLE_MAX_POINTS):
+        """ Returns this distribution with PDF and CDF answered by interpolation in precomputed tables. See
+        TabulatedDistribution. """
+        return TabulatedDistribution(self, tolerance, maxPoints)
+
     def __eq__(self, other):
         if (not isinstance(other, Distribution)):
             return False
@@ -103,7 +153,7 @@ class AbstractDistribution(Distribution, abc.ABC):
         return self._dist.cdf(x)
 
     def getRandom(self, n=None):
-        return self._dist.rvs(n)
+        return self._dist.rvs(n, random_state=self.rng)
 
     def getPDFValue(self, x):
         return self._dist.pdf(x)
@@ -167,6 +217,13 @@ class StaticDistribution(Distribution):
         count = np.array(list(collections.Counter(self.__pdf).values()))
         return stats.entropy(np.divide(count, count.sum()))
 
+    def getMaximumPDF(self):
+        """ Returns the maximum of the configured pdf values without advancing 'getPDFValue()'. """
+        return self.__pdf.max()
+
+    def getMean(self):
+        return self.__pdf.mean()
+
     def getStd(self):
         return self.__pdf.std()
 
@@ -269,6 +326,9 @@ class ExponentialDistribution(AbstractDistribution):
     def getDifferentialEntropy(self):
         return 1 - math.log(1 / self.__beta)
 
+    def getMode(self):
+        return self.__offset
+
     def __str__(self):
         return "{}: Offset: {} Beta: {}".format(distributions[EXP], self.__offset, self.__beta)
 
@@ -283,50 +343,122 @@ class KdeDistribution(Distribution):
     samples.
     """
 
-    def __init__(self, samples, bandwidth=0.2):
+    def __init__(self, samples, bandwidth=0.2, tolerance=KDE_TOLERANCE):
         """
         :param samples: 1D-Samples to create distribution from
+        :param tolerance: Maximum error of the pdf relative to its maximum when evaluating many values at once. The
+            samples are then binned on a grid and convolved with the kernel via FFT in O(n + g log g) for n samples and
+            g grid points instead of O(n * len(x)). Single values are always evaluated exactly. If None, the exact
+            evaluation is always used.
         """
         super().__init__(distType=KDE, param=([samples]))
         if (len(samples) == 0):
             raise ValueError("Unable to perform Kernel density estimation without samples.")
 
         self.samples = np.array(sorted(samples))
+        self.tolerance = tolerance
         self.__minValue = np.min(self.samples) - max(np.min(self.samples) / 20, 0.5)
         self.__maxValue = np.max(self.samples) + max(np.max(self.samples) / 20, 0.5)
         if (np.min(self.samples) != np.max(self.samples)):
             self.__kernel = stats.gaussian_kde(self.samples, bandwidth)
         else:
             self.__kernel = SingularKernel(np.min(self.samples))
-        self.__cachedMaxPdf = 0
+        # memoised values, the samples must not be modified afterwards
+        self.__grid = None
+        self.__entropy = None
+        self.__mean = None
+        self.__var = None
 
     def getPDFValue(self, x):
-        pdf = self.__kernel.evaluate(x)
-        if ((isinstance(pdf, int) or len(pdf) == 1) and pdf > self.__cachedMaxPdf):
-            self.__cachedMaxPdf = pdf
+        pdf = self.__evaluateBinned(x)
+        if (pdf is None):
+            pdf = self.__kernel.evaluate(x)
         if (isinstance(pdf, int)):
             return pdf
         return pdf if (len(pdf) > 1) else pdf[0]
 
+    def __evaluateBinned(self, x):
+        """ Evaluates the kde at all values of x via linear binning and FFT convolution. Returns None if the exact
+        evaluation is required or cheaper. """
+        if (self.tolerance is None or not isinstance(self.__kernel, stats.gaussian_kde) or
+                not isinstance(x, (list, np.ndarray))):
+            return None
+        x = np.asarray(x, dtype=float)
+        if (x.ndim != 1 or len(x) < 2):
+            return None
+
+        h = math.sqrt(self.__kernel.covariance[0, 0])
+        # contributions of samples further away than cutoff are below tolerance
+        cutoff = h * math.sqrt(2 * math.log(1 / self.tolerance))
+        # the error of linear binning and interpolation grows with (delta / h) ** 2
+        delta = 2 * h * math.sqrt(self.tolerance)
+        lower = x.min() - cutoff
+        bins = int(math.ceil((x.max() + cutoff - lower) / delta)) + 1
+        if (bins > _KDE_MAX_BINS or bins > len(x) * len(self.samples)):
+            return None
+
+        position = (self.samples - lower) / delta
+        position = position[(position >= 0) & (position < bins - 1)]
+        left = np.floor(position).astype(np.int64)
+        fraction = position - left
+        counts = np.bincount(left, 1 - fraction, minlength=bins) + np.bincount(left + 1, fraction, minlength=bins)
+
+        width = int(math.ceil(cutoff / delta))
+        kernel = np.exp(-0.5 * (np.arange(-width, width + 1) * delta / h) ** 2) / \
+            (math.sqrt(2 * math.pi) * h * len(self.samples))
+        size = 1 << int(math.ceil(math.log2(bins + 2 * width)))
+        density = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)[width:width + bins]
+        # rounding errors of the FFT may lead to tiny negative values
+        return np.interp(x, lower + np.arange(bins) * delta, np.maximum(density, 0))
+
     def getRandom(self, n=None):
         if (n is None):
             n = 1
-        return self.__kernel.resample(n)[0]
+        return self.__kernel.resample(n, seed=self.rng)[0]
 
     def getCDFValue(self, x):
+        """ Computes the probability mass between the lower border of getCompleteInterval and x. """
         if (isinstance(x, numbers.Number)):
             upper = min(x, self.__maxValue)
             if (upper <= self.__minValue):
                 return 0
-            return self.__kernel.integrate_box_1d(self.__minValue, upper)
+            return float(self.__integrate(np.array([upper]))[0])
 
-        res = np.zeros(len(x))
-        for i in range(len(x)):
-            upper = min(x[i], self.__maxValue)
-            if (upper > self.__minValue):
-                res[i] = self.__kernel.integrate_box_1d(self.__minValue, upper)
+        upper = np.minimum(np.asarray(x, dtype=float), self.__maxValue)
+        res = np.zeros(len(upper))
+        valid = upper > self.__minValue
+        res[valid] = self.__integrate(upper[valid])
         return res
 
+    def __integrate(self, upper):
+        """ Integrates the kde from the lower border to each value of upper. The cdf of a gaussian kde is the mean of
+        the normal cdfs of all kernels. """
+        if (not isinstance(self.__kernel, stats.gaussian_kde)):
+            return np.array([self.__kernel.integrate_box_1d(self.__minValue, u) for u in upper], dtype=float)
+        h = math.sqrt(self.__kernel.covariance[0, 0])
+        return self.__getMass(upper, h) - self.__getMass(np.array([self.__minValue]), h)[0]
+
+    def __getMass(self, x, h):
+        """ Returns the fraction of the kernel mass below each value of x. As the samples are sorted, only kernels
+        within the cutoff are evaluated, all kernels below contribute 1. """
+        n = len(self.samples)
+        begin = np.searchsorted(self.samples, x - _KDE_CDF_CUTOFF * h, side="right")
+        end = np.searchsorted(self.samples, x + _KDE_CDF_CUTOFF * h, side="left")
+        width = int((end - begin).max()) if (len(x) > 0) else 0
+        mass = begin.astype(float)
+        if (width == 0):
+            return mass / n
+
+        offsets = np.arange(width)
+        step = max(1, _KDE_CDF_CHUNK // width)
+        for start in range(0, len(x), step):
+            chunk = slice(start, start + step)
+            idx = begin[chunk, np.newaxis] + offsets
+            inside = idx < end[chunk, np.newaxis]
+            values = special.ndtr((x[chunk, np.newaxis] - self.samples[np.minimum(idx, n - 1)]) / h)
+            mass[chunk] += np.where(inside, values, 0).sum(axis=1)
+        return mass / n
+
     def getCompleteInterval(self):
         return (self.__minValue, self.__maxValue)
 
@@ -339,21 +471,39 @@ class KdeDistribution(Distribution):
         [1] http://thirdorderscientist.org/homoclinic-orbit/2013/5/8/bridging-discrete-and-differential-entropy
         [2] Elements of information theory, Cover, Thomas, page 247-248
         """
-        x = np.linspace(self.__minValue, self.__maxValue, 10000)
-        pdf = self.getPDFValue(x)
-        return stats.entropy(pdf) + math.log2((self.__maxValue - self.__minValue) / 10000)
+        if (self.__entropy is None):
+            _, pdf = self.__getGrid()
+            self.__entropy = stats.entropy(pdf) + math.log2((self.__maxValue - self.__minValue) / _KDE_GRID_POINTS)
+        return self.__entropy
 
     def getMaximumPDF(self):
-        if (self.__cachedMaxPdf is None):
-            x = np.linspace(self.__minValue, self.__maxValue, 10000)
-            self.__cachedMaxPdf = self.getPDFValue(x).max()
-        return self.__cachedMaxPdf
+        _, pdf = self.__getGrid()
+        return pdf.max()
+
+    def getMode(self):
+        x, pdf = self.__getGrid()
+        return x[pdf.argmax()]
+
+    def __getGrid(self):
+        """ Returns the pdf on an equidistant grid over getCompleteInterval. It is shared by entropy, maximum and mode
+        and evaluated only once. """
+        if (self.__grid is None):
+            x = np.linspace(self.__minValue, self.__maxValue, _KDE_GRID_POINTS)
+            self.__grid = (x, np.asarray(self.getPDFValue(x), dtype=float))
+        return self.__grid
+
+    def getMean(self):
+        if (self.__mean is None):
+            self.__mean = self.samples.mean()
+        return self.__mean
 
     def getStd(self):
-        return self.samples.std()
+        return math.sqrt(self.getVar())
 
     def getVar(self):
-        return self.samples.var()
+        if (self.__var is None):
+            self.__var = self.samples.var()
+        return self.__var
 
     def __str__(self):
         return "{}: Samples: {}".format(distributions[KDE], self.samples)
@@ -362,7 +512,199 @@ class KdeDistribution(Distribution):
         return str(self.samples)
 
     def __neg__(self):
-        return KdeDistribution(-self.samples)
+        return KdeDistribution(-self.samples, tolerance=self.tolerance)
+
+
+class TabulatedDistribution(Distribution):
+    """ Answers PDF and CDF queries of another distribution by linear interpolation.
+
+    PDF and CDF are sampled once over getCompleteInterval of the distribution. The interval is extended until the pdf
+    at its borders is below tolerance relative to the maximum of the pdf. The number of samples is doubled until the
+    interpolation error at the midpoints of the grid is below the same bound. If the bound is not reached with
+    maxPoints samples, e.g. for a very narrow kde or the discontinuous pdf of a SingularKernel, the tables are discarded
+    and all values are evaluated by the distribution itself. So are values outside the interval. All other methods
+    are forwarded to the distribution.
+
+    The attribute error contains the bound of the interpolation error of the pdf, i.e. 0 without tables.
+    """
+
+    def __init__(self, dist, tolerance=TABLE_TOLERANCE, maxPoints=TABLE_MAX_POINTS):
+        super().__init__(distType=None, param=(dist,))
+        self.dist = dist
+        self.tolerance = tolerance
+        lower, upper = (float(value) for value in dist.getCompleteInterval())
+
+        points = _TABLE_MIN_POINTS
+        x = np.linspace(lower, upper, points + 1)
+        pdf = self.__evaluate(dist.getPDFValue, x)
+        for _ in range(_TABLE_MAX_EXTENSIONS):
+            bound = tolerance * pdf.max()
+            if (pdf[0] <= bound and pdf[-1] <= bound):
+                break
+            width = (upper - lower) / 2
+            lower -= width if (pdf[0] > bound) else 0
+            upper += width if (pdf[-1] > bound) else 0
+            x = np.linspace(lower, upper, points + 1)
+            pdf = self.__evaluate(dist.getPDFValue, x)
+        self.__lower = lower
+        self.__upper = upper
+
+        self.error = None
+        while (points < maxPoints):
+            middle = (x[:-1] + x[1:]) / 2
+            exact = self.__evaluate(dist.getPDFValue, middle)
+            error = np.abs((pdf[:-1] + pdf[1:]) / 2 - exact).max()
+            x = np.insert(x, np.arange(1, len(x)), middle)
+            pdf = np.insert(pdf, np.arange(1, len(pdf)), exact)
+            points *= 2
+            if (error <= tolerance * pdf.max()):
+                self.error = tolerance * pdf.max()
+                break
+
+        if (self.error is None):
+            logging.debug("Interpolation error of {} exceeds the tolerance with {} points, the pdf is evaluated "
+                          "exactly".format(dist.__class__.__name__, points))
+            self.error = 0
+            self.__x = self.__pdf = self.__cdf = None
+        else:
+            self.__x = x
+            self.__pdf = pdf
+            self.__cdf = self.__evaluate(dist.getCDFValue, x)
+
+    @staticmethod
+    def __evaluate(function, x):
+        return np.broadcast_to(np.asarray(function(x), dtype=float), x.shape).copy()
+
+    def __interpolate(self, x, table, function):
+        if (table is None):
+            return function(x)
+        if (isinstance(x, numbers.Number)):
+            if (self.__lower <= x <= self.__upper):
+                return float(np.interp(x, self.__x, table))
+            return function(x)
+        x = np.asarray(x, dtype=float)
+        result = np.interp(x, self.__x, table)
+        outside = (x < self.__lower) | (x > self.__upper)
+        if (outside.any()):
+            result[outside] = function(x[outside])
+        return result
+
+    def getDomain(self):
+        """ Returns the interval covered by the tables. """
+        return (self.__lower, self.__upper)
+
+    def getPDFValue(self, x):
+        return self.__interpolate(x, self.__pdf, self.dist.getPDFValue)
+
+    def getCDFValue(self, x):
+        return self.__interpolate(x, self.__cdf, self.dist.getCDFValue)
+
+    def getMaximumPDF(self):
+        return self.dist.getMaximumPDF()
+
+    def getMean(self):
+        return self.dist.getMean()
+
+    def getMode(self):
+        return self.dist.getMode()
+
+    def getCompleteInterval(self):
+        return self.dist.getCompleteInterval()
+
+    def getSummary(self):
+        return self.dist.getSummary()
+
+    def getRandom(self, n=None):
+        return self.dist.getRandom(n)
+
+    def getDifferentialEntropy(self):
+        return self.dist.getDifferentialEntropy()
+
+    def getVar(self):
+        return self.dist.getVar()
+
+    def getStd(self):
+        return self.dist.getStd()
+
+    def tabulate(self, tolerance=TABLE_TOLERANCE, maxPoints=TABLE_MAX_POINTS):
+        if (tolerance >= self.tolerance):
+            return self
+        return self.dist.tabulate(tolerance, maxPoints)
+
+    def asJson(self):
+        return self.dist.asJson()
+
+    def __str__(self):
+        return str(self.dist)
+
+    def __neg__(self):
+        return (-self.dist).tabulate(self.tolerance)
+
+
+class Summary:
+    """ Summary statistics of a distribution.
+
+    Each value is computed by the distribution on first access and memoised afterwards, so scorers evaluating the same
+    distribution repeatedly, e.g. performance measures of a rule, pay for expensive values like the entropy of a kde
+    only once. Values that are never accessed are never computed. The distribution must not change afterwards.
+    """
+
+    def __init__(self, dist):
+        self.__dist = dist
+        self.__values = {}
+
+    def __get(self, name, function):
+        if (name not in self.__values):
+            self.__values[name] = function()
+        return self.__values[name]
+
+    @property
+    def entropy(self):
+        return self.__get("entropy", self.__dist.getDifferentialEntropy)
+
+    @property
+    def information(self):
+        """ Integral of pdf * log2(pdf) over the real line, i.e. the negative differential entropy in bits. """
+        return self.__get("integrals", self.__integrate)[0]
+
+    @property
+    def mass(self):
+        """ Integral of the pdf over the real line. It is 1 unless the numerical integration misses parts of the pdf,
+        e.g. the narrow peak of a kde of identical samples. """
+        return self.__get("integrals", self.__integrate)[1]
+
+    @property
+    def maxPdf(self):
+        return self.__get("maxPdf", self.__dist.getMaximumPDF)
+
+    @property
+    def mode(self):
+        return self.__get("mode", self.__dist.getMode)
+
+    @property
+    def interval(self):
+        return self.__get("interval", self.__dist.getCompleteInterval)
+
+    @property
+    def mean(self):
+        return self.__get("mean", self.__dist.getMean)
+
+    @property
+    def var(self):
+        return self.__get("var", self.__dist.getVar)
+
+    @property
+    def std(self):
+        return self.__get("std", self.__dist.getStd)
+
+    def __integrate(self):
+        """ Integrates information and mass in a single pass, so the pdf is evaluated only once per point. """
+        def integrand(x):
+            pdf = float(self.__dist.getPDFValue(x))
+            return np.array([pdf * math.log2(pdf) if (pdf > 0) else 0, pdf])
+
+        res, _ = integrate.quad_vec(integrand, -np.inf, np.inf, limit=1000)
+        return tuple(res)
 
 
 class SingularKernel():
@@ -374,15 +716,12 @@ class SingularKernel():
 
     def evaluate(self, x):
         if (isinstance(x, (list, np.ndarray))):
-            result = np.zeros(len(x))
-            for i in range(len(x)):
-                if (abs(x[i] - self.value) < self.threshold):
-                    result[i] = self.maxValue
-            return result
+            return np.where(np.abs(np.asarray(x, dtype=float) - self.value) < self.threshold, float(self.maxValue), 0)
         else:
             return self.maxValue if (abs(x - self.value) < self.threshold) else 0
 
-    def resample(self, n):
+    # noinspection PyUnusedLocal
+    def resample(self, n, seed=None):
         return [np.array([self.value] * n)]
 
     def integrate_box_1d(self, lower, upper):
@@ -442,27 +781,22 @@ def samplesToDistribution(samples, distribution):
         raise ValueError("Unknown distribution '{}'".format(distribution))
 
 
-def approximateIntervalBorders(dist, alpha, lower=-10):
+def approximateIntervalBorders(dist, alpha, lower=-10, step=0.01, chunk=1000):
+    """ Returns the interval starting at lower that contains at least the probability mass alpha. The upper border is
+    searched in the given step size, the cdf is evaluated for chunk values at once. """
     prevArea = dist.getCDFValue(lower)
-    i = lower
+    start = 0
     while True:
-        area = dist.getCDFValue(i)
-        if area - prevArea >= alpha or area == 1:
-            return (lower, i)
-        i += 0.01
+        x = lower + (start + np.arange(chunk)) * step
+        area = np.asarray(dist.getCDFValue(x))
+        found = np.flatnonzero((area - prevArea >= alpha) | (area == 1))
+        if (len(found) > 0):
+            return (lower, x[found[0]])
+        start += chunk
 
 
 def getEmpiricalDist(seq, trigger, response, knownDistributions=None):
-    events = seq.getEvents(trigger)
-
-    values = []
-    for event in events:
-        if (not event.occurred):
-            continue
-
-        responseEvent = event.trueTriggered
-        if (responseEvent is not None and responseEvent.occurred and responseEvent.eventType == response):
-            values.append(responseEvent.timestamp - event.timestamp)
+    values = seq.getLags(trigger, response, true=True)
     if (len(values) > 0):
         return KdeDistribution(values)
     elif (knownDistributions is not None):
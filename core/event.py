@@ -1,14 +1,40 @@
 """ Automatically generated documentation for Event """
+import sys
 
 
 class Event:
+    # Sequences contain millions of events. Using slots instead of a per-instance dictionary reduces the memory footprint
+    # of each event significantly.
+    __slots__ = ("__eventType", "__timestamp", "__hash", "occurred", "triggeredBy", "triggered", "source")
+
     def __init__(self, eventType="_", timestamp=-1):
-        self.eventType = str(eventType)
-        self.timestamp = timestamp
+        # all events of one type share the same interned string
+        self.__eventType = sys.intern(str(eventType))
+        self.__timestamp = timestamp
+        self.__hash = None
         self.occurred = True
         self.triggeredBy = None
         self.triggered = None
-        self.trueTriggered = None
+        # optional tag of the log the event was read from
+        self.source = None
+
+    @property
+    def eventType(self):
+        return self.__eventType
+
+    @eventType.setter
+    def eventType(self, eventType):
+        self.__eventType = sys.intern(str(eventType))
+        self.__hash = None
+
+    @property
+    def timestamp(self):
+        return self.__timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp):
+        self.__timestamp = timestamp
+        self.__hash = None
 
     # TODO use property decorator
     def setTriggered(self, event):
@@ -28,7 +54,9 @@ class Event:
         return self.eventType == other.eventType and self.timestamp == other.timestamp
 
     def __hash__(self):
-        return hash(self.eventType) + hash(self.timestamp)
+        if (self.__hash is None):
+            self.__hash = hash(self.__eventType) + hash(self.__timestamp)
+        return self.__hash
 
     def __str__(self):
         return "Event: {} ({})".format(str(self.eventType), str(self.timestamp))
@@ -0,0 +1,140 @@
+""" Incremental json parser
+
+Parses a json object from a file handle chunk by chunk. The elements of one array in the object are passed to a
+callback one after another instead of being loaded into memory at once. Alternatively, the numeric arrays of one nested
+object are passed to a callback in chunks of number tokens, which can be converted directly into NumPy arrays. This
+allows reading large sequence files with bounded memory.
+"""
+
+import json
+
+WHITESPACE = " \t\n\r"
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    def __init__(self, file, chunkSize):
+        self.__file = file
+        self.__chunkSize = chunkSize
+        self.__buffer = ""
+        self.__pos = 0
+        self.__eof = False
+
+    def __fill(self, size):
+        """ Appends the next chunk to the buffer. Already consumed content is discarded. """
+        chunk = self.__file.read(size)
+        if (len(chunk) == 0):
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        return True
+
+    def peek(self):
+        """ Returns the next non-whitespace character without consuming it. """
+        while True:
+            while (self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in WHITESPACE):
+                self.__pos += 1
+            if (self.__pos < len(self.__buffer)):
+                return self.__buffer[self.__pos]
+            if (not self.__fill(self.__chunkSize)):
+                raise ValueError("Unexpected end of file")
+
+    def consume(self, char):
+        """ Consumes the next non-whitespace character if it equals char. """
+        if (self.peek() != char):
+            return False
+        self.__pos += 1
+        return True
+
+    def expect(self, char):
+        if (not self.consume(char)):
+            raise ValueError("Expected '{}' but found '{}'".format(char, self.peek()))
+
+    def numbers(self, callback):
+        """ Consumes an array of numbers. The tokens are passed to callback in chunks of at most the chunk size, so the
+        array is never decoded completely. """
+        self.expect("[")
+        if (self.consume("]")):
+            return
+        while True:
+            end = self.__buffer.find("]", self.__pos)
+            if (end != -1):
+                callback(self.__buffer[self.__pos:end].split(","))
+                self.__pos = end + 1
+                return
+            # the last number in the buffer may be truncated, it is kept for the next chunk
+            separator = self.__buffer.rfind(",", self.__pos)
+            if (separator != -1):
+                callback(self.__buffer[self.__pos:separator].split(","))
+                self.__pos = separator + 1
+            if (not self.__fill(self.__chunkSize)):
+                raise ValueError("Unexpected end of file")
+
+    def value(self):
+        """ Decodes the next json value. """
+        self.peek()
+        size = self.__chunkSize
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.__buffer, self.__pos)
+                # a value at the end of the buffer may be truncated, e.g. a number
+                if (end < len(self.__buffer) or self.__eof):
+                    self.__pos = end
+                    return value
+            except json.JSONDecodeError as ex:
+                if (self.__eof):
+                    raise ValueError("Invalid json: {}".format(ex))
+            # grow read size to avoid quadratic runtime for large values
+            self.__fill(size)
+            size *= 2
+
+
+def parse(file, arrayKey, callback, chunkSize=1 << 16, numbersKey=None, numbersCallback=None):
+    """ Parses a json object from file. Each element of the array stored under arrayKey is passed to callback. All other
+    entries are returned as dictionary. If arrayKey is present, it is contained in the result with value None.
+
+    numbersKey optionally names an object of numeric arrays. The tokens of each array are passed in chunks to
+    numbersCallback(name, tokens, header), where header contains all entries parsed before. The object is contained in
+    the result with value None.
+    """
+    reader = _Reader(file, chunkSize)
+    result = {}
+
+    reader.expect("{")
+    if (reader.consume("}")):
+        return result
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if (key == arrayKey and reader.peek() == "["):
+            reader.expect("[")
+            if (not reader.consume("]")):
+                callback(reader.value())
+                while (reader.consume(",")):
+                    callback(reader.value())
+                reader.expect("]")
+            result[key] = None
+        elif (key == numbersKey and numbersKey is not None and reader.peek() == "{"):
+            _parseNumbers(reader, lambda name, tokens: numbersCallback(name, tokens, result))
+            result[key] = None
+        else:
+            result[key] = reader.value()
+
+        if (not reader.consume(",")):
+            reader.expect("}")
+            return result
+
+
+def _parseNumbers(reader, callback):
+    reader.expect("{")
+    if (reader.consume("}")):
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        reader.numbers(lambda tokens: callback(name, tokens))
+        if (not reader.consume(",")):
+            reader.expect("}")
+            return
@@ -7,7 +7,7 @@ import numpy as np
 import scipy.integrate
 import scipy.stats
 
-from core import distribution
+from core import distribution, seeding
 from core.distribution import KDE, KdeDistribution
 
 
@@ -105,8 +105,9 @@ class EntropyPerformance(Performance):
         self.__dist = dist
 
     def getValueByDistribution(self, dist, n=10000):
-        borders = dist.getCompleteInterval()
-        h = dist.getDifferentialEntropy()
+        summary = dist.getSummary()
+        borders = summary.interval
+        h = summary.entropy
         return (h - (borders[1] - borders[0]) / n) / math.log2(n)
 
     def getValueBySamples(self, samples):
@@ -118,28 +119,26 @@ class EntropyPerformance(Performance):
 
 class MutualInformationPerformance(Performance):
     """
-    Compute performance based on mutual information.
+    Compute performance based on mutual information. The probabilities of trigger and response are the frequencies of
+    both event types in the statistics of a sequence.
     """
 
-    def __init__(self, trigger, response, size):
-        self.__probTrigger = len(trigger) / size
-        self.__probResponse = len(response) / size
+    def __init__(self, statistics, trigger, response):
+        self.__probTrigger = statistics.getFrequency(trigger)
+        self.__probResponse = statistics.getFrequency(response)
 
     def getValueBySamples(self, samples):
         dist = distribution.samplesToDistribution(samples, KDE)
         return self.getValueByDistribution(dist)
 
     def getValueByDistribution(self, dist):
-        borders = dist.getCompleteInterval()
-        res, _ = scipy.integrate.quad(self.__calculateMutualInformation, -np.inf, np.inf, args=(dist), limit=1000)
-        return res
-
-    def __calculateMutualInformation(self, x, dist):
-        joint = dist.getPDFValue(x) * self.__probTrigger
-        log = dist.getPDFValue(x) / self.__probResponse
-        if (log != 0 and not math.isnan(log)):
-            return joint * math.log2(log)
-        return 0
+        """ Integral of p(x) * P(trigger) * log2(p(x) / P(response)). It is split into
+        P(trigger) * (integral of p(x) * log2(p(x)) - log2(P(response)) * integral of p(x)), so both integrals are
+        memoised in the summary of dist and shared by all scorers. """
+        if (self.__probTrigger == 0):
+            return 0
+        summary = dist.getSummary()
+        return self.__probTrigger * (summary.information - math.log2(self.__probResponse) * summary.mass)
 
 
 class Metric(abc.ABC):
@@ -221,9 +220,10 @@ class DistanceCorrelation(Metric):
         """
 
         ref = self.__computeCov(eventA, eventB)
+        rng = seeding.createGenerator()
         p = 0.0
         for i in range(n):
-            cov = self.__computeCov(eventA, np.random.permutation(eventB))
+            cov = self.__computeCov(eventA, rng.permutation(eventB))
             if (ref < cov):
                 p += 1
         return p / n
@@ -239,8 +239,9 @@ class EnergyDistance(Metric):
     """
 
     def compute(self, eventA, eventB):
-        # actual computation is done in C++ extension
-        value, p = fastEnergyDistance.compute(eventA, eventB, eventA.size, eventB.size, 999)
+        # actual computation is done in C++ extension. The permutations are seeded from the root seed (see core.seeding)
+        seed = int(seeding.createGenerator().integers(1 << 63))
+        value, p = fastEnergyDistance.compute(eventA, eventB, eventA.size, eventB.size, 999, seed)
         return (value, p)
 
 
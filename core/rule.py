@@ -88,6 +88,139 @@ class Rule:
         return response
 
 
+class RuleSet:
+    """
+    Ordered collection of rules that is used like a list of rules. Rules are indexed by trigger and response, so a
+    rule is found in constant time instead of scanning all rules. If several rules share trigger and response,
+    lookups return the first one.
+
+    Each rule is stored in an entry, a list containing only the rule, which is shared by the list of all rules and the
+    indexes. Replacing a rule updates the entry, removing a rule empties it. Empty entries are discarded once they make
+    up half of the list or before positional access, so all modifications update the indexes in constant time.
+    """
+
+    def __init__(self, rules=None):
+        self.__entries = []
+        self.__removed = 0
+        # (trigger, response) -> entries of all rules with this trigger and response in the order of the list
+        self.__index = {}
+        self.__byTrigger = {}
+        self.__byResponse = {}
+        if (rules is not None):
+            self.extend(rules)
+
+    def append(self, rule):
+        """ Appends a rule, even if a rule with the same trigger and response already exists. """
+        entry = [rule]
+        self.__entries.append(entry)
+        key = (rule.trigger, rule.response)
+        entries = self.__index.get(key)
+        if (entries is None):
+            entries = []
+            self.__index[key] = entries
+            self.__byTrigger.setdefault(rule.trigger, {})[rule.response] = entries
+            self.__byResponse.setdefault(rule.response, {})[rule.trigger] = entries
+        entries.append(entry)
+
+    def extend(self, rules):
+        for rule in rules:
+            self.append(rule)
+
+    def add(self, rule):
+        """ Appends a rule only if no rule with the same trigger and response exists. Returns True if it was added. """
+        if ((rule.trigger, rule.response) in self.__index):
+            return False
+        self.append(rule)
+        return True
+
+    def merge(self, rules, replace=False):
+        """ Adds all given rules with a new combination of trigger and response. If replace is set, existing rules are
+        replaced by the given rule with the same trigger and response instead. """
+        for rule in rules:
+            entries = self.__index.get((rule.trigger, rule.response))
+            if (entries is None):
+                self.append(rule)
+            elif (replace):
+                entries[0][0] = rule
+
+    def remove(self, rule):
+        """ Removes the first occurrence of the given rule. Raises a ValueError if it is not contained. """
+        key = (rule.trigger, rule.response)
+        entries = self.__index.get(key, [])
+        idx = next((i for i, entry in enumerate(entries) if (entry[0] == rule)), None)
+        if (idx is None):
+            raise ValueError("{} is not contained in the rule set".format(rule))
+        entries.pop(idx)[0] = None
+        self.__removed += 1
+        if (len(entries) == 0):
+            del self.__index[key]
+            self.__removeFromIndex(self.__byTrigger, rule.trigger, rule.response)
+            self.__removeFromIndex(self.__byResponse, rule.response, rule.trigger)
+        if (2 * self.__removed > len(self.__entries)):
+            self.__compact()
+
+    @staticmethod
+    def __removeFromIndex(index, first, second):
+        del index[first][second]
+        if (len(index[first]) == 0):
+            del index[first]
+
+    def __compact(self):
+        """ Discards the entries of removed rules. """
+        if (self.__removed > 0):
+            self.__entries = [entry for entry in self.__entries if (entry[0] is not None)]
+            self.__removed = 0
+
+    def __getRules(self):
+        self.__compact()
+        return [entry[0] for entry in self.__entries]
+
+    def get(self, trigger, response):
+        """ Returns the rule with the given trigger and response or None. Events are replaced by their type. """
+        entries = self.__index.get((_getEventType(trigger), _getEventType(response)))
+        return None if (entries is None) else entries[0][0]
+
+    def getByTrigger(self, trigger):
+        """ Returns all rules with the given trigger. """
+        return [entries[0][0] for entries in self.__byTrigger.get(_getEventType(trigger), {}).values()]
+
+    def getByResponse(self, response):
+        """ Returns all rules with the given response. """
+        return [entries[0][0] for entries in self.__byResponse.get(_getEventType(response), {}).values()]
+
+    def asJson(self):
+        return self.__getRules()
+
+    def __contains__(self, item):
+        if (isinstance(item, tuple)):
+            return tuple(_getEventType(value) for value in item) in self.__index
+        return any(entry[0] == item for entry in self.__index.get((item.trigger, item.response), []))
+
+    def __getitem__(self, idx):
+        self.__compact()
+        if (isinstance(idx, slice)):
+            return [entry[0] for entry in self.__entries[idx]]
+        return self.__entries[idx][0]
+
+    def __iter__(self):
+        return iter(self.__getRules())
+
+    def __len__(self):
+        return len(self.__entries) - self.__removed
+
+    def __eq__(self, other):
+        if (isinstance(other, RuleSet)):
+            other = other.__getRules()
+        return isinstance(other, list) and self.__getRules() == other
+
+    def __str__(self):
+        return "[{}]".format(", ".join(str(rule) for rule in self))
+
+
+def _getEventType(value):
+    return value.eventType if (isinstance(value, Event)) else value
+
+
 def load(value):
     """ Load a rule from a json string
     Parameter:
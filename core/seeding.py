@@ -0,0 +1,49 @@
+""" Independent random number streams
+
+All random numbers are drawn from numpy.random.Generator objects. Each generator is seeded by a child of a root
+numpy.random.SeedSequence, so the streams of different distributions are statistically independent and all random
+numbers of a run are reproducible by seeding the root. Workers, e.g. the processes of a parallel matcher, receive
+children of the root via spawn and use them as their own root via 'using'. The results are then independent of the
+number of processes and the order in which the workers finish.
+"""
+
+import contextlib
+
+import numpy as np
+
+_root = np.random.SeedSequence()
+
+
+def seed(value=None):
+    """ Seeds the root of all random number streams. value is an int, a SeedSequence or None for fresh entropy. """
+    global _root
+    if (isinstance(value, np.random.SeedSequence)):
+        # a copy starts spawning at the first child again, so the same seed always leads to the same streams
+        value = np.random.SeedSequence(value.entropy, spawn_key=value.spawn_key, pool_size=value.pool_size)
+    else:
+        value = np.random.SeedSequence(value)
+    _root = value
+
+
+def spawn(n):
+    """ Returns n independent SeedSequence objects, e.g. for handing to workers. """
+    return _root.spawn(n)
+
+
+def createGenerator(value=None):
+    """ Returns a new generator. If no seed is given, the next child of the root is used. """
+    if (value is None):
+        value = _root.spawn(1)[0]
+    return np.random.default_rng(value)
+
+
+@contextlib.contextmanager
+def using(value):
+    """ Temporarily replaces the root by the given seed. """
+    global _root
+    previous = _root
+    seed(value)
+    try:
+        yield
+    finally:
+        _root = previous
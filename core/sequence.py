@@ -1,42 +1,317 @@
+import array
 import copy
 import json
 import logging
 import math
 import os
+import sys
+import weakref
 
 import numpy as np
 
-from core import event, rule
+from core import binarySequence, columnarJson, compression, jsonStream, rule, storage
 from core.event import Event
+from core.rule import RuleSet
+from core.sequenceStatistics import SequenceStatistics
+from core.storage import ColumnarStorage, NO_EVENT
 
 
 class Sequence:
-    def __init__(self, events, length=0, rules=None, calculatedRules=None):
-        if (rules is None):
-            rules = []
-        if (calculatedRules is None):
-            calculatedRules = []
-        events.sort(key=lambda e: e.timestamp)
-
-        self.events = events
+    def __init__(self, events, length=0, rules=None, calculatedRules=None, resolution=None):
+        """
+        :param events: Either a list of Event objects or a ColumnarStorage. If a storage is provided, the sequence uses
+            the columnar backend and Event objects are only created when they are requested.
+        :param resolution: Duration of one tick. If provided, the index stores integer ticks instead of floats. For a
+            ColumnarStorage the resolution of the storage is used.
+        """
         self.length = length
         self.rules = rules
         self.calculatedRules = calculatedRules
+        self.resolution = resolution
+        self._storage = None
+        self._events = None
+        self.__cache = {}
+        self.__index = None
+        self.__linkedStorage = None
+        self.__statistics = None
+        self.__links = {}
+        self.__eventTypes = None
+        self.__parent = None
+        self.__offset = 0
+        self.__views = []
+
+        if (isinstance(events, ColumnarStorage)):
+            # normalization is a single subtraction on the timestamp column
+            self._storage = events
+            self.resolution = events.resolution
+            self.firstTimestamp = max(events.toTime(events.timestamps[0]) - 1, 0) if (len(events) > 0) else 0
+            events.shift(self.firstTimestamp)
+            lastTimestamp = events.toTime(events.timestamps[-1]) if (len(events) > 0) else None
+        else:
+            events.sort(key=lambda e: e.timestamp)
+            self._events = events
+
+            self.eventTypes = set()
+            self.firstTimestamp = max(events[0].timestamp - 1, 0) if (len(events) > 0) else 0
+            for e in events:
+                e.timestamp = self.__normalize(e.timestamp)
+                self.eventTypes.add(e.eventType)
+            lastTimestamp = events[-1].timestamp if (len(events) > 0) else None
+
+        if (length == 0 and lastTimestamp is not None):
+            self.length = int(lastTimestamp) + 1
+
+    @property
+    def events(self):
+        """ List of all events. For columnar sequences the Event objects are created on first access. """
+        if (self._events is None):
+            self._events = [self.__getEvent(i) for i in range(len(self._storage))]
+        return self._events
+
+    @events.setter
+    def events(self, events):
+        self._events = events
+        self._storage = None
+        self.__cache = {}
+        self.__index = None
+        self.__linkedStorage = None
+        self.__statistics = None
+        self.__links = {}
+        self.__parent = None
+        self.__offset = 0
+
+    @property
+    def rules(self):
+        """ RuleSet of the rules used to create this sequence. Works only for synthetic sequences. """
+        return self.__rules
+
+    @rules.setter
+    def rules(self, rules):
+        self.__rules = rules if (isinstance(rules, RuleSet)) else RuleSet(rules)
+
+    @property
+    def calculatedRules(self):
+        """ RuleSet of the rules found by a matcher """
+        return self.__calculatedRules
+
+    @calculatedRules.setter
+    def calculatedRules(self, rules):
+        self.__calculatedRules = rules if (isinstance(rules, RuleSet)) else RuleSet(rules)
+
+    @property
+    def eventTypes(self):
+        """ Set of all used event types. For columnar sequences it is computed on first access. """
+        if (self.__eventTypes is None):
+            self.__eventTypes = self.getStorage().getEventTypes()
+        return self.__eventTypes
+
+    @eventTypes.setter
+    def eventTypes(self, eventTypes):
+        self.__eventTypes = eventTypes
+
+    def window(self, start, end):
+        """ Returns a view containing all events with start <= timestamp < end. The timestamps are not normalized again,
+        i.e. they are relative to the same firstTimestamp as the timestamps of this sequence. """
+        return self.__view(*self.getStorage().getRange(start, end))
+
+    def head(self, n):
+        """ Returns a view containing the first n events. """
+        return self.__view(0, max(0, min(n, len(self))))
+
+    def __view(self, first, last):
+        """ Creates a view on the events at positions [first, last). The view shares the columns of the storage and the
+        Event objects with this sequence, so creating a view does not copy any events. """
+        s = self.getStorage().slice(first, last)
+        view = Sequence.__new__(Sequence)
+        view.length = int(s.toTime(s.timestamps[-1])) + 1 if (len(s) > 0) else 0
+        view.resolution = self.resolution
+        view.rules = self.rules
+        view.calculatedRules = self.calculatedRules
+        view.firstTimestamp = self.firstTimestamp
+        view._storage = s
+        view._events = None
+        view.__cache = {}
+        view.__index = None
+        view.__linkedStorage = None
+        view.__statistics = None
+        view.__links = None
+        view.__eventTypes = None
+        view.__parent = self
+        view.__offset = first
+        view.__views = []
+        self.__views.append(weakref.ref(view))
+        return view
+
+    def __getstate__(self):
+        # weak references can not be pickled, a copy has no views
+        state = self.__dict__.copy()
+        state["_Sequence__views"] = []
+        return state
 
-        self.eventTypes = set()
-        self.firstTimestamp = max(self.events[0].timestamp - 1, 0) if (len(self.events) > 0) else 0
-        for e in self.events:
-            e.timestamp -= self.firstTimestamp
-            self.eventTypes.add(e.eventType)
+    def isView(self):
+        """ Returns True if this sequence is a view on the events of another sequence. """
+        return self.__parent is not None
 
-        if (length == 0 and len(self.events) > 0):
-            self.length = int(self.events[-1].timestamp) + 1
+    def isColumnar(self):
+        """ Returns True if the events are stored in a ColumnarStorage. """
+        return self._storage is not None
+
+    def getStorage(self):
+        """ Returns the columnar representation of this sequence. For sequences based on a list of events, the storage is
+        derived from the events once and serves as index for lookups by event type. It is rebuilt if the number of events
+        changed. """
+        if (self._storage is not None):
+            return self._storage
+        if (self.__index is None or len(self.__index) != len(self._events)):
+            self.__index = storage.fromEvents(self._events, links=False, resolution=self.resolution)
+        return self.__index
+
+    def invalidateIndex(self):
+        """ Discards all indexes and statistics. Has to be called if events were modified directly. """
+        self.__index = None
+        self.__linkedStorage = None
+        self.__statistics = None
+        if (self._storage is not None):
+            self._storage.invalidateIndex()
+
+    def addEvents(self, events):
+        """ Appends the given events to this sequence. The timestamps are normalized like the timestamps of the events
+        passed to the constructor. If the sequence is empty, the first batch determines firstTimestamp.
+
+        Batches starting after the last event are added in time linear in the batch size. Events before the last event
+        are merged with the affected tail of the sequence. Event types and indexes are updated instead of rebuilt. """
+        if (len(events) == 0):
+            return
+        if (self.isView()):
+            # detach from the parent sequence
+            self.events = list(self.events)
+        if (len(self) == 0 and self.firstTimestamp == 0):
+            self.firstTimestamp = max(min(e.timestamp for e in events) - 1, 0)
+        for e in events:
+            e.timestamp = self.__normalize(e.timestamp)
+
+        if (self.isColumnar()):
+            size = len(self._storage)
+            start, position = self._storage.append([e.timestamp for e in events], [e.eventType for e in events],
+                                                   [e.occurred for e in events])
+            if (start < size):
+                self.__detachViews(start)
+                self.__cache = {(idx if (idx < start) else int(position[idx - start])): e
+                                for idx, e in self.__cache.items()}
+                self._events = None
+                self.__moveLinks(start, position)
+            added = position[len(position) - len(events):]
+            self.__cache.update((int(added[i]), e) for i, e in enumerate(events))
+            if (self._events is not None):
+                self._events.extend(events[i] for i in np.argsort(added, kind="stable"))
+        else:
+            index = self.__index if (self.__index is not None and len(self.__index) == len(self._events)) else None
+            events = sorted(events, key=lambda e: e.timestamp)
+            start = len(self._events)
+            while (start > 0 and self._events[start - 1].timestamp > events[0].timestamp):
+                start -= 1
+            if (start == len(self._events)):
+                self._events.extend(events)
+            else:
+                self.__detachViews(start)
+                tail = self._events[start:] + events
+                order = sorted(range(len(tail)), key=lambda i: tail[i].timestamp)
+                self._events[start:] = [tail[i] for i in order]
+                position = np.empty(len(order), dtype=np.int64)
+                position[order] = np.arange(start, start + len(order))
+                self.__moveLinks(start, position)
+            self.__index = index
+            if (index is not None):
+                index.append([e.timestamp for e in events], [e.eventType for e in events], [e.occurred for e in events])
+
+        if (self.__eventTypes is not None):
+            self.__eventTypes.update(e.eventType for e in events)
+        self.length = max(self.length, int(max(e.timestamp for e in events)) + 1)
+        self.__linkedStorage = None
+        self.__statistics = None
+
+    def __detachViews(self, start):
+        """ Detaches all views containing events at positions >= start before these events move. The detached views keep
+        their events and use their own columns, which are not modified by the merge. """
+        for ref in self.__views:
+            view = ref()
+            if (view is None or view.__parent is not self or view.__offset + len(view) <= start):
+                continue
+            first, last = view.__offset, view.__offset + len(view)
+            if (self._storage is None):
+                view.__cache = {idx: self._events[first + idx] for idx in range(len(view))}
+            else:
+                view.__cache = {idx - first: e for idx, e in self.__cache.items() if (first <= idx < last)}
+            view.__parent = None
+            view.__offset = 0
+        self.__views = [ref for ref in self.__views if (ref() is not None and ref().__parent is self)]
+
+    def __moveLinks(self, start, position):
+        """ Translates the stored links after the events at [start, len) moved to position. """
+        for key, links in self.__links.items():
+            moved = links >= start
+            links = links.copy()
+            links[moved] = position[links[moved] - start]
+            self.__links[key] = links
+
+    def getStatistics(self):
+        """ Returns counts, rates and timestamps of all event types. The statistics are computed on first access and
+        cached until events are added. """
+        if (self.__statistics is None or self.__statistics.size != len(self)):
+            self.__statistics = SequenceStatistics([self.getStorage()], [self.length])
+        return self.__statistics
+
+    def __normalize(self, timestamp):
+        """ Subtracts firstTimestamp from the given timestamp and rounds the result to the resolution if defined. """
+        if (self.resolution is None):
+            return timestamp - self.firstTimestamp
+        return float(storage.toTime(storage.toTicks(timestamp - self.firstTimestamp, self.resolution), self.resolution))
+
+    def getEventsAt(self, timestamp):
+        """ Returns all events with exactly the given timestamp. For sequences with a resolution, the timestamp is
+        rounded to the nearest tick. """
+        first, last = self.getStorage().getRange(timestamp)
+        if (self.isColumnar()):
+            return [self.__getEvent(i) for i in range(first, last)]
+        return self._events[first:last]
 
     def getEvents(self, eventType=None):
         """ Returns all events with the given event type. If no eventType is provided all events are returned. """
         if (eventType is None):
             return self.events
-        return [e for e in self.events if e.eventType == eventType]
+        positions = self.getStorage().getPositions(eventType)
+        if (self.isColumnar()):
+            return [self.__getEvent(int(i)) for i in positions]
+        return [self._events[i] for i in positions]
+
+    def __getEvent(self, idx):
+        """ Returns the event at position idx of a columnar sequence. The event and all events linked to it are created
+        on first access. Views return the events of their parent. """
+        if (self.__parent is not None):
+            return self.__parent.__getEvent(self.__offset + idx)
+        if (self._storage is None):
+            return self._events[idx]
+        if (idx in self.__cache):
+            return self.__cache[idx]
+
+        triggered = self._storage.triggered
+        triggeredBy = self._storage.getTriggeredBy()
+        created = []
+        pending = [idx]
+        while (len(pending) > 0):
+            i = pending.pop()
+            if (i in self.__cache):
+                continue
+            self.__cache[i] = self._storage.createEvent(i)
+            created.append(i)
+            for j in (triggered[i], triggeredBy[i]):
+                if (j != NO_EVENT and j not in self.__cache):
+                    pending.append(j)
+
+        for i in created:
+            if (triggered[i] != NO_EVENT):
+                self.__cache[i].setTriggered(self.__cache[triggered[i]])
+        return self.__cache[idx]
 
     # noinspection PyMethodMayBeStatic
     def getPaddedEvent(self, event, prevTime):
@@ -54,13 +329,13 @@ class Sequence:
 
     def getCalculatedRule(self, trigger, response):
         """ Returns the calculated rule with the given trigger and response. """
-        return self.__getRule(trigger, response, self.calculatedRules)
+        return self.calculatedRules.get(trigger, response)
 
     def getRule(self, trigger, response):
         """ Returns the rule used to create the sequence with the given trigger and response. Works only for synthetic
         sequences.
         """
-        return self.__getRule(trigger, response, self.rules)
+        return self.rules.get(trigger, response)
 
     def getBaseDistribution(self, trigger, response):
         """ For a given calculatedRule the corresponding real distribution is searched.
@@ -75,31 +350,80 @@ class Sequence:
             return -rule.distributionResponse
         return None
 
-    @staticmethod
-    def __getRule(trigger, response, rules):
-        for r in rules:
-            if (r.matches(trigger, response)):
-                return r
-        return None
-
     def asVector(self, eventType):
-        """ Returns all timestamps of the events with the given eventType"""
-        l = [e.timestamp for e in self.getEvents(eventType) if e.occurred]
-        return np.array(l)
+        """ Returns all timestamps of the events with the given eventType. The result is a read-only view. """
+        return self.getStorage().getTimestamps(eventType)
 
     def getMissingIdx(self, eventType):
         """ Returns the indices of events that did not occur. Works only for synthetic sequences. """
-        l = np.array([e.occurred for e in self.getEvents(eventType)])
+        s = self.getStorage()
+        l = s.occurred[s.getPositions(eventType)]
         return np.where(np.arange(len(l)) * np.invert(l))[0]
 
+    def __getOccurredPositions(self, eventType):
+        """ Returns the positions of all occurred events with the given event type, i.e. the position of each entry of
+        asVector. """
+        s = self.getStorage()
+        positions = s.getPositions(eventType)
+        return positions[s.occurred[positions]]
+
+    def setLinks(self, trigger, response, idx):
+        """ Stores the pairs of trigger and response events found by a matcher. Each row of idx contains the index of
+        a trigger in asVector(trigger) and of the matched response in asVector(response). Links of a view are stored in
+        the parent sequence and replace only the links within the view. """
+        idx = np.asarray(idx, dtype=np.int64).reshape(-1, 2)
+        links = np.column_stack((self.__getOccurredPositions(trigger)[idx[:, 0]],
+                                 self.__getOccurredPositions(response)[idx[:, 1]]))
+        if (self.__parent is not None):
+            previous = self.__parent.getLinks(trigger, response)
+            outside = ((previous < self.__offset) | (previous >= self.__offset + len(self))).any(axis=1)
+            self.__parent.__links[(str(trigger), str(response))] = np.concatenate((previous[outside],
+                                                                                   links + self.__offset))
+        else:
+            self.__links[(str(trigger), str(response))] = links
+
+    def getLinks(self, trigger, response):
+        """ Returns the matched pairs of trigger and response as array with the positions of both events in this
+        sequence in each row. """
+        if (self.__parent is not None):
+            links = self.__parent.getLinks(trigger, response) - self.__offset
+            return links[((links >= 0) & (links < len(self))).all(axis=1)]
+        return self.__links.get((str(trigger), str(response)), np.empty((0, 2), dtype=np.int64))
+
+    def getTrueLinks(self, trigger, response):
+        """ Returns the pairs of trigger and response that are linked via 'triggered', e.g. by the generator, in the
+        same format as getLinks. Works only for synthetic sequences. """
+        s = self.asStorage()
+        if (s.getCode(trigger) is None or s.getCode(response) is None):
+            return np.empty((0, 2), dtype=np.int64)
+        positions = s.getPositions(trigger)
+        linked = s.triggered[positions]
+        mask = linked != NO_EVENT
+        positions, linked = positions[mask], linked[mask]
+        mask = s.codes[linked] == s.getCode(response)
+        return np.column_stack((positions[mask], linked[mask]))
+
+    def getLags(self, trigger, response, true=False):
+        """ Returns the time lags between all linked pairs of trigger and response that both occurred. If true is set,
+        the links of getTrueLinks are used instead of the matched links. """
+        links = self.getTrueLinks(trigger, response) if true else self.getLinks(trigger, response)
+        s = self.getStorage()
+        links = links[s.occurred[links].all(axis=1)]
+        return s.toTime(s.timestamps[links[:, 1]] - s.timestamps[links[:, 0]])
+
     def __len__(self):
-        return len(self.events)
+        if (self._events is None):
+            return len(self._storage)
+        return len(self._events)
 
     def __str__(self):
         tokens = []
 
         # truncate to 500 events due to performance
-        seq = copy.copy(self.getEvents()[:500])
+        if (self._events is None):
+            seq = [self.__getEvent(i) for i in range(min(500, len(self._storage)))]
+        else:
+            seq = copy.copy(self._events[:500])
         prevTime = -1
         for i in range(len(seq)):
             for e in self.getPaddedEvent(seq[i], prevTime):
@@ -108,37 +432,134 @@ class Sequence:
         return "".join(tokens)
 
     def asJson(self):
-        return {
+        value = {
             "length": self.length,
             "events": self.events,
             "rules": self.rules,
             "firstTimestamp": self.firstTimestamp,
             "calculatedRules": self.calculatedRules
         }
+        if (self.resolution is not None):
+            value["resolution"] = self.resolution
+        return value
+
+    def asStorage(self):
+        """ Returns a ColumnarStorage containing all events of this sequence including the links between events. If the
+        links are stored in Event objects, the storage is derived from the events once and discarded like the index
+        (see invalidateIndex). """
+        if (self.__hasStoredLinks()):
+            return self._storage
+        if (self.__linkedStorage is None or len(self.__linkedStorage) != len(self)):
+            self.__linkedStorage = storage.fromEvents(self.events, resolution=self.resolution)
+        return self.__linkedStorage
+
+    def __hasStoredLinks(self):
+        """ Checks if the links of the storage are up to date, i.e. no Event objects were created that could have been
+        modified. """
+        if (self.__parent is not None):
+            return self.__parent.__hasStoredLinks()
+        return self.isColumnar() and len(self.__cache) == 0
 
     def store(self, filename):
-        import core
-        with open(filename, "w+") as file:
-            file.write(json.dumps(self.asJson(), default=core.defaultJsonEncoding))
+        """ Stores this sequence in filename. If the file has the extension '.bseq', the binary format is used.
+        Otherwise the events are stored as columns of a json file (see columnarJson), which is compressed if the
+        extension is '.gz', '.bz2', '.xz' or '.lzma'. """
+        header = {
+            "length": self.length,
+            "rules": self.rules,
+            "firstTimestamp": self.firstTimestamp,
+            "calculatedRules": self.calculatedRules
+        }
+        if (filename.endswith(binarySequence.EXTENSION)):
+            binarySequence.write(filename, self.asStorage(), header)
+            return
 
+        with compression.openFile(filename, "w") as file:
+            columnarJson.write(file, self.asStorage(), header)
 
-def load(value):
-    if (isinstance(value, str)):
-        value = json.loads(value)
 
+def fromColumns(timestamps, eventTypes, occurred=None, length=0, rules=None, calculatedRules=None, resolution=None):
+    """ Creates a columnar sequence from a list of timestamps and a list of event types. If a resolution is provided,
+    the timestamps are stored as integer ticks. """
+    return Sequence(storage.fromColumns(timestamps, eventTypes, occurred, resolution=resolution), length, rules,
+                    calculatedRules)
+
+
+class _EventCollector:
+    """ Collects the events of a sequence file. Events are identified by event type and timestamp, duplicates are
+    merged via a hash table. Events referenced via 'triggered' are linked to the corresponding event. """
+
+    def __init__(self):
+        self.__positions = {}
+        self.__codes = {}
+        self.__explicit = bytearray()
+        self.vocabulary = []
+        self.timestamps = array.array("d")
+        self.codes = array.array("i")
+        self.occurred = bytearray()
+        self.triggered = array.array("q")
+
+    def add(self, item):
+        """ Adds an event and all events triggered by it. """
+        idx = self.__get(item, True)
+        while ("triggered" in item):
+            item = item["triggered"]
+            triggeredIdx = self.__get(item, False)
+            self.triggered[idx] = triggeredIdx
+            idx = triggeredIdx
+
+    def __get(self, item, explicit):
+        try:
+            eventType = sys.intern(str(item["eventType"]))
+        except KeyError:
+            raise ValueError("Missing parameter 'eventType'")
+        timestamp = float(item["timestamp"]) if ("timestamp" in item) else -1.0
+        occurred = item["occurred"] == "True" if ("occurred" in item) else True
+
+        key = (eventType, timestamp)
+        idx = self.__positions.get(key)
+        if (idx is None):
+            idx = len(self.timestamps)
+            self.__positions[key] = idx
+            if (eventType not in self.__codes):
+                self.__codes[eventType] = len(self.vocabulary)
+                self.vocabulary.append(eventType)
+            self.timestamps.append(timestamp)
+            self.codes.append(self.__codes[eventType])
+            self.occurred.append(occurred)
+            self.triggered.append(NO_EVENT)
+            self.__explicit.append(explicit)
+        elif (explicit and not self.__explicit[idx]):
+            # nested references do not store whether the event occurred
+            self.occurred[idx] = occurred
+            self.__explicit[idx] = True
+        return idx
+
+    def asStorage(self, resolution=None):
+        timestamps = np.frombuffer(self.timestamps, dtype=float)
+        if (resolution is not None):
+            timestamps = storage.toTicks(timestamps, resolution)
+        return ColumnarStorage(timestamps, np.frombuffer(self.codes, dtype=np.int32), self.vocabulary,
+                               np.frombuffer(self.occurred, dtype=bool), np.frombuffer(self.triggered, dtype=np.int64),
+                               resolution=resolution)
+
+    def asEvents(self):
+        return _createEvents(self.asStorage())
+
+
+def _createEvents(s):
+    """ Creates linked Event objects for all events of the given storage. """
+    events = [s.createEvent(i) for i in range(len(s))]
+    for i in np.flatnonzero(s.triggered != NO_EVENT):
+        events[i].setTriggered(events[s.triggered[i]])
+    return events
+
+
+def _create(value, events, columnar):
     try:
         length = int(value["length"])
-
-        events = []
-        for item in value["events"]:
-            e = event.load(item)
-            if (e not in events):
-                events.append(e)
-            while (e.triggered is not None):
-                e = e.triggered
-                if (e not in events):
-                    events.append(e)
-        events.sort(key=lambda x: x.timestamp)
+        if ("events" not in value):
+            raise KeyError("events")
 
         rules = []
         if ("rules" in value):
@@ -147,23 +568,62 @@ def load(value):
                 rules.append(r)
 
         calculatedRules = []
-        if ("rules" in value):
+        if ("calculatedRules" in value):
             for item in value["calculatedRules"]:
                 r = rule.load(item)
                 calculatedRules.append(r)
 
-        seq = Sequence(events, length, rules)
-        seq.firstTimestamp = int(value["firstTimestamp"])
+        resolution = value.get("resolution")
+        if (isinstance(events, _EventCollector)):
+            events = events.asStorage(resolution) if columnar else events.asEvents()
+        elif (not columnar):
+            events = _createEvents(events)
+        seq = Sequence(events, length, rules, resolution=resolution)
+        seq.firstTimestamp = int(value["firstTimestamp"]) if (resolution is None) else float(value["firstTimestamp"])
         seq.calculatedRules = calculatedRules
+        for r in calculatedRules:
+            # restore the links from the assignment stored by the matcher (algorithms.RESULT_IDX)
+            if (r.data.get("Index") is not None):
+                try:
+                    seq.setLinks(r.trigger, r.response, r.data["Index"])
+                except IndexError:
+                    logging.warning("Stored assignment of {} does not match the events".format(r))
         logging.debug("Loaded sequence: " + str(seq))
         return seq
     except KeyError:
         raise ValueError("Missing parameter 'length' and/or 'events'")
 
 
-def loadFromFile(filename):
+def load(value, columnar=False):
+    """ Load a sequence from a json string. If columnar is True, the events are kept in a ColumnarStorage. """
+    if (isinstance(value, str)):
+        value = json.loads(value)
+    if (columnarJson.isColumnar(value)):
+        return _create(dict(value, events=None), columnarJson.read(value), columnar)
+
+    collector = _EventCollector()
+    for item in value.get("events", []):
+        collector.add(item)
+    return _create(value, collector, columnar)
+
+
+def loadFromFile(filename, columnar=False):
+    """ Load a sequence from a file. Files in the binary format are mapped into memory and always result in a columnar
+    sequence. Json files are either in the columnar format written by Sequence.store or contain a list of events. The
+    events of such lists and the columns are parsed incrementally, so the file is never loaded completely. Compressed
+    json files are decompressed while parsing. """
     # noinspection PyUnresolvedReferences
     filename = os.path.toAbsolutePath(filename)
-    with open(filename, "r") as file:
-        content = json.loads("".join(file.readlines()))
-        return load(content)
+    if (binarySequence.isBinary(filename)):
+        s, header = binarySequence.read(filename)
+        header["events"] = None
+        return _create(header, s, True)
+
+    collector = _EventCollector()
+    columns = columnarJson.ColumnCollector()
+    with compression.openFile(filename, "r") as file:
+        content = jsonStream.parse(file, "events", collector.add, numbersKey="columns", numbersCallback=columns.add)
+    if (columnarJson.isColumnar(content)):
+        content["events"] = None
+        return _create(content, columnarJson.read(content, columns), columnar)
+    return _create(content, collector, columnar)
@@ -0,0 +1,98 @@
+""" Summary statistics of sequences
+
+Counts, rates and first/last timestamps of all event types are computed in one pass over the columns of a sequence.
+Inter-arrival times and their histograms are computed on first request for an event type. All values are cached, so
+consumers like the matchers or the bayesian network read them instead of scanning the events again.
+"""
+
+import numpy as np
+
+
+class SequenceStatistics:
+    def __init__(self, storages, durations):
+        """
+        :param storages: List of ColumnarStorage objects. Statistics of several storages are combined, but timestamps of
+            different storages are never compared, e.g. inter-arrival times are computed for each storage separately.
+        :param durations: Length in time of each storage
+        """
+        self.__storages = list(storages)
+        self.size = sum(len(s) for s in self.__storages)
+        self.duration = sum(durations)
+
+        self.__codes = {}
+        for s in self.__storages:
+            for eventType in s.vocabulary:
+                self.__codes.setdefault(eventType, len(self.__codes))
+        n = len(self.__codes)
+        self.__counts = np.zeros(n, dtype=np.int64)
+        self.__occurred = np.zeros(n, dtype=np.int64)
+        self.__first = np.full(n, np.inf)
+        self.__last = np.full(n, -np.inf)
+        for s in self.__storages:
+            mapping = np.array([self.__codes[eventType] for eventType in s.vocabulary], dtype=np.int64)
+            if (len(mapping) == 0):
+                continue
+            self.__counts[mapping] += np.bincount(s.codes, minlength=len(mapping))
+            self.__occurred[mapping] += np.bincount(s.codes[s.occurred], minlength=len(mapping))
+            for eventType, code in zip(s.vocabulary, mapping):
+                timestamps = s.getTimestamps(eventType)
+                if (len(timestamps) > 0):
+                    self.__first[code] = min(self.__first[code], timestamps[0])
+                    self.__last[code] = max(self.__last[code], timestamps[-1])
+
+        self.__interArrivals = {}
+        self.__histograms = {}
+
+    @property
+    def eventTypes(self):
+        """ Set of all event types used by at least one event """
+        return {eventType for eventType, code in self.__codes.items() if (self.__counts[code] > 0)}
+
+    def getCount(self, eventType):
+        """ Returns the number of events with the given event type. """
+        code = self.__codes.get(str(eventType))
+        return 0 if (code is None) else int(self.__counts[code])
+
+    def getOccurredCount(self, eventType):
+        """ Returns the number of events with the given event type that really occurred. This equals the length of
+        Sequence.asVector. """
+        code = self.__codes.get(str(eventType))
+        return 0 if (code is None) else int(self.__occurred[code])
+
+    def getFrequency(self, eventType):
+        """ Returns the fraction of all events that occurred and have the given event type. """
+        return self.getOccurredCount(eventType) / self.size if (self.size > 0) else 0
+
+    def getRate(self, eventType):
+        """ Returns the number of occurred events with the given event type per time unit. """
+        return self.getOccurredCount(eventType) / self.duration if (self.duration > 0) else 0
+
+    def getFirstTimestamp(self, eventType):
+        """ Returns the timestamp of the first occurred event with the given event type or None. """
+        code = self.__codes.get(str(eventType))
+        return None if (code is None or self.__occurred[code] == 0) else float(self.__first[code])
+
+    def getLastTimestamp(self, eventType):
+        """ Returns the timestamp of the last occurred event with the given event type or None. """
+        code = self.__codes.get(str(eventType))
+        return None if (code is None or self.__occurred[code] == 0) else float(self.__last[code])
+
+    def getInterArrivalTimes(self, eventType):
+        """ Returns the time between consecutive occurred events with the given event type. The result is read-only. """
+        eventType = str(eventType)
+        if (eventType not in self.__interArrivals):
+            values = np.concatenate([np.diff(s.getTimestamps(eventType)) for s in self.__storages] + [np.empty(0)])
+            values.flags.writeable = False
+            self.__interArrivals[eventType] = values
+        return self.__interArrivals[eventType]
+
+    def getInterArrivalHistogram(self, eventType, bins=10):
+        """ Returns the histogram of the inter-arrival times of the given event type as tuple (counts, edges). See
+        numpy.histogram for possible values of bins. """
+        key = (str(eventType), bins) if (isinstance(bins, (int, str))) else None
+        if (key is not None and key in self.__histograms):
+            return self.__histograms[key]
+        histogram = np.histogram(self.getInterArrivalTimes(eventType), bins=bins)
+        if (key is not None):
+            self.__histograms[key] = histogram
+        return histogram
@@ -0,0 +1,319 @@
+""" Column oriented storage of events
+
+Instead of a list of Event objects, all events of a sequence are stored as parallel NumPy arrays. Event types are
+encoded as integers referring to a vocabulary of event types. Event objects are only created on request.
+
+Optionally, timestamps are stored as int64 ticks of a declared resolution instead of floats. Ticks make normalization
+exact and allow lookups of exact timestamps without float comparisons. All methods accept and return time values, only
+the column 'timestamps' contains the raw ticks.
+"""
+
+import math
+
+import numpy as np
+
+from core.event import Event
+
+NO_EVENT = -1
+
+# relative distance to the closest tick below which a time value is considered to lie on that tick
+_TICK_TOLERANCE = 1e-9
+
+
+class ColumnarStorage:
+    def __init__(self, timestamps, codes, vocabulary, occurred=None, triggered=None, trusted=False, resolution=None):
+        """
+        :param timestamps: Timestamps of all events
+        :param codes: Position of the event type of each event in vocabulary
+        :param vocabulary: List of all event types
+        :param occurred: Mask of events that really occurred. If not provided all events occurred
+        :param triggered: Index of the event triggered by each event or NO_EVENT
+        :param trusted: If True, the events are known to be ordered by timestamp and every event type in vocabulary is
+            used. Validation is skipped, so the columns are not read during construction.
+        :param resolution: Duration of one tick. If provided, timestamps contains integer ticks
+        """
+        self.resolution = resolution
+        self.timestamps = np.asarray(timestamps, dtype=float if (resolution is None) else np.int64)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.vocabulary = [str(eventType) for eventType in vocabulary]
+        self.occurred = np.ones(len(self.timestamps), dtype=bool) if (occurred is None) \
+            else np.asarray(occurred, dtype=bool)
+        self.triggered = np.full(len(self.timestamps), NO_EVENT, dtype=np.int64) if (triggered is None) \
+            else np.asarray(triggered, dtype=np.int64)
+        self.__parentLinks = None
+        self.__buffers = None
+        # set if slices share the columns, which are copied before events are moved
+        self.__shared = False
+        self.__triggeredBy = None
+        self.__index = None
+        self.__trusted = trusted
+        self.__lookup = {eventType: code for code, eventType in enumerate(self.vocabulary)}
+
+        if (not len(self.timestamps) == len(self.codes) == len(self.occurred) == len(self.triggered)):
+            raise ValueError("Columns have different lengths")
+        if (not trusted):
+            self.sort()
+
+    @property
+    def triggered(self):
+        """ Index of the event triggered by each event or NO_EVENT """
+        if (self.__parentLinks is not None):
+            # links of a slice are translated on first access
+            offset, links = self.__parentLinks
+            inside = (links >= offset) & (links < offset + len(links))
+            self.__triggered = np.where(inside, links - offset, NO_EVENT)
+            self.__parentLinks = None
+        return self.__triggered
+
+    @triggered.setter
+    def triggered(self, triggered):
+        self.__triggered = triggered
+        self.__parentLinks = None
+
+    def slice(self, start, end):
+        """ Returns a storage containing the events at positions [start, end). The columns of the result are views on the
+        columns of this storage, so no data is copied. Modifications of the timestamps are visible in both storages. """
+        start, end, _ = slice(start, end).indices(len(self))
+        end = max(start, end)
+        result = ColumnarStorage(self.timestamps[start:end], self.codes[start:end], self.vocabulary,
+                                 self.occurred[start:end], self.__triggered[start:end], trusted=True,
+                                 resolution=self.resolution)
+        # the slice may not use every event type of the vocabulary
+        result.__trusted = False
+        self.__shared = True
+        if (self.__parentLinks is None):
+            result.__parentLinks = (start, self.__triggered[start:end])
+        else:
+            offset, links = self.__parentLinks
+            result.__parentLinks = (offset + start, links[start:end])
+        return result
+
+    def sort(self):
+        """ Orders all events by timestamp. Events with identical timestamps keep their relative order. If the order
+        changed, the new position of each event is returned. """
+        if (np.all(self.timestamps[1:] >= self.timestamps[:-1])):
+            return None
+        order = np.argsort(self.timestamps, kind="stable")
+        self.timestamps = self.timestamps[order]
+        self.codes = self.codes[order]
+        self.occurred = self.occurred[order]
+
+        # translate links to new positions
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        triggered = self.triggered[order]
+        self.triggered = np.where(triggered == NO_EVENT, NO_EVENT, position[triggered])
+        self.__triggeredBy = None
+        self.invalidateIndex()
+        return position
+
+    def append(self, timestamps, eventTypes, occurred=None):
+        """ Appends further events. Unknown event types are added to the vocabulary.
+
+        The columns grow geometrically, so appending batches that start after the last event takes amortised time linear
+        in the batch size. Out of order events are handled by a single merge of the batch with the affected tail of the
+        storage. The index is rebuilt on the next lookup, i.e. once for any number of appended batches.
+
+        :return: Tuple (start, position). All events before start keep their position. position contains the new
+            position of the events at [start, len) before the append followed by the appended events.
+        """
+        size = len(self)
+        count = len(timestamps)
+        timestamps = self.toTicks(timestamps)
+        occurred = np.ones(count, dtype=bool) if (occurred is None) else np.asarray(occurred, dtype=bool)
+        self.__trusted = False
+        for eventType in eventTypes:
+            if (str(eventType) not in self.__lookup):
+                self.__lookup[str(eventType)] = len(self.vocabulary)
+                self.vocabulary.append(str(eventType))
+        codes = np.array([self.__lookup[str(eventType)] for eventType in eventTypes], dtype=np.int32)
+
+        # existing events with identical timestamps stay in front of appended events
+        start = size if (count == 0) else int(np.searchsorted(self.timestamps, timestamps.min(), side="right"))
+        links = self.triggered
+        self.__reserve(size + count, fresh=(start < size and self.__shared))
+        columns = (self.timestamps, self.codes, self.occurred, links)
+        self.timestamps, self.codes, self.occurred, self.triggered = (buffer[:size + count]
+                                                                      for buffer in self.__buffers)
+
+        merged = (np.concatenate((columns[0][start:], timestamps)), np.concatenate((columns[1][start:], codes)),
+                  np.concatenate((columns[2][start:], occurred)),
+                  np.concatenate((links[start:], np.full(count, NO_EVENT, dtype=np.int64))))
+        order = np.argsort(merged[0], kind="stable")
+        for column, values in zip((self.timestamps, self.codes, self.occurred, self.triggered), merged):
+            column[start:] = values[order]
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(start, size + count)
+
+        if (start < size):
+            # translate links to moved events
+            moved = self.triggered >= start
+            self.triggered[moved] = position[self.triggered[moved] - start]
+        self.__triggeredBy = None
+        self.invalidateIndex()
+        return start, position
+
+    def __reserve(self, size, fresh=False):
+        """ Ensures that the buffers backing the columns can hold size events. If fresh is set, new buffers are
+        allocated, so slices keep their events. """
+        if (not fresh and self.__buffers is not None and all(column.base is buffer for column, buffer in
+                                                zip((self.timestamps, self.codes, self.occurred, self.triggered),
+                                                    self.__buffers)) and len(self.__buffers[0]) >= size):
+            return
+        capacity = max(size, 2 * len(self), 16)
+        columns = (self.timestamps, self.codes, self.occurred, self.triggered)
+        self.__buffers = tuple(np.empty(capacity, dtype=column.dtype) for column in columns)
+        for column, buffer in zip(columns, self.__buffers):
+            buffer[:len(column)] = column
+        self.__shared = False
+
+    def shift(self, offset):
+        """ Subtracts offset from all timestamps. """
+        offset = self.toTicks(offset)
+        if (offset == 0):
+            return
+        self.timestamps -= offset
+        self.invalidateIndex()
+
+    def toTicks(self, values):
+        """ Converts time values to the representation of the column timestamps. """
+        return toTicks(values, self.resolution)
+
+    def toTime(self, ticks):
+        """ Converts values of the column timestamps to time values. """
+        return toTime(ticks, self.resolution)
+
+    def getRange(self, start, end=None):
+        """ Returns the positions [first, last) of all events with start <= timestamp < end. If end is not provided, the
+        positions of all events with exactly the timestamp start are returned. """
+        if (end is None):
+            tick = self.toTicks(start)
+            return (int(np.searchsorted(self.timestamps, tick, side="left")),
+                    int(np.searchsorted(self.timestamps, tick, side="right")))
+
+        first = int(np.searchsorted(self.timestamps, _toTickBound(start, self.resolution), side="left"))
+        last = int(np.searchsorted(self.timestamps, _toTickBound(end, self.resolution), side="left"))
+        return first, max(first, last)
+
+    def invalidateIndex(self):
+        """ Discards the per event type index. It is rebuilt on the next lookup. """
+        self.__index = None
+
+    def __getIndex(self):
+        """ Groups all events by event type. Within each group events are ordered by timestamp. For each event type the
+        positions of all events and the timestamps of all occurred events are stored as contiguous blocks. """
+        if (self.__index is None):
+            codes = np.arange(len(self.vocabulary) + 1)
+            order = np.argsort(self.codes, kind="stable")
+            bounds = np.searchsorted(self.codes[order], codes)
+
+            occurredOrder = order[self.occurred[order]]
+            occurredBounds = np.searchsorted(self.codes[occurredOrder], codes)
+            timestamps = self.toTime(self.timestamps[occurredOrder])
+
+            for array in (order, timestamps):
+                array.flags.writeable = False
+            self.__index = (order, bounds, timestamps, occurredBounds)
+        return self.__index
+
+    def getPositions(self, eventType):
+        """ Returns the positions of all events with the given event type in ascending order. """
+        code = self.getCode(eventType)
+        order, bounds, _, _ = self.__getIndex()
+        if (code is None):
+            return order[0:0]
+        return order[bounds[code]:bounds[code + 1]]
+
+    def getTimestamps(self, eventType):
+        """ Returns the sorted timestamps of all occurred events with the given event type. The result is a read-only
+        view on the index. """
+        code = self.getCode(eventType)
+        _, _, timestamps, bounds = self.__getIndex()
+        if (code is None):
+            return timestamps[0:0]
+        return timestamps[bounds[code]:bounds[code + 1]]
+
+    def getCount(self, eventType):
+        """ Returns the number of events with the given event type. """
+        code = self.getCode(eventType)
+        if (code is None):
+            return 0
+        _, bounds, _, _ = self.__getIndex()
+        return int(bounds[code + 1] - bounds[code])
+
+    def getCode(self, eventType):
+        """ Returns the integer code of the given event type or None if the event type is unknown. """
+        return self.__lookup.get(str(eventType))
+
+    def getEventTypes(self):
+        """ Returns all event types that are used by at least one event. """
+        if (self.__trusted):
+            return set(self.vocabulary)
+        return {self.vocabulary[code] for code in np.unique(self.codes)}
+
+    def getTriggeredBy(self):
+        """ Returns the index of the event triggering each event or NO_EVENT. """
+        if (self.__triggeredBy is None):
+            self.__triggeredBy = np.full(len(self), NO_EVENT, dtype=np.int64)
+            idx = np.flatnonzero(self.triggered != NO_EVENT)
+            self.__triggeredBy[self.triggered[idx]] = idx
+        return self.__triggeredBy
+
+    def createEvent(self, idx):
+        """ Creates a new Event object for the event at position idx without any links. """
+        event = Event(self.vocabulary[self.codes[idx]], float(self.toTime(self.timestamps[idx])))
+        event.occurred = bool(self.occurred[idx])
+        return event
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+def fromColumns(timestamps, eventTypes, occurred=None, triggered=None, resolution=None):
+    """ Creates a storage from a list of timestamps and a list of event types. If a resolution is provided, the
+    timestamps are rounded to integer ticks. """
+    vocabulary, codes = np.unique(np.asarray(eventTypes, dtype=str), return_inverse=True)
+    return ColumnarStorage(toTicks(timestamps, resolution), codes.reshape(-1), vocabulary.tolist(), occurred, triggered,
+                           resolution=resolution)
+
+
+def fromEvents(events, links=True, resolution=None):
+    """ Creates a storage from a list of Event objects. If links is True, links between events via 'triggered' are
+    preserved. """
+    triggered = None
+    if (links):
+        position = {id(e): idx for idx, e in enumerate(events)}
+        triggered = [position.get(id(e.triggered), NO_EVENT) if (e.triggered is not None) else NO_EVENT
+                     for e in events]
+    return fromColumns([e.timestamp for e in events], [e.eventType for e in events], [e.occurred for e in events],
+                       triggered, resolution)
+
+
+def toTicks(values, resolution):
+    """ Rounds time values to integer ticks of the given resolution. Without resolution, floats are returned. """
+    if (resolution is None):
+        return np.asarray(values, dtype=float)
+    return np.rint(np.asarray(values, dtype=float) / resolution).astype(np.int64)
+
+
+def _toTickBound(value, resolution):
+    """ Returns the first tick with a time not below value. Values on a tick up to rounding errors, e.g. 0.07 with
+    resolution 0.01, are rounded like toTicks, so the bound matches the tick the same value is stored at. """
+    if (resolution is None or not math.isfinite(value)):
+        return value
+    scaled = value / resolution
+    tick = round(scaled)
+    if (abs(scaled - tick) <= _TICK_TOLERANCE * max(1.0, abs(scaled))):
+        return tick
+    return math.ceil(scaled)
+
+
+def toTime(ticks, resolution):
+    """ Converts integer ticks of the given resolution to time values. """
+    if (resolution is None):
+        return ticks
+    # dividing by an integral number of ticks per time unit yields the closest float, e.g. 12 / 10 = 1.2
+    ticksPerUnit = round(1 / resolution)
+    if (abs(ticksPerUnit * resolution - 1) < 1e-12):
+        return ticks / ticksPerUnit
+    return ticks * resolution
@@ -1,6 +1,7 @@
 #include <algorithm>
 #include <cmath>
-#include <ctime>
+#include <cstdint>
+#include <random>
 #include <vector>
 #include <Python.h>
 
@@ -33,8 +34,9 @@ static double computeMultivariateTest(std::vector<double> &eventA, std::vector<d
     return value;
 }
 
-static double computePValue(std::vector<double> &eventA, std::vector<double> &eventB, int n) {
-    std::srand(unsigned(std::time(0)));
+static double computePValue(std::vector<double> &eventA, std::vector<double> &eventB, int n, uint64_t seed) {
+    // local engine, so the permutations only depend on the seed and not on other users of rand
+    std::mt19937_64 engine(seed);
 
     double p = 0;
     double ref = computeMultivariateTest(eventA, eventB);
@@ -42,7 +44,7 @@ static double computePValue(std::vector<double> &eventA, std::vector<double> &ev
     std::vector<double> allEvents(eventA);
     allEvents.insert(allEvents.end(), eventB.begin(), eventB.end());
     for (int i = 0; i < n; ++i) {
-        std::random_shuffle(allEvents.begin(), allEvents.end());
+        std::shuffle(allEvents.begin(), allEvents.end(), engine);
 
         std::vector<double> splitLow(allEvents.begin(), allEvents.begin() + eventA.size());
         std::vector<double> splitHigh(allEvents.begin() + eventA.size(), allEvents.end());
@@ -73,8 +75,9 @@ static PyObject* compute(PyObject *self, PyObject *args) {
     int sizeA = 0;
     int sizeB = 0;
     int n = 0;
+    unsigned long long seed = 0;
 
-    if (!PyArg_ParseTuple(args, "OOiii", &arg0, &arg1, &sizeA, &sizeB, &n))
+    if (!PyArg_ParseTuple(args, "OOiiiK", &arg0, &arg1, &sizeA, &sizeB, &n, &seed))
         return NULL;
 
     std::vector<double> eventA;
@@ -83,7 +86,7 @@ static PyObject* compute(PyObject *self, PyObject *args) {
     pyobjectToVector(eventB, arg1, sizeB);
 
     double score = computeUnNormalized(eventA, eventB) / (2 * computeSum(eventA, eventB));
-    double p = computePValue(eventA, eventB, n);
+    double p = computePValue(eventA, eventB, n, seed);
 
     PyObject* res = Py_BuildValue("dd", score, p);
     return res;
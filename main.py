@@ -10,17 +10,18 @@ import sys
 from PySide2.QtWidgets import QApplication
 
 import provider
-from algorithms import lpMatcher, lagEM, munkresMatcher, ice
-from core import sequence, distribution
+from algorithms import lpMatcher, lagEM, munkresMatcher, ice, pairCache, resultStore
+from core import sequence, distribution, seeding
 from core.performance import EnergyDistance
 from core.timer import Timer
-from provider import symantec, generator, hdPrinter
+from provider import symantec, generator, hdPrinter, parseCache
 from visualization.visualizer import Visualizer
 
 parser = argparse.ArgumentParser()
 parser.add_argument("-m", "--method", action="store", type=str, required=True, choices=provider.CHOICES,
                     help="Method to create sequence.")
-parser.add_argument("-i", "--input", action="store", type=str, required=True, help="Path to file containing sequence")
+parser.add_argument("-i", "--input", action="store", type=str, required=True,
+                    help="Path to file containing sequence. Method 'load' accepts json and binary (.bseq) sequences")
 parser.add_argument("-a", "--algorithm", action="store", type=str, required=True, help="Algorithm to use for alignment")
 parser.add_argument("-t", "--trigger", action="store", type=str, required=False,
                     help="Match only given trigger and response")
@@ -28,7 +29,27 @@ parser.add_argument("-r", "--response", action="store", type=str, required=False
                     help="Match only given trigger and response")
 parser.add_argument("-d", "--distributions", action="store", type=str, required=False,
                     help="Path to file containing true empirical distributions")
-parser.add_argument("-o", "--output", action="store", type=str, required=False, help="Path to file for storing sequence data")
+parser.add_argument("-o", "--output", action="store", type=str, required=False,
+                    help="Path to file for storing sequence data. Files ending with .bseq are stored in binary format")
+parser.add_argument("--results", action="store", type=str, required=False,
+                    help="Path to SQLite database for storing the calculated rules. Existing rules of the same event "
+                         "types are replaced")
+parser.add_argument("--resolution", action="store", type=float, required=False,
+                    help="Store timestamps as integer ticks of the given resolution. Used for generated and parsed "
+                         "sequences")
+parser.add_argument("--cache", action="store", type=str, required=False, default=parseCache.DEFAULT_DIRECTORY,
+                    help="Directory for caching parsed symantec and HD printer files. Unchanged files are not parsed "
+                         "again")
+parser.add_argument("--no-cache", action="store_true", help="Always parse the input file")
+parser.add_argument("--pair-cache", action="store", type=str, required=False,
+                    help="Path to SQLite database caching the results of each pair of event types. Pairs with "
+                         "unchanged timestamps and settings are not matched again")
+parser.add_argument("--seed", action="store", type=int, required=False,
+                    help="Root seed of all random numbers. Runs with the same seed are reproducible")
+parser.add_argument("--checkpoint", action="store", type=str, required=False,
+                    help="Path to SQLite database for periodically storing the processed pairs of event types")
+parser.add_argument("--resume", action="store_true",
+                    help="Skip pairs of event types already processed according to the checkpoint")
 
 args = parser.parse_args()
 logging.info("Arguments: {}".format(args))
@@ -37,33 +58,48 @@ args.input = os.path.toAbsolutePath(args.input)
 # noinspection PyUnresolvedReferences
 args.distributions = os.path.toAbsolutePath(args.distributions)
 
+if (args.seed is not None):
+    seeding.seed(args.seed)
+
 trigger = args.trigger
 response = args.response
 if (trigger is None and response is not None):
     logging.fatal('No trigger defined. Please add a trigger or remove response. {}'.format(parser.format_help()))
     exit()
+if (args.resume and args.checkpoint is None):
+    logging.fatal('No checkpoint defined. Please add a checkpoint or remove resume. {}'.format(parser.format_help()))
+    exit()
 
 output = os.path.toAbsolutePath(args.output) if args.output else None
 
 seq = None
 if (args.method == provider.GENERATE):
     logging.info("Creating new sequence")
-    seq = generator.Generator().create(args.input)
+    seq = generator.Generator().create(args.input, resolution=args.resolution)
 if (args.method == provider.LOAD):
     logging.info("Loading sequence")
     seq = sequence.loadFromFile(args.input)
 if (args.method == provider.SYMANTEC):
     logging.info("Parsing symantec file")
+    # created only for parsers, so generating or loading a sequence does not create the cache directory
+    # noinspection PyUnresolvedReferences
+    cache = None if args.no_cache else parseCache.ParseCache(os.path.toAbsolutePath(args.cache))
     if (trigger is not None and response is not None):
-        seq = symantec.SymantecParser().create(args.input, whitelist=[trigger, response], normalization=100)
+        seq = symantec.SymantecParser().create(args.input, whitelist=[trigger, response], normalization=100,
+                                               resolution=args.resolution, cache=cache)
     else:
-        seq = symantec.SymantecParser().create(args.input, normalization=100)
+        seq = symantec.SymantecParser().create(args.input, normalization=100, resolution=args.resolution,
+                                               cache=cache)
 if (args.method == provider.PRINTER):
     logging.info("Parsing HD printer file")
+    # noinspection PyUnresolvedReferences
+    cache = None if args.no_cache else parseCache.ParseCache(os.path.toAbsolutePath(args.cache))
     if (trigger is not None and response is not None):
-        seq = hdPrinter.HDPrinterParser().create(args.input, whitelist=[trigger, response], normalization=100)
+        seq = hdPrinter.HDPrinterParser().create(args.input, whitelist=[trigger, response], normalization=100,
+                                                 resolution=args.resolution, cache=cache)
     else:
-        seq = hdPrinter.HDPrinterParser().create(args.input, normalization=100)
+        seq = hdPrinter.HDPrinterParser().create(args.input, normalization=100, resolution=args.resolution,
+                                                 cache=cache)
 logging.info("Processing sequence:\n{}".format(seq))
 
 algorithm = None
@@ -89,6 +125,16 @@ if (algorithm is None):
     logging.fatal("Unknown algorithm: '{}'".format(args.algorithm))
     exit(1)
 
+if (args.pair_cache):
+    # noinspection PyUnresolvedReferences
+    algorithm.cache = pairCache.PairCache(os.path.toAbsolutePath(args.pair_cache))
+checkpoint = None
+if (args.checkpoint and response is None):
+    # noinspection PyUnresolvedReferences
+    checkpoint = resultStore.ResultStore(os.path.toAbsolutePath(args.checkpoint))
+    kwargs["checkpoint"] = checkpoint
+    kwargs["resume"] = args.resume
+
 timer = Timer()
 timer.start()
 if (len(seq.calculatedRules) > 0):
@@ -102,6 +148,10 @@ else:
     calculatedRules = [algorithm.match(seq, trigger, response, **kwargs)[0]]
 timer.stop()
 logging.info("Calculation time: {} minutes".format(timer))
+if (algorithm.cache is not None):
+    algorithm.cache.close()
+if (checkpoint is not None):
+    checkpoint.close()
 
 knownEmpiricalDists = None
 if (args.distributions is not None):
@@ -126,6 +176,12 @@ if output:
     seq.store(output)
     logging.info("Output saved to: %s" % output)
 
+if args.results:
+    # noinspection PyUnresolvedReferences
+    with resultStore.ResultStore(os.path.toAbsolutePath(args.results)) as store:
+        store.addAll(seq.calculatedRules)
+    logging.info("Results saved to: %s" % args.results)
+
 app = QApplication(sys.argv)
 v = Visualizer()
 v.setSequence(seq)
@@ -1,10 +1,13 @@
 import abc
+import heapq
 import logging
 import os
 
 import aniso8601
 
+from core import sequence
 from core.event import Event
+from core.sequence import Sequence
 
 logging.getLogger().setLevel(logging.DEBUG)
 
@@ -17,20 +20,28 @@ CHOICES = [GENERATE, LOAD, SYMANTEC, PRINTER]
 
 
 class SequenceParser(abc.ABC):
+    # parsers creating random sequences or reading several files can not be cached by the content of file
+    _CACHEABLE = True
+
     def __init__(self):
         self._count = {}
         self._events = []
         self._filter = []
         self._whitelist = []
+        self._resolution = None
 
     # noinspection PyShadowingBuiltins
-    def create(self, file, filter=None, whitelist=None, normalization=1):
+    def create(self, file, filter=None, whitelist=None, normalization=1, resolution=None, cache=None):
         """
         This method creates a new sequence based on the given file. The actual creation is implemented by subclasses.
         :param filter:
         :param normalization:
         :param whitelist:
         :param file:
+        :param resolution: If provided, timestamps are stored as integer ticks of the given duration (after
+            normalization)
+        :param cache: Optional ParseCache. The sequence is loaded from the cache if file was already parsed with the
+            same settings and stored in the cache otherwise
         :return:
         """
         # noinspection PyUnresolvedReferences
@@ -38,11 +49,20 @@ class SequenceParser(abc.ABC):
             self._filter = filter
         if whitelist is not None:
             self._whitelist = whitelist
+        if resolution is not None:
+            self._resolution = resolution
         if (file is not None):
             # noinspection PyUnresolvedReferences
             file = os.path.toAbsolutePath(file)
 
-        return self._create(file, normalization)
+        if (cache is None or file is None or not self._CACHEABLE):
+            return self._create(file, normalization)
+        key = cache.getKey(self, file, self._filter, self._whitelist, normalization, self._resolution)
+        seq = cache.get(key)
+        if (seq is None):
+            seq = self._create(file, normalization)
+            cache.put(key, seq)
+        return seq
 
     @abc.abstractmethod
     def _create(self, file, normalization):
@@ -52,6 +72,14 @@ class SequenceParser(abc.ABC):
     def _parseISO8601(self, timeString):
         return aniso8601.parse_datetime(timeString).timestamp()
 
+    def _asSequence(self):
+        """ Creates a sequence containing all parsed events. With a resolution, a columnar sequence with integer ticks
+        is created and normalized by a single subtraction. """
+        if (self._resolution is None):
+            return Sequence(self._events)
+        return sequence.fromColumns([e.timestamp for e in self._events], [e.eventType for e in self._events],
+                                    resolution=self._resolution)
+
     def _createEvent(self, eventId, timestamp):
         if (eventId not in self._filter and (len(self._whitelist) == 0 or eventId in self._whitelist)):
             self._events.append(Event(eventId, timestamp))
@@ -59,3 +87,70 @@ class SequenceParser(abc.ABC):
                 self._count[eventId] += 1
             else:
                 self._count[eventId] = 1
+
+
+class LogParser(SequenceParser):
+    """ Base class of parsers reading the events of a single log file. Subclasses implement _parse. """
+
+    # noinspection PyShadowingBuiltins
+    def parse(self, file, filter=None, whitelist=None, normalization=1):
+        """ Returns all events of the given file ordered by timestamp without creating a sequence. The timestamps are
+        divided by normalization but not shifted. """
+        if filter is not None:
+            self._filter = filter
+        if whitelist is not None:
+            self._whitelist = whitelist
+        # noinspection PyUnresolvedReferences
+        file = os.path.toAbsolutePath(file)
+
+        self._events = []
+        self._count = {}
+        self._parse(file, normalization)
+        if (any(self._events[i].timestamp > self._events[i + 1].timestamp for i in range(len(self._events) - 1))):
+            self._events.sort(key=lambda e: e.timestamp)
+        return self._events
+
+    def _create(self, file, normalization):
+        self._parse(file, normalization)
+        return self._asSequence()
+
+    @abc.abstractmethod
+    def _parse(self, file, normalization):
+        """ Reads all events of file via _createEvent. """
+        pass
+
+
+class MergingParser(SequenceParser):
+    """
+    Merges the events of several sources into one sequence, e.g. a printer log and a symantec log of the same system.
+    The events of each source are ordered by timestamp, so the sources are merged with a heap in O(n log k) for n
+    events in k sources. Each event is tagged with its source via Event.source. Tags are not stored in sequence files.
+    """
+    _CACHEABLE = False
+
+    def __init__(self):
+        super().__init__()
+        self.__sources = []
+
+    def addSource(self, parser, file, tag=None):
+        """ Adds a file that is read with the given LogParser. If no tag is provided, the file name is used. """
+        self.__sources.append((parser, file, os.path.basename(file) if (tag is None) else tag))
+        return self
+
+    def _create(self, file, normalization):
+        if (len(self.__sources) == 0):
+            raise ValueError("No sources provided. Please add at least one source")
+
+        streams = []
+        for parser, source, tag in self.__sources:
+            events = parser.parse(source, filter=self._filter, whitelist=self._whitelist, normalization=normalization)
+            for e in events:
+                e.source = tag
+            streams.append(events)
+        self._events = list(heapq.merge(*streams, key=lambda e: e.timestamp))
+
+        for e in self._events:
+            self._count[e.eventType] = self._count.get(e.eventType, 0) + 1
+        logging.info("Merged {} events from {} sources".format(len(self._events), len(streams)))
+        # the merged list is already ordered, the list based sequence keeps the tagged Event objects
+        return Sequence(self._events, resolution=self._resolution)
@@ -6,13 +6,15 @@ import os
 
 import core.distribution
 import core.rule
-from core import rule
+from core import compression, rule, seeding
 from core.event import Event
 from core.sequence import Sequence
 from provider import SequenceParser
 
 
 class Generator(SequenceParser):
+    _CACHEABLE = False
+
     def __init__(self):
         super().__init__()
         self.__length = -1
@@ -22,6 +24,7 @@ class Generator(SequenceParser):
         self.__rndNumber = core.distribution.UniformDistribution()
         self.__discrete = False
         self.__createFunction = None
+        self.__seed = None
 
     def setRndNumber(self, dist):
         self.__rndNumber = dist
@@ -55,16 +58,31 @@ class Generator(SequenceParser):
         return self
 
     def setDiscrete(self):
-        """ Call this function to create discrete sequences """
+        """ Call this function to create discrete sequences. Use setResolution(1) instead for integer ticks. """
+        if (self._resolution is not None):
+            raise ValueError("Discrete sequences can not be combined with a resolution")
         self.__discrete = True
         return self
 
+    def setSeed(self, seed):
+        """ Creates the same sequence for the same seed (an int or a numpy.random.SeedSequence). """
+        self.__seed = seed
+        return self
+
+    def setResolution(self, resolution):
+        """ Round all timestamps to integer ticks of the given resolution. Colliding events are moved by one tick. This
+        replaces setDiscrete, which is equivalent to a resolution of 1. """
+        if (self.__discrete and resolution is not None):
+            raise ValueError("Discrete sequences can not be combined with a resolution")
+        self._resolution = resolution
+        return self
+
     def _create(self, file, normalization):
         rules = None
         if (file is not None and isinstance(file, str)):
             # noinspection PyUnresolvedReferences
             config = os.path.toAbsolutePath(file)
-            with open(config) as f:
+            with compression.openFile(config) as f:
                 config = json.load(f)
 
             rules = config["rules"] if "rules" in config else None
@@ -82,6 +100,8 @@ class Generator(SequenceParser):
             self.setRules(ruleList)
         if (self.__rules is None or len(self.__rules) == 0):
             raise RuntimeError("Configuration not valid. Please provide rules")
+        if (self.__seed is not None):
+            self.__seedDistributions()
 
         if (self.__length != -1):
             self.__createFunction = self.__createByLength
@@ -90,6 +110,15 @@ class Generator(SequenceParser):
 
         return self.__createFunction()
 
+    def __seedDistributions(self):
+        """ Seeds all distributions, so each call of create with the same seed returns the same sequence. """
+        distributions = [self.__rndNumber]
+        for r in self.__rules:
+            distributions.extend(d for d in (r.distributionTrigger, r.distributionResponse) if (d is not None))
+        with seeding.using(self.__seed):
+            for dist, seed in zip(distributions, seeding.spawn(len(distributions))):
+                dist.setSeed(seed)
+
     def __createByNumberEvents(self):
         timeline = {}
         while len(timeline) < self.__numberEvents:
@@ -109,7 +138,6 @@ class Generator(SequenceParser):
                     timeResponse = self.__getTimeStamp(rule.distributionResponse, self.__lastTime[rule], timeline)
                     response = Event(rule.response)
                     trigger.setTriggered(response)
-                    trigger.trueTriggered = response
                     self.__addEvent(timeline, timeResponse, response, rule.successResponse)
         for rule in self.__rules:
             self.__lastTime[rule] = 0
@@ -137,7 +165,6 @@ class Generator(SequenceParser):
 
                     response = Event(rule.response)
                     trigger.setTriggered(response)
-                    trigger.trueTriggered = response
                     self.__addEvent(timeline, timeResponse, response, rule.successResponse)
         for rule in self.__rules:
             self.__lastTime[rule] = 0
@@ -145,6 +172,13 @@ class Generator(SequenceParser):
 
     def __getTimeStamp(self, dist, lastTime, timeline):
         time = dist.getRandom() + lastTime
+        if (self._resolution is not None):
+            # timeline is indexed by integer ticks, so collisions are resolved without float comparisons
+            tick = self.__getKey(time)
+            while (tick in timeline):
+                tick += 1
+            return tick * self._resolution
+
         stepSize = 0.01
         if (self.__discrete):
             time = round(time)
@@ -157,9 +191,16 @@ class Generator(SequenceParser):
         if (self.__rndNumber.getRandom() > success):
             event.occurred = False
         event.timestamp = timestamp
-        timeline[timestamp] = event
+        timeline[self.__getKey(timestamp)] = event
+
+    def __getKey(self, timestamp):
+        """ Returns the key of timestamp in the timeline """
+        if (self._resolution is None):
+            return timestamp
+        return int(round(timestamp / self._resolution))
 
     def __asSequence(self, dictionary, length=-1):
         seq = list(dictionary.values())
         seq.sort()
-        return Sequence(seq, length if length != -1 else math.ceil(seq[-1].timestamp) + 1, self.__rules)
+        return Sequence(seq, length if length != -1 else math.ceil(seq[-1].timestamp) + 1, self.__rules,
+                        resolution=self._resolution)
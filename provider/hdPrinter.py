@@ -1,19 +1,23 @@
 import csv
 import re
 
+import numpy as np
+
+from core import compression
 from core.sequence import Sequence
-from provider import SequenceParser
+from core.storage import ColumnarStorage
+from provider import LogParser
 
 
-class HDPrinterParser(SequenceParser):
+class HDPrinterParser(LogParser):
     def __init__(self):
         super().__init__()
         self.__COLUMN_TIMESTAMP = 2
         self.__COLUMN_EVENT_ID = 3
         self.__COLUMN_STATUS = 5
 
-    def _create(self, file, normalization):
-        with open(file) as csvFile:
+    def _parse(self, file, normalization):
+        with compression.openFile(file) as csvFile:
             reader = csv.reader(csvFile, delimiter=';')
             next(reader, None)  # skip the header
 
@@ -28,42 +32,44 @@ class HDPrinterParser(SequenceParser):
                 self._createEvent(eventId, timestamp)
 
         self.__printStatistic()
-        return Sequence(self._events)
 
     def chunkSequence(self, file, output, offset=1800):
-        self.create(file)
+        seq = self.create(file)
 
-        subSequences = []
-        current = None
+        # time range [begin, end] of each chunk, latest chunk first
+        chunks = []
+        begin = None
+        end = None
         start = None
-        for event in reversed(self._events):
+        for event in reversed(seq.events):
             if (re.match('^0X5001[\dA-F]$', event.eventType) is not None):
-                if (current is None):
-                    current = [event]
+                if (end is None):
+                    end = event.timestamp
+                begin = event.timestamp
                 start = event
-            elif (current is not None):
+            elif (end is not None):
                 if (start.timestamp - event.timestamp < offset):
-                    current.append(event)
+                    begin = event.timestamp
                 else:
-                    subSequences.append(Sequence(list(reversed(current))))
-                    current = None
-        if (current is not None):
-            subSequences.append(Sequence(list(reversed(current))))
+                    chunks.append((begin, end))
+                    end = None
+        if (end is not None):
+            chunks.append((begin, end))
 
-        for idx, seq in enumerate(subSequences):
-            seq.store('{}-{}.seq'.format(output, idx))
+        for idx, (begin, end) in enumerate(chunks):
+            _materialize(seq.window(begin, np.nextafter(end, np.inf))).store('{}-{}.seq'.format(output, idx))
 
     def trimSequence(self, file, output, offset=1800):
-        self.create(file)
+        seq = self.create(file)
 
         events = []
         start = None
-        for event in reversed(self._events):
+        for event in reversed(seq.events):
             if (re.match('^0X5001[\dA-F]$', event.eventType) is not None):
                 start = event
             if (start is not None and start.timestamp - event.timestamp < offset):
                 events.append(event)
-        Sequence(list(reversed(events))).store(output)
+        Sequence(list(reversed(events)), resolution=seq.resolution).store(output)
 
     def __printStatistic(self):
         print("# Events: {}".format(len(self._events)))
@@ -71,3 +77,15 @@ class HDPrinterParser(SequenceParser):
         l.sort()
         for i in l:
             print("EventID {}: \t#{}".format(i, self._count[i]))
+
+
+def _materialize(view):
+    """ Copies the events of a view into a new sequence. A view shares the columns and the firstTimestamp of its
+    parent, while the copy is normalized to its own first event and has its own length. """
+    s = view.asStorage()
+    columns = ColumnarStorage(s.timestamps.copy(), s.codes.copy(), s.vocabulary, s.occurred.copy(), s.triggered.copy(),
+                              resolution=s.resolution)
+    seq = Sequence(columns, rules=view.rules, calculatedRules=view.calculatedRules)
+    # the timestamps of the view are relative to the firstTimestamp of its parent
+    seq.firstTimestamp += view.firstTimestamp
+    return seq
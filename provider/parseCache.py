@@ -0,0 +1,124 @@
+""" Content addressed cache of parsed sequences
+
+Parsing large log files, e.g. the xml files of symantec, dominates the run time of short analyses. The parsed sequences
+are stored in the binary sequence format in a cache directory. Entries are identified by the hash of the input file
+together with the parser and all settings influencing the result, so a modified input file or other settings never
+return a stale sequence. The total size of the directory is bounded, the least recently used entries are removed first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from core import binarySequence, sequence
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "event-correlation", "parsed")
+DEFAULT_SIZE = 1 << 30
+
+_VERSION = 1
+_BLOCK_SIZE = 1 << 20
+
+
+class ParseCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, maxSize=DEFAULT_SIZE):
+        """
+        :param directory: Directory containing the cached sequences. It is created if it does not exist.
+        :param maxSize: Maximum total size of all cached sequences in bytes
+        """
+        self.directory = directory
+        self.maxSize = maxSize
+        os.makedirs(directory, exist_ok=True)
+
+    # noinspection PyShadowingBuiltins
+    def getKey(self, parser, file, filter, whitelist, normalization, resolution):
+        """ Returns the key of the sequence created by parser from file with the given settings. """
+        digest = hashlib.sha256()
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+                digest.update(block)
+        settings = {
+            "version": _VERSION,
+            "parser": "{}.{}".format(parser.__class__.__module__, parser.__class__.__name__),
+            "file": digest.hexdigest(),
+            "filter": sorted(str(e) for e in filter),
+            "whitelist": sorted(str(e) for e in whitelist),
+            "normalization": normalization,
+            "resolution": resolution
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """ Returns the cached sequence or None. """
+        filename = self.__getFilename(key)
+        try:
+            seq = sequence.loadFromFile(filename, columnar=True)
+            # the modification time is used as time of last access
+            os.utime(filename)
+        except (OSError, IOError):
+            return None
+        except ValueError as ex:
+            logging.warning("Removing invalid cache entry '{}': {}".format(filename, ex))
+            self.__remove(filename)
+            return None
+        logging.info("Loaded parsed sequence from cache '{}'".format(filename))
+        return seq
+
+    def put(self, key, seq):
+        """ Stores the given sequence and removes the least recently used entries if the cache is too large. """
+        fd, tmpFile = tempfile.mkstemp(prefix=".", suffix=binarySequence.EXTENSION, dir=self.directory)
+        os.close(fd)
+        try:
+            seq.store(tmpFile)
+            os.replace(tmpFile, self.__getFilename(key))
+        except BaseException:
+            self.__remove(tmpFile)
+            raise
+        self.__evict()
+
+    def clear(self):
+        """ Removes all cached sequences. """
+        for filename, _, _ in self.__getEntries():
+            self.__remove(filename)
+
+    def getSize(self):
+        """ Returns the total size of all cached sequences in bytes. """
+        return sum(size for _, size, _ in self.__getEntries())
+
+    def __evict(self):
+        entries = sorted(self.__getEntries(), key=lambda entry: entry[2])
+        size = sum(size for _, size, _ in entries)
+        # the most recent entry is kept, even if it exceeds the size on its own
+        for filename, fileSize, _ in entries[:-1]:
+            if (size <= self.maxSize):
+                break
+            self.__remove(filename)
+            size -= fileSize
+
+    def __getEntries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            # hidden files are not yet completely written
+            if (name.startswith(".") or not name.endswith(binarySequence.EXTENSION)):
+                continue
+            filename = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            entries.append((filename, stat.st_size, stat.st_mtime))
+        return entries
+
+    def __getFilename(self, key):
+        return os.path.join(self.directory, key + binarySequence.EXTENSION)
+
+    @staticmethod
+    def __remove(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self.__getEntries())
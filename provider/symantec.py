@@ -2,11 +2,11 @@ import json
 import os
 from xml.etree.ElementTree import ElementTree
 
-from core.sequence import Sequence
-from provider import SequenceParser
+from core import compression
+from provider import LogParser
 
 
-class SymantecParser(SequenceParser):
+class SymantecParser(LogParser):
     def __init__(self):
         super().__init__()
         self.nameSpace = {"ev": "http://schemas.microsoft.com/win/2004/08/events/event"}
@@ -15,8 +15,9 @@ class SymantecParser(SequenceParser):
         with open(os.path.toAbsolutePath("../contrib/symantecKnowledgeBase.json")) as f:
             self.knowledgeBase = json.load(f)["events"]
 
-    def _create(self, file, normalization):
-        root = ElementTree().parse(file)
+    def _parse(self, file, normalization):
+        with compression.openFile(file, "rb") as f:
+            root = ElementTree().parse(f)
         for event in root:
             system = event.find("ev:System", namespaces=self.nameSpace)
             eventId = str(system.find("ev:EventID", namespaces=self.nameSpace).text)
@@ -25,7 +26,6 @@ class SymantecParser(SequenceParser):
             self._createEvent(eventId, time)
 
         self.__printStatistic()
-        return Sequence(self._events)
 
     def __printStatistic(self):
         print("# Events: {}".format(len(self._events)))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Compare the memory footprint of the event representations for a given sequence.
+
+The events of the sequence are created three times: with a dictionary based event class as used before, with the slot
+based Event class and as columnar sequence. The memory allocated by each representation is measured with tracemalloc.
+
+Expects the path to a sequence file as optional argument. Default is '../contrib/printer.seq'.
+"""
+
+import sys
+import tracemalloc
+
+from core import sequence
+from core.event import Event
+
+
+class DictEvent:
+    """ Event representation with per-instance dictionary as reference """
+
+    def __init__(self, eventType="_", timestamp=-1):
+        self.eventType = str(eventType)
+        self.timestamp = timestamp
+        self.occurred = True
+        self.triggeredBy = None
+        self.triggered = None
+        self.trueTriggered = None
+
+
+def measure(function):
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+inputFile = sys.argv[1] if (len(sys.argv) > 1) else '../contrib/printer.seq'
+seq = sequence.loadFromFile(inputFile, columnar=True)
+s = seq.getStorage()
+# copy type strings to mimic strings obtained by parsing a file
+types = [''.join(list(s.vocabulary[code])) for code in s.codes]
+timestamps = s.timestamps.tolist()
+
+dictEvents, dictSize = measure(lambda: [DictEvent(types[i], timestamps[i]) for i in range(len(types))])
+del dictEvents
+slotEvents, slotSize = measure(lambda: [Event(types[i], timestamps[i]) for i in range(len(types))])
+del slotEvents
+columnar, columnarSize = measure(lambda: sequence.fromColumns(timestamps, types))
+del columnar
+
+print("# Events: {}".format(len(types)))
+print("Dictionary events:\t{:>12,d} B\t{:>6.1f} B/event".format(dictSize, dictSize / len(types)))
+print("Slot events:\t\t{:>12,d} B\t{:>6.1f} B/event".format(slotSize, slotSize / len(types)))
+print("Columnar sequence:\t{:>12,d} B\t{:>6.1f} B/event".format(columnarSize, columnarSize / len(types)))
+print("Saving slot events:\t{:.1f} %".format(100 * (1 - slotSize / dictSize)))
@@ -2,8 +2,11 @@ import unittest
 
 import numpy as np
 
-from algorithms import RESULT_MU
+from algorithms import RESULT_MU, RESULT_SIGMA
 from algorithms.ice import ICE
+from core import sequence
+from core.event import Event
+from core.rule import Rule
 
 
 class TestScript(unittest.TestCase):
@@ -15,3 +18,73 @@ class TestScript(unittest.TestCase):
         matcher.trimCost = False
         res = matcher._compute(a, b)
         self.assertAlmostEqual(res[RESULT_MU], 17 / 3)
+
+    def test_warmStart(self):
+        a = np.array([5, 20, 27])
+        b = np.array([12, 25, 32, 50])
+
+        matcher = ICE()
+        matcher.trimCost = False
+        matcher._parseArgs({"initLag": 6, "maxiter": 0})
+        self.assertAlmostEqual(6, matcher._compute(a, b)["Offset"])
+        matcher._parseArgs({"initLag": 6, "maxiter": 0})
+        self.assertAlmostEqual(-6, matcher._compute(b, a)["Offset"])
+        # the guess of the previous call is not reused
+        matcher._parseArgs({"maxiter": 0})
+        self.assertNotAlmostEqual(6, matcher._compute(a, b)["Offset"])
+
+        rule = Rule("A", "B", None, data={RESULT_MU: 5.0, RESULT_SIGMA: 2.0})
+        self.assertEqual({"initLag": 5.0, "initSigma": 2.0}, matcher._getWarmStart(rule))
+        matcher._parseArgs(dict(matcher._getWarmStart(rule), f=None))
+        self.assertAlmostEqual(17 / 3, matcher._compute(a[:3], b[:3])[RESULT_MU])
+
+    def test_incremental(self):
+        a = np.arange(20) * 20.0 + 1
+        c = np.arange(20) * 30.0 + 2
+        seq = sequence.fromColumns(np.concatenate((a, a + 5, c, c + 3)),
+                                   ["A"] * 20 + ["B"] * 20 + ["C"] * 20 + ["D"] * 20)
+        matcher = ICE()
+        matcher.trimCost = False
+        rules = matcher.matchAll(seq, f=None)
+        ruleAB = rules.get("A", "B")
+        ruleCD = rules.get("C", "D")
+        self.assertIsNotNone(ruleAB)
+        self.assertIsNotNone(ruleCD)
+
+        # only pairs containing C or D are matched again, warm started from the previous rules
+        c = np.arange(20, 30) * 30.0 + 2
+        events = [Event("C", t) for t in c] + [Event("D", t + 3) for t in c]
+        result = matcher.matchIncremental(seq, rules, events, f=None)
+        self.assertIs(ruleAB, result.get("A", "B"))
+        self.assertIsNot(ruleCD, result.get("C", "D"))
+        self.assertAlmostEqual(3, result.get("C", "D").data[RESULT_MU], places=5)
+        self.assertEqual(30, seq.getStatistics().getCount("D"))
+
+        # small changes keep all rules
+        updated = matcher.matchIncremental(seq, result, [Event("C", 1000)], threshold=0.5, f=None)
+        self.assertEqual([id(r) for r in result], [id(r) for r in updated])
+
+    def test_incrementalPairs(self):
+        a = np.arange(20) * 20.0 + 1
+        seq = sequence.fromColumns(np.concatenate((a, a + 5)), ["B"] * 20 + ["A"] * 20)
+        matcher = ICE()
+        matcher.trimCost = False
+        rules = matcher.matchAll(seq, f=None)
+        self.assertEqual(1, len(rules))
+
+        # each unordered pair is matched once, in the orientation of the previous rule
+        calls = []
+        compute = matcher._compute
+        matcher._compute = lambda trigger, response: calls.append(1) or compute(trigger, response)
+        a = np.arange(20, 40) * 20.0 + 1
+        events = [Event("B", t) for t in a] + [Event("A", t + 5) for t in a]
+        result = matcher.matchIncremental(seq, rules, events, f=None)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, len(result))
+        self.assertAlmostEqual(5, result.get("B", "A").data[RESULT_MU], places=5)
+
+        # without a previous rule, the pair is matched as A, B and flipped, but not matched again as B, A
+        events = [Event("B", t + 400) for t in a] + [Event("A", t + 405) for t in a]
+        result = matcher.matchIncremental(seq, [], events, f=None)
+        self.assertEqual(2, len(calls))
+        self.assertEqual(1, len(result))
@@ -2,7 +2,11 @@ import unittest
 
 import numpy as np
 
-from algorithms.munkresMatcher import Munkres
+from algorithms import RESULT_IDX, RESULT_MU
+from algorithms.munkresMatcher import Munkres, MunkresMatcher
+from core import sequence
+from core.corpus import SequenceCorpus
+from core.distribution import KdeDistribution, NormalDistribution
 
 
 class TestScript(unittest.TestCase):
@@ -42,6 +46,37 @@ class TestScript(unittest.TestCase):
         res = self.m.compute(c)
         self.assertEqual(15, self.calcTotalCost(res, c))
 
+    def test_corpus(self):
+        for processes in (1, 3):
+            sequences = []
+            for i in range(3):
+                trigger = np.arange(10) * 20.0 + 1
+                sequences.append(sequence.fromColumns(np.concatenate((trigger, trigger + 5 + i)),
+                                                      ["A"] * 10 + ["B"] * 10))
+            matcher = MunkresMatcher()
+            matcher.trimCost = False
+            matcher.processes = processes
+            rule, data = matcher.match(SequenceCorpus(sequences), "A", "B")
+
+            self.assertEqual("A", rule.trigger)
+            self.assertAlmostEqual(6, data[RESULT_MU])
+            self.assertEqual(30, len(rule.distributionResponse.samples))
+            self.assertEqual([[10, 10], [11, 11]], data[RESULT_IDX][10:12].tolist())
+            self.assertEqual([7] * 10, sequences[2].getLags("A", "B").tolist())
+            self.assertEqual([[0, 1], [2, 3]], sequences[0].getLinks("A", "B")[:2].tolist())
+
+    def test_tabulateSuccess(self):
+        # lags around the point where the pdf crosses the threshold
+        crossing = np.sqrt(-2 * np.log(0.05 * np.sqrt(2 * np.pi)))
+        lags = np.linspace(crossing - 0.01, crossing + 0.01, 401)
+        triggers = [np.arange(len(lags)) * 100.0]
+        responses = [triggers[0] + lags]
+        calculate = MunkresMatcher._Matcher__calculateRuleSuccess
+        for dist in (NormalDistribution(0, 1), KdeDistribution(np.random.RandomState(0).normal(0, 1e-5, 100))):
+            exact = calculate(triggers, responses, dist)
+            self.assertEqual(exact, calculate(triggers, responses, dist, tabulate=True))
+        self.assertAlmostEqual(0.5, calculate(triggers, responses, NormalDistribution(0, 1)), places=2)
+
 
 if __name__ == '__main__':
     unittest.main()
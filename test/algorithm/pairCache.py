@@ -0,0 +1,142 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from algorithms import RESULT_IDX, RESULT_MU
+from algorithms.munkresMatcher import MunkresMatcher
+from algorithms.pairCache import PairCache
+from core import sequence
+from core.distribution import NormalDistribution
+
+
+class _CountingMatcher(MunkresMatcher):
+    calls = 0
+
+    def _compute(self, trigger, response):
+        _CountingMatcher.calls += 1
+        return super()._compute(trigger, response)
+
+
+class TestScript(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "pairs.db")
+        _CountingMatcher.calls = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def __createSequence(lag=5):
+        trigger = np.arange(20) * 20.0 + 1
+        return sequence.fromColumns(np.concatenate((trigger, trigger + lag)), ["A"] * 20 + ["B"] * 20)
+
+    def __createMatcher(self, cache):
+        matcher = _CountingMatcher()
+        matcher.trimCost = False
+        matcher.cache = cache
+        return matcher
+
+    def test_match(self):
+        with PairCache(self.filename) as cache:
+            rule, data = self.__createMatcher(cache).match(self.__createSequence(), "A", "B")
+            self.assertEqual(2, len(cache))
+
+        with PairCache(self.filename) as cache:
+            seq = self.__createSequence()
+            cachedRule, cachedData = self.__createMatcher(cache).match(seq, "A", "B")
+            self.assertEqual(1, _CountingMatcher.calls)
+            self.assertEqual(rule.trigger, cachedRule.trigger)
+            self.assertEqual(rule.likelihood, cachedRule.likelihood)
+            self.assertEqual(rule.successResponse, cachedRule.successResponse)
+            self.assertEqual(rule.data["Mutual Information"], cachedRule.data["Mutual Information"])
+            self.assertAlmostEqual(data[RESULT_MU], cachedData[RESULT_MU])
+            self.assertEqual(data[RESULT_IDX].tolist(), cachedData[RESULT_IDX].tolist())
+            self.assertEqual(rule.distributionResponse.samples.tolist(),
+                             cachedRule.distributionResponse.samples.tolist())
+            # links are restored from the cached assignment
+            self.assertEqual([5] * 20, seq.getLags("A", "B").tolist())
+
+            # other data, settings or a bypassed cache are computed again
+            self.__createMatcher(cache).match(self.__createSequence(6), "A", "B")
+            self.assertEqual(2, _CountingMatcher.calls)
+            matcher = self.__createMatcher(cache)
+            matcher.trimCost = True
+            matcher.match(self.__createSequence(), "A", "B")
+            self.assertEqual(3, _CountingMatcher.calls)
+            self.__createMatcher(cache).match(self.__createSequence(), "A", "B", enforceNormal=True)
+            self.assertEqual(4, _CountingMatcher.calls)
+            self.__createMatcher(cache).match(self.__createSequence(), "A", "B", useCache=False)
+            self.assertEqual(5, _CountingMatcher.calls)
+
+    def test_matchAll(self):
+        with PairCache() as cache:
+            first = self.__createMatcher(cache).matchAll(self.__createSequence())
+            calls = _CountingMatcher.calls
+            second = self.__createMatcher(cache).matchAll(self.__createSequence())
+            self.assertEqual(calls, _CountingMatcher.calls)
+            self.assertEqual([(r.trigger, r.response) for r in first], [(r.trigger, r.response) for r in second])
+
+    def test_eviction(self):
+        with PairCache(maxEntries=2) as cache:
+            for i in range(3):
+                cache.putCorrelation(str(i), i, 0.5)
+            self.assertIsNone(cache.getCorrelation("0"))
+            self.assertEqual((2, 0.5), cache.getCorrelation("2"))
+
+            # access updates the order of eviction
+            cache.getCorrelation("1")
+            cache.putCorrelation("3", 3, 0.5)
+            self.assertIsNotNone(cache.getCorrelation("1"))
+            self.assertIsNone(cache.getCorrelation("2"))
+            self.assertEqual(2, len(cache))
+
+    def test_matchKey(self):
+        vectorKey = PairCache.getVectorKey([np.array([1.0])], [np.array([2.0])])
+        matcher = self.__createMatcher(None)
+        matcher.weights = np.array([1.0, 2.0])
+        matcher.dist = NormalDistribution(0, 1)
+        key = PairCache.getMatchKey(matcher, vectorKey, {"initLag": 1.0})
+
+        # transient attributes are ignored, all others change the key
+        matcher.processes = 1
+        self.assertEqual(key, PairCache.getMatchKey(matcher, vectorKey, {"initLag": 1.0}))
+        matcher.weights = np.array([1.0, 3.0])
+        self.assertNotEqual(key, PairCache.getMatchKey(matcher, vectorKey, {"initLag": 1.0}))
+        matcher.weights = np.array([1.0, 2.0])
+        matcher.dist = NormalDistribution(0, 2)
+        self.assertNotEqual(key, PairCache.getMatchKey(matcher, vectorKey, {"initLag": 1.0}))
+        matcher.dist = NormalDistribution(0, 1)
+        self.assertNotEqual(key, PairCache.getMatchKey(matcher, vectorKey, {"initLag": np.array([1.0])}))
+        self.assertEqual(key, PairCache.getMatchKey(matcher, vectorKey, {"initLag": np.float64(1.0)}))
+
+        matcher.unknown = object()
+        with self.assertRaises(TypeError):
+            PairCache.getMatchKey(matcher, vectorKey, {})
+
+    def test_pickle(self):
+        with PairCache(self.filename) as cache:
+            cache.putCorrelation("a", 1, 0.5)
+            matcher = pickle.loads(pickle.dumps(self.__createMatcher(cache)))
+            self.assertIsNone(matcher.cache)
+            self.assertFalse(matcher.trimCost)
+
+            # the connection is opened again on first use
+            copy = pickle.loads(pickle.dumps(cache))
+            self.assertEqual((1, 0.5), copy.getCorrelation("a"))
+            copy.close()
+
+    def test_vectorKey(self):
+        a = [np.array([1.0, 2.0])]
+        b = [np.array([3.0])]
+        self.assertEqual(PairCache.getVectorKey(a, b), PairCache.getVectorKey([np.array([1, 2])], b))
+        self.assertNotEqual(PairCache.getVectorKey(a, b), PairCache.getVectorKey(b, a))
+        self.assertNotEqual(PairCache.getVectorKey([np.array([1.0]), np.array([2.0])], b),
+                            PairCache.getVectorKey(a, b))
+
+
+if __name__ == '__main__':
+    unittest.main()
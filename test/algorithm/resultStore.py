@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from algorithms import RESULT_IDX, RESULT_KDE
+from algorithms.munkresMatcher import MunkresMatcher
+from algorithms.resultStore import MUTUAL_INFORMATION, ResultStore
+from core import sequence
+from core.distribution import KdeDistribution, NormalDistribution
+from core.rule import Rule
+
+
+class TestScript(unittest.TestCase):
+    @staticmethod
+    def __createRule(trigger, response, likelihood, mutualInformation):
+        kde = KdeDistribution([1, 2, 3])
+        rule = Rule(trigger, response, kde, successTrigger=0.5, successResponse=0.25,
+                    data={RESULT_KDE: kde, RESULT_IDX: np.array([[0, 0], [1, 2]]),
+                          "Mutual Information": mutualInformation})
+        rule.likelihood = likelihood
+        return rule
+
+    def test_roundTrip(self):
+        with ResultStore() as store:
+            store.add(self.__createRule("A", "B", 0.5, 0.1))
+            rule = store.getRule("A", "B")
+
+            self.assertEqual("A", rule.trigger)
+            self.assertEqual(0.5, rule.likelihood)
+            self.assertEqual(0.25, rule.successResponse)
+            self.assertEqual([1, 2, 3], rule.distributionResponse.samples.tolist())
+            self.assertIs(rule.distributionResponse, rule.data[RESULT_KDE])
+            self.assertEqual([[0, 0], [1, 2]], rule.data[RESULT_IDX].tolist())
+            self.assertEqual(0.1, rule.data["Mutual Information"])
+            self.assertNotIn(RESULT_IDX, store.getRule("A", "B", assignment=False).data)
+            self.assertIsNone(store.getRule("B", "A"))
+
+            # normal distribution with separate kde
+            rule = Rule("B", "C", NormalDistribution(1, 2), data={RESULT_KDE: KdeDistribution([4, 5])})
+            store.add(rule)
+            rule = store.getRule("B", "C")
+            self.assertEqual(NormalDistribution(1, 2), rule.distributionResponse)
+            self.assertEqual([4, 5], rule.data[RESULT_KDE].samples.tolist())
+
+    def test_topRules(self):
+        with ResultStore() as store:
+            store.addAll([self.__createRule("A", "B", 0.5, 0.3), self.__createRule("A", "C", 0.9, 0.1),
+                          self.__createRule("C", "B", 0.7, None)])
+            self.assertEqual(3, len(store))
+            self.assertEqual([("A", "C"), ("C", "B")], [(r.trigger, r.response) for r in store.getTopRules(2)])
+            self.assertEqual([("A", "B"), ("A", "C")],
+                             [(r.trigger, r.response) for r in store.getTopRules(5, MUTUAL_INFORMATION)])
+            self.assertEqual([("A", "B")], [(r.trigger, r.response) for r in store.getTopRules(1, ascending=True)])
+            self.assertEqual(["B", "C"], [r.response for r in store.getByTrigger("A")])
+            self.assertEqual(["A", "C"], [r.trigger for r in store.getByResponse("B")])
+            with self.assertRaises(ValueError):
+                store.getTopRules(1, "likelihood; DROP TABLE rules")
+
+            # rules of the same pair are replaced
+            store.add(self.__createRule("A", "B", 0.1, 0.3))
+            self.assertEqual(3, len(store))
+            self.assertEqual(0.1, store.getRule("A", "B").likelihood)
+            store.remove("A", "B")
+            self.assertEqual([("A", "C"), ("C", "B")], store.getPairs())
+
+    def test_matcher(self):
+        trigger = np.arange(10) * 20.0 + 1
+        seq = sequence.fromColumns(np.concatenate((trigger, trigger + 5)), ["A"] * 10 + ["B"] * 10)
+        matcher = MunkresMatcher()
+        matcher.trimCost = False
+        rule, data = matcher.match(seq, "A", "B")
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "results.db")
+            with ResultStore(filename) as store:
+                store.add(rule)
+            with ResultStore(filename) as store:
+                loaded = store.getRule("A", "B")
+        self.assertEqual(rule.likelihood, loaded.likelihood)
+        self.assertEqual(rule.data["Mutual Information"], loaded.data["Mutual Information"])
+        self.assertEqual(data[RESULT_IDX].tolist(), loaded.data[RESULT_IDX].tolist())
+        self.assertEqual(rule.distributionResponse.samples.tolist(), loaded.distributionResponse.samples.tolist())
+
+    def test_progress(self):
+        with ResultStore() as store:
+            store.addProgress([("A", "B", None), ("B", "C", self.__createRule("C", "B", 0.5, 0.1))])
+            self.assertEqual({("A", "B"): None, ("B", "C"): ("C", "B")}, store.getProgress())
+            self.assertEqual([("C", "B")], store.getPairs())
+            store.clearProgress()
+            self.assertEqual({}, store.getProgress())
+            self.assertIsNone(store.getProgressFingerprint())
+            store.clearProgress("fingerprint")
+            self.assertEqual("fingerprint", store.getProgressFingerprint())
+            self.assertEqual(1, len(store))
+
+    def test_resume(self):
+        class InterruptedMatcher(MunkresMatcher):
+            limit = None
+            calls = 0
+
+            def _compute(self, trigger, response):
+                InterruptedMatcher.calls += 1
+                if (InterruptedMatcher.calls == InterruptedMatcher.limit):
+                    raise KeyboardInterrupt()
+                return super()._compute(trigger, response)
+
+        trigger = np.arange(20) * 20.0 + 1
+        timestamps = np.concatenate((trigger, trigger + 5, trigger + 9))
+        eventTypes = ["A"] * 20 + ["B"] * 20 + ["C"] * 20
+        expected = MunkresMatcher().matchAll(sequence.fromColumns(timestamps, eventTypes))
+
+        with ResultStore() as store:
+            InterruptedMatcher.limit = 2
+            with self.assertRaises(KeyboardInterrupt):
+                InterruptedMatcher().matchAll(sequence.fromColumns(timestamps, eventTypes), checkpoint=store)
+            self.assertEqual(1, len(store))
+
+            InterruptedMatcher.limit = None
+            InterruptedMatcher.calls = 0
+            seq = sequence.fromColumns(timestamps, eventTypes)
+            result = InterruptedMatcher().matchAll(seq, checkpoint=store, resume=True)
+            self.assertEqual(len(expected) - 1, InterruptedMatcher.calls)
+            self.assertEqual(sorted((r.trigger, r.response) for r in expected),
+                             sorted((r.trigger, r.response) for r in result))
+            # links of restored rules are set
+            for rule in result:
+                self.assertEqual(20, len(seq.getLinks(rule.trigger, rule.response)))
+
+            # a checkpoint of another sequence or other arguments is not resumed
+            InterruptedMatcher.calls = 0
+            with self.assertRaises(ValueError):
+                InterruptedMatcher().matchAll(sequence.fromColumns(timestamps * 2, eventTypes), checkpoint=store,
+                                              resume=True)
+            with self.assertRaises(ValueError):
+                InterruptedMatcher().matchAll(sequence.fromColumns(timestamps, eventTypes), alpha=0.01,
+                                              checkpoint=store, resume=True)
+            self.assertEqual(0, InterruptedMatcher.calls)
+
+            # without resume, all pairs are matched again
+            InterruptedMatcher.calls = 0
+            InterruptedMatcher().matchAll(sequence.fromColumns(timestamps, eventTypes), checkpoint=store)
+            self.assertEqual(len(expected), InterruptedMatcher.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import unittest
+
+import numpy as np
+
+from core import binarySequence, sequence
+from core.distribution import NormalDistribution, UniformDistribution
+from core.event import Event
+from core.rule import Rule
+from core.sequence import Sequence
+
+TMP_FILE_NAME = "/tmp/sequences.bseq"
+
+
+class TestScript(unittest.TestCase):
+    def tearDown(self):
+        if (os.path.exists(TMP_FILE_NAME)):
+            os.remove(TMP_FILE_NAME)
+
+    def test_storeAndLoad(self):
+        eventA = Event("A", 10)
+        eventB = Event("B", 12)
+        eventC = Event("C", 11)
+        eventC.occurred = False
+        eventA.setTriggered(eventB)
+        seq = Sequence([eventA, eventC, eventB], 5, [Rule("A", "B", NormalDistribution())])
+        seq.calculatedRules = [Rule("A", "B", UniformDistribution())]
+
+        seq.store(TMP_FILE_NAME)
+        self.assertTrue(binarySequence.isBinary(TMP_FILE_NAME))
+        seq2 = sequence.loadFromFile(TMP_FILE_NAME)
+
+        self.assertTrue(seq2.isColumnar())
+        self.assertIsInstance(seq2.getStorage().timestamps.base, np.memmap)
+        self.assertEqual(seq.length, seq2.length)
+        self.assertEqual(seq.firstTimestamp, seq2.firstTimestamp)
+        self.assertEqual(seq.eventTypes, seq2.eventTypes)
+        self.assertEqual(seq.events, seq2.events)
+        self.assertEqual([e.occurred for e in seq.events], [e.occurred for e in seq2.events])
+        self.assertEqual(seq2.events[2], seq2.events[0].triggered)
+        self.assertEqual(seq.rules, seq2.rules)
+        self.assertEqual(seq.calculatedRules, seq2.calculatedRules)
+        self.assertEqual([1], seq2.asVector("A").tolist())
+
+    def test_unusedEventTypes(self):
+        seq = sequence.fromColumns([1, 2], ["A", "B"])
+        seq.getStorage().vocabulary.insert(0, "Z")
+        seq.getStorage().codes += 1
+        seq.store(TMP_FILE_NAME)
+
+        storage, header = binarySequence.read(TMP_FILE_NAME)
+        self.assertEqual(["A", "B"], header["vocabulary"])
+        self.assertEqual([0, 1], storage.codes.tolist())
+
+    def test_invalid(self):
+        with open(TMP_FILE_NAME, "wb") as file:
+            file.write(b"{}")
+        self.assertFalse(binarySequence.isBinary(TMP_FILE_NAME))
+        with self.assertRaises(ValueError):
+            binarySequence.read(TMP_FILE_NAME)
+
+
+if __name__ == '__main__':
+    unittest.main()
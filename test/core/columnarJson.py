@@ -0,0 +1,132 @@
+import io
+import json
+import os
+import unittest
+
+import numpy as np
+
+import core
+from core import columnarJson, jsonStream, sequence
+from core.distribution import NormalDistribution, UniformDistribution
+from core.event import Event
+from core.rule import Rule
+from core.sequence import Sequence
+
+TMP_FILE_NAME = "/tmp/sequences.seq"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), 'sequences.json')
+
+
+class TestScript(unittest.TestCase):
+    def tearDown(self):
+        if (os.path.exists(TMP_FILE_NAME)):
+            os.remove(TMP_FILE_NAME)
+
+    def test_storeAndLoad(self):
+        eventA = Event("A", 10)
+        eventB = Event("B", 12.25)
+        eventC = Event("C", 11)
+        eventC.occurred = False
+        eventA.setTriggered(eventB)
+        seq = Sequence([eventA, eventC, eventB], 5, [Rule("A", "B", NormalDistribution())])
+        seq.calculatedRules = [Rule("A", "B", UniformDistribution())]
+        seq.store(TMP_FILE_NAME)
+
+        with open(TMP_FILE_NAME) as file:
+            content = json.load(file)
+        self.assertTrue(columnarJson.isColumnar(content))
+        self.assertEqual([1, 2, 3.25], content["columns"]["timestamps"])
+
+        for columnar in (False, True):
+            seq2 = sequence.loadFromFile(TMP_FILE_NAME, columnar)
+            self.assertEqual(columnar, seq2.isColumnar())
+            self.assertEqual(seq.length, seq2.length)
+            self.assertEqual(seq.firstTimestamp, seq2.firstTimestamp)
+            self.assertEqual(seq.events, seq2.events)
+            self.assertEqual([e.occurred for e in seq.events], [e.occurred for e in seq2.events])
+            self.assertEqual(seq2.events[2], seq2.events[0].triggered)
+            self.assertEqual(seq.rules, seq2.rules)
+            self.assertEqual(seq.calculatedRules, seq2.calculatedRules)
+
+        with open(TMP_FILE_NAME) as file:
+            self.assertEqual(seq.events, sequence.load(file.read()).events)
+
+    def test_resolution(self):
+        seq = sequence.fromColumns([1e9 + 0.3, 1e9 + 0.1, 1e9 + 0.7], ["A", "B", "A"], resolution=0.1)
+        seq.store(TMP_FILE_NAME)
+
+        seq2 = sequence.loadFromFile(TMP_FILE_NAME, columnar=True)
+        self.assertEqual(0.1, seq2.resolution)
+        self.assertEqual(seq.getStorage().timestamps.tolist(), seq2.getStorage().timestamps.tolist())
+        self.assertEqual(seq.firstTimestamp, seq2.firstTimestamp)
+
+    def test_chunks(self):
+        seq = sequence.fromColumns(range(100), ["A", "B"] * 50)
+        file = io.StringIO()
+        chunkSize = columnarJson.CHUNK_SIZE
+        try:
+            columnarJson.CHUNK_SIZE = 7
+            columnarJson.write(file, seq.getStorage(), {"length": seq.length})
+        finally:
+            columnarJson.CHUNK_SIZE = chunkSize
+
+        storage = columnarJson.read(json.loads(file.getvalue()))
+        self.assertEqual(seq.getStorage().timestamps.tolist(), storage.timestamps.tolist())
+        self.assertEqual(seq.getStorage().codes.tolist(), storage.codes.tolist())
+
+    def test_streamColumns(self):
+        seq = sequence.fromColumns(np.linspace(0, 1, 1000) ** 2, ["A", "B", "C", "D"] * 250)
+        seq.getStorage().occurred[::3] = False
+        file = io.StringIO()
+        columnarJson.write(file, seq.getStorage(), {"length": seq.length})
+
+        # the chunks end within numbers, so the tokens at the borders have to be joined
+        file.seek(0)
+        collector = columnarJson.ColumnCollector()
+        content = jsonStream.parse(file, "events", None, chunkSize=13, numbersKey="columns",
+                                   numbersCallback=collector.add)
+        self.assertIsNone(content["columns"])
+        storage = columnarJson.read(content, collector)
+        self.assertEqual(seq.getStorage().timestamps.tolist(), storage.timestamps.tolist())
+        self.assertEqual(seq.getStorage().codes.tolist(), storage.codes.tolist())
+        self.assertEqual(seq.getStorage().occurred.tolist(), storage.occurred.tolist())
+        self.assertEqual(seq.getStorage().triggered.tolist(), storage.triggered.tolist())
+
+        empty = sequence.fromColumns([], [])
+        file = io.StringIO()
+        columnarJson.write(file, empty.getStorage(), {"length": 0})
+        file.seek(0)
+        collector = columnarJson.ColumnCollector()
+        content = jsonStream.parse(file, "events", None, numbersKey="columns", numbersCallback=collector.add)
+        self.assertEqual(0, len(columnarJson.read(content, collector)))
+
+    def test_nonFinite(self):
+        for value in (np.inf, np.nan):
+            file = io.StringIO()
+            with self.assertRaises(ValueError):
+                columnarJson.write(file, core.storage.fromColumns([1, value], ["A", "B"]), {"length": 0})
+            self.assertEqual("", file.getvalue())
+
+    def test_legacyFormat(self):
+        seq = sequence.loadFromFile(INPUT_FILE)
+        with open(TMP_FILE_NAME, "w") as file:
+            file.write(json.dumps(seq.asJson(), default=core.defaultJsonEncoding))
+        self.assertEqual(seq.events, sequence.loadFromFile(TMP_FILE_NAME).events)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            columnarJson.read({"format": columnarJson.FORMAT, "version": 2})
+        with self.assertRaises(ValueError):
+            columnarJson.read({"format": columnarJson.FORMAT, "version": columnarJson.VERSION, "columns": {}})
+
+        header = {"format": columnarJson.FORMAT, "version": columnarJson.VERSION, "count": 2, "vocabulary": ["A"]}
+        for columns in ('"timestamps": [1, 2, 3]', '"timestamps": [1]', '"unknown": [1, 2]'):
+            content = json.dumps(header)[:-1] + ', "columns": {' + columns + '}}'
+            with self.assertRaises(ValueError):
+                collector = columnarJson.ColumnCollector()
+                content = jsonStream.parse(io.StringIO(content), "events", None, numbersKey="columns",
+                                           numbersCallback=collector.add)
+                columnarJson.read(content, collector)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from core import compression, sequence
+from core.event import Event
+from core.sequence import Sequence
+from provider.hdPrinter import HDPrinterParser
+
+
+class TestScript(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_storeAndLoad(self):
+        seq = Sequence([Event("A", 1), Event("B", 2.5), Event("A", 4)])
+        for extension in compression.EXTENSIONS:
+            filename = os.path.join(self.directory, "sequence.seq" + extension)
+            seq.store(filename)
+            self.assertTrue(compression.isCompressed(filename))
+            with open(filename, "rb") as file:
+                self.assertNotEqual(b"{", file.read(1))
+            self.assertEqual(seq.events, sequence.loadFromFile(filename).events)
+
+    def test_magicBytes(self):
+        seq = Sequence([Event("A", 1), Event("B", 2)])
+        filename = os.path.join(self.directory, "sequence.seq.bz2")
+        seq.store(filename)
+
+        # compression is detected without extension
+        renamed = os.path.join(self.directory, "sequence.seq")
+        os.rename(filename, renamed)
+        self.assertTrue(compression.isCompressed(renamed))
+        self.assertEqual(seq.events, sequence.loadFromFile(renamed, columnar=True).events)
+
+        seq.store(renamed)
+        self.assertFalse(compression.isCompressed(renamed))
+
+    def test_provider(self):
+        filename = os.path.join(self.directory, "printer.csv.gz")
+        with compression.openFile(filename, "w") as file:
+            file.write("id;device;timestamp;event;text;status\n")
+            file.write("0;0;2020-01-01T00:00:01+00:00;A;-;OK\n")
+            file.write("0;0;2020-01-01T00:00:03+00:00;B;-;OK\n")
+        seq = HDPrinterParser().create(filename)
+        self.assertEqual([Event("A", 1), Event("B", 3)], seq.events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from core import sequence
+from core.corpus import SequenceCorpus
+from core.event import Event
+from core.sequence import Sequence
+
+
+class TestScript(unittest.TestCase):
+    def test_vocabulary(self):
+        seq1 = sequence.fromColumns([2, 3, 5], ["A", "B", "A"])
+        seq2 = Sequence([Event("C", 2), Event("A", 4)])
+        corpus = SequenceCorpus([seq1, seq2])
+
+        self.assertEqual(2, len(corpus))
+        self.assertIs(seq2, corpus[1])
+        self.assertEqual({"A", "B", "C"}, corpus.eventTypes)
+        self.assertEqual(["A", "B", "C"], corpus.vocabulary)
+        self.assertEqual([2, 0], corpus.getCodes(1).tolist())
+        self.assertEqual(3, corpus.getCount("A"))
+        self.assertEqual(5, corpus.getEventCount())
+
+        seq2.addEvents([Event("D", 7)])
+        self.assertEqual(3, corpus.getCode("D"))
+        self.assertEqual([2, 0, 3], corpus.getCodes(1).tolist())
+
+    def test_offsets(self):
+        corpus = SequenceCorpus([sequence.fromColumns([2, 3, 5], ["A", "B", "A"]),
+                                 sequence.fromColumns([1], ["B"]),
+                                 sequence.fromColumns([4, 6], ["A", "A"])])
+        self.assertEqual([0, 2, 2, 4], corpus.getOffsets("A").tolist())
+        self.assertEqual([[1, 4], [], [1, 3]], [v.tolist() for v in corpus.asVectors("A")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import sys
 
 import numpy as np
+from scipy import stats
 
 from core import distribution
 from core.distribution import NormalDistribution, UniformDistribution, KdeDistribution, \
@@ -97,6 +98,83 @@ class TestScript(unittest.TestCase):
         self.assertAlmostEqual(-1.4482, dist.getDifferentialEntropy(), delta=0.25)
         self.assertIsNotNone(dist.getRandom())
 
+    def test_kdeBinned(self):
+        samples = np.concatenate((np.linspace(-3, 3, 500) ** 3, np.linspace(20, 30, 300)))
+        dist = KdeDistribution(samples)
+        exact = KdeDistribution(samples, tolerance=None)
+        x = np.linspace(-40, 60, 5000)
+        pdf = exact.getPDFValue(x)
+        self.assertLessEqual(np.abs(dist.getPDFValue(x) - pdf).max(), distribution.KDE_TOLERANCE * pdf.max())
+        self.assertLessEqual(np.abs(dist.getPDFValue(list(x[:100])) - pdf[:100]).max(),
+                             distribution.KDE_TOLERANCE * pdf.max())
+
+        dist.tolerance = 1e-2
+        error = np.abs(dist.getPDFValue(x) - pdf).max()
+        self.assertLessEqual(error, 1e-2 * pdf.max())
+        self.assertGreater(error, distribution.KDE_TOLERANCE * pdf.max())
+        self.assertEqual(1e-2, (-dist).tolerance)
+
+        # single values and widely spread values are evaluated exactly
+        self.assertEqual(exact.getPDFValue(0.5), dist.getPDFValue(0.5))
+        self.assertEqual(exact.getPDFValue([0.5]), dist.getPDFValue([0.5]))
+        x = np.array([0, 1e9])
+        self.assertEqual(exact.getPDFValue(x).tolist(), dist.getPDFValue(x).tolist())
+
+    def test_kdeCdf(self):
+        samples = np.concatenate((np.linspace(-3, 3, 500) ** 3, np.linspace(20, 30, 300)))
+        dist = KdeDistribution(samples)
+        lower, upper = dist.getCompleteInterval()
+        kernel = stats.gaussian_kde(dist.samples, 0.2)
+        x = np.linspace(-50, 50, 1000)
+        expected = [kernel.integrate_box_1d(lower, min(v, upper)) if (v > lower) else 0 for v in x]
+        np.testing.assert_allclose(expected, dist.getCDFValue(x), atol=1e-12)
+        self.assertAlmostEqual(kernel.integrate_box_1d(lower, 0.5), dist.getCDFValue(0.5), places=12)
+        self.assertEqual(0, dist.getCDFValue(lower - 1))
+
+        singular = KdeDistribution([1, 1])
+        self.assertEqual([0, 1, 1], singular.getCDFValue([0, 1, 2]).tolist())
+
+        lower, upper = distribution.approximateIntervalBorders(dist, 0.5)
+        self.assertGreaterEqual(dist.getCDFValue(upper) - dist.getCDFValue(lower), 0.5)
+        self.assertLess(dist.getCDFValue(upper - 0.01) - dist.getCDFValue(lower), 0.5)
+
+    def test_tabulate(self):
+        for dist in (NormalDistribution(2, 3), ExponentialDistribution(1, 2), UniformDistribution(-1, 1),
+                     KdeDistribution(np.linspace(-3, 3, 50) ** 3)):
+            table = dist.tabulate()
+            lower, upper = table.getDomain()
+            x = np.linspace(lower, upper, 10000)
+            pdf = dist.getPDFValue(x)
+            # discontinuities of the uniform pdf are only resolved up to the grid spacing
+            errors = np.abs(table.getPDFValue(x) - pdf)
+            self.assertLessEqual(np.percentile(errors, 99), distribution.TABLE_TOLERANCE * pdf.max())
+            self.assertLess(np.abs(table.getCDFValue(x) - dist.getCDFValue(x)).max(), 1e-2)
+            self.assertAlmostEqual(dist.getPDFValue(lower + 0.3), table.getPDFValue(lower + 0.3), places=2)
+            # values outside the tables are evaluated exactly
+            self.assertEqual(dist.getPDFValue(upper + 1), table.getPDFValue(upper + 1))
+            self.assertEqual(dist.getCDFValue(np.array([upper + 1])), table.getCDFValue(np.array([upper + 1])))
+            self.assertIs(table, table.tabulate())
+            self.assertEqual(dist.asJson(), table.asJson())
+
+        # the discontinuous pdf does not reach the tolerance and is evaluated exactly
+        singular = KdeDistribution([1, 1]).tabulate()
+        self.assertEqual(0, singular.error)
+        self.assertEqual(sys.maxsize, singular.getPDFValue(1))
+        self.assertEqual([0, float(sys.maxsize), 0], singular.getPDFValue(np.array([0.9, 1, 1.1])).tolist())
+        self.assertEqual([0, 1], singular.getCDFValue(np.array([0.9, 1.1])).tolist())
+
+    def test_tabulateNarrow(self):
+        dist = KdeDistribution(np.random.RandomState(0).normal(0, 1e-5, 100))
+        table = dist.tabulate(maxPoints=1 << 10)
+        self.assertEqual(0, table.error)
+        x = np.linspace(-5e-5, 5e-5, 1001)
+        self.assertEqual(dist.getPDFValue(x).tolist(), table.getPDFValue(x).tolist())
+        self.assertEqual(dist.getCDFValue(x).tolist(), table.getCDFValue(x).tolist())
+
+        table = NormalDistribution(0, 1).tabulate()
+        self.assertGreater(table.error, 0)
+        self.assertLessEqual(table.error, distribution.TABLE_TOLERANCE * table.getMaximumPDF())
+
     def test_kde_invalid(self):
         with self.assertRaises(ValueError):
             KdeDistribution([])
@@ -110,6 +188,42 @@ class TestScript(unittest.TestCase):
     def test_getMaximumPDF(self):
         dist = NormalDistribution()
         self.assertEqual(0.3989422804014327, dist.getMaximumPDF())
+        self.assertEqual(0.5, ExponentialDistribution(1, 2).getMaximumPDF())
+
+        dist = StaticDistribution([1, 2])
+        self.assertEqual(2, dist.getMaximumPDF())
+        self.assertEqual(2, dist.getSummary().maxPdf)
+        self.assertEqual(1, dist.getPDFValue(0))
+
+        dist = KdeDistribution(np.linspace(-1, 1, 50))
+        x = np.linspace(-3, 3, 1001)
+        self.assertGreater(dist.getMaximumPDF(), 0)
+        self.assertAlmostEqual(dist.getPDFValue(x).max(), dist.getMaximumPDF(), delta=1e-3)
+        self.assertLessEqual(dist.getRelativePdf(0), 1)
+
+    def test_getSummary(self):
+        dist = NormalDistribution(1, 2)
+        summary = dist.getSummary()
+        self.assertIs(summary, dist.getSummary())
+        self.assertEqual(dist.getDifferentialEntropy(), summary.entropy)
+        self.assertEqual(dist.getMaximumPDF(), summary.maxPdf)
+        self.assertEqual(1, summary.mode)
+        self.assertEqual(1, summary.mean)
+        self.assertEqual(4, summary.var)
+        self.assertEqual(2, summary.std)
+        self.assertEqual(dist.getCompleteInterval(), summary.interval)
+        self.assertAlmostEqual(1, summary.mass, delta=1e-6)
+        self.assertAlmostEqual(-dist.getDifferentialEntropy() / np.log(2), summary.information, delta=1e-6)
+
+        samples = np.concatenate((np.linspace(-2, 2, 100), np.linspace(9, 11, 300)))
+        dist = KdeDistribution(samples)
+        summary = dist.getSummary()
+        self.assertAlmostEqual(10, summary.mode, delta=0.5)
+        self.assertAlmostEqual(samples.mean(), summary.mean)
+        self.assertAlmostEqual(samples.var(), summary.var)
+        self.assertAlmostEqual(samples.std(), summary.std)
+        self.assertEqual(summary.entropy, dist.getDifferentialEntropy())
+        self.assertIs(summary, dist.tabulate().getSummary())
 
     def test___eq__(self):
         dist1 = NormalDistribution()
@@ -0,0 +1,33 @@
+import io
+import json
+import unittest
+
+from core import jsonStream
+
+
+class TestScript(unittest.TestCase):
+    def test_parse(self):
+        content = {"length": 4126245, "events": [{"eventType": "A", "timestamp": "1.5"}, {"eventType": "B"}],
+                   "rules": [{"a": [1, 2, {"b": "}"}]}], "firstTimestamp": 12345678901234567890}
+        items = []
+        result = jsonStream.parse(io.StringIO(json.dumps(content, indent=4)), "events", items.append, chunkSize=3)
+
+        self.assertEqual(content["events"], items)
+        self.assertEqual({"length": 4126245, "events": None, "rules": content["rules"],
+                          "firstTimestamp": 12345678901234567890}, result)
+
+    def test_parseEmpty(self):
+        items = []
+        self.assertEqual({}, jsonStream.parse(io.StringIO("{}"), "events", items.append))
+        self.assertEqual({"events": None}, jsonStream.parse(io.StringIO('{"events": []}'), "events", items.append))
+        self.assertEqual(0, len(items))
+
+    def test_parseInvalid(self):
+        with self.assertRaises(ValueError):
+            jsonStream.parse(io.StringIO('{"events": [{"a": 1}'), "events", lambda x: None)
+        with self.assertRaises(ValueError):
+            jsonStream.parse(io.StringIO('[1, 2]'), "events", lambda x: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
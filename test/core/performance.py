@@ -2,7 +2,9 @@ import unittest
 
 import numpy as np
 
-from core.performance import PearsonCoefficient, DistanceCorrelation, EnergyDistance
+from core import seeding
+from core.distribution import NormalDistribution
+from core.performance import PearsonCoefficient, DistanceCorrelation, EnergyDistance, MutualInformationPerformance
 
 
 class TestScript(unittest.TestCase):
@@ -79,3 +81,23 @@ class TestScript(unittest.TestCase):
         self.assertLess(res[1], 0.5)
         res = EnergyDistance().compute(self.list1, self.list2)
         self.assertGreater(res[1], 0.5)
+
+    def testEnergyDistanceSeed(self):
+        eventA = np.linspace(0, 1, 20)
+        eventB = np.linspace(0.3, 1.3, 20)
+        with seeding.using(42):
+            res = EnergyDistance().compute(eventA, eventB)
+        with seeding.using(42):
+            self.assertEqual(res, EnergyDistance().compute(eventA, eventB))
+
+    def testMutualInformation(self):
+        class Statistics:
+            @staticmethod
+            def getFrequency(eventType):
+                return {"A": 0.3, "B": 0.2}[eventType]
+
+        dist = NormalDistribution(1, 2)
+        expected = 0.3 * (-dist.getDifferentialEntropy() / np.log(2) - np.log2(0.2))
+        res = MutualInformationPerformance(Statistics(), "A", "B").getValueByDistribution(dist)
+        self.assertAlmostEqual(expected, res, delta=1e-6)
+        self.assertEqual(res, MutualInformationPerformance(Statistics(), "A", "B").getValueByDistribution(dist))
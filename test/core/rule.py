@@ -3,7 +3,8 @@ import unittest
 
 import core
 from core.distribution import NormalDistribution, StaticDistribution, UniformDistribution
-from core.rule import Rule
+from core.event import Event
+from core.rule import Rule, RuleSet
 
 INPUT_FILE = os.path.join(os.path.dirname(__file__), 'rules.json')
 
@@ -103,6 +104,65 @@ class TestScript(unittest.TestCase):
         rule = Rule("a", "b", StaticDistribution([1], rvs=[1]))
         self.assertEqual(1, rule.getResponseTimestamp())
 
+    def test_ruleSet(self):
+        ab = Rule('A', 'B', StaticDistribution([1]))
+        ac = Rule('A', 'C', StaticDistribution([2]))
+        cb = Rule('C', 'B', StaticDistribution([3]))
+        rules = RuleSet([ab, ac])
+        rules.append(cb)
+
+        self.assertEqual(3, len(rules))
+        self.assertEqual([ab, ac, cb], rules)
+        self.assertIs(cb, rules[2])
+        self.assertIs(ac, rules.get('A', 'C'))
+        self.assertIs(ab, rules.get(Event('A'), Event('B')))
+        self.assertIsNone(rules.get('B', 'A'))
+        self.assertEqual([ab, ac], rules.getByTrigger('A'))
+        self.assertEqual([ab, cb], rules.getByResponse('B'))
+        self.assertEqual([], rules.getByTrigger('B'))
+        self.assertTrue(('C', 'B') in rules)
+        self.assertTrue(ab in rules)
+
+        duplicate = Rule('A', 'B', StaticDistribution([4]))
+        self.assertFalse(rules.add(duplicate))
+        self.assertEqual(3, len(rules))
+        rules.merge([duplicate, Rule('B', 'C', StaticDistribution([5]))])
+        self.assertIs(ab, rules.get('A', 'B'))
+        self.assertEqual(4, len(rules))
+        rules.merge([duplicate], replace=True)
+        self.assertIs(duplicate, rules.get('A', 'B'))
+        self.assertIs(duplicate, rules[0])
+
+        rules.remove(ac)
+        self.assertIsNone(rules.get('A', 'C'))
+        self.assertEqual([duplicate], rules.getByTrigger('A'))
+        self.assertEqual([duplicate], rules.getByTrigger(Event('A')))
+        self.assertEqual([duplicate, cb], rules.getByResponse(Event('B')))
+        self.assertEqual([duplicate, cb, rules[2]], rules)
+        self.assertEqual(3, len(rules))
+        with self.assertRaises(ValueError):
+            rules.remove(ac)
+
+        # a removed rule is replaced by the next rule with the same trigger and response
+        second = Rule('C', 'B', StaticDistribution([6]))
+        rules.append(second)
+        rules.remove(cb)
+        self.assertIs(second, rules.get('C', 'B'))
+        self.assertEqual([duplicate, second], rules.getByResponse('B'))
+        rules.remove(second)
+        self.assertNotIn(('C', 'B'), rules)
+        self.assertEqual([], rules.getByTrigger('C'))
+        self.assertEqual(2, len(rules))
+
+    def test_ruleSetRemoveMany(self):
+        rules = RuleSet(Rule(str(i), str(i + 1), StaticDistribution([i])) for i in range(1000))
+        for rule in list(rules)[::2]:
+            rules.remove(rule)
+        self.assertEqual(500, len(rules))
+        self.assertEqual([str(i) for i in range(1, 1000, 2)], [rule.trigger for rule in rules])
+        self.assertIs(rules[1], rules.get('3', '4'))
+        self.assertIsNone(rules.get('2', '3'))
+
 
 if __name__ == '__main__':
     unittest.main()
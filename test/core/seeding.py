@@ -0,0 +1,73 @@
+import multiprocessing
+import unittest
+
+import numpy as np
+
+from core import seeding
+from core.distribution import KdeDistribution, NormalDistribution
+
+
+def _draw(seed, queue):
+    with seeding.using(seed):
+        queue.put(NormalDistribution().getRandom(5).tolist())
+
+
+class TestScript(unittest.TestCase):
+    def tearDown(self):
+        seeding.seed()
+
+    def test_seed(self):
+        seeding.seed(1)
+        first = [NormalDistribution().getRandom(3).tolist(), KdeDistribution([1, 2, 4]).getRandom(3).tolist()]
+        seeding.seed(1)
+        second = [NormalDistribution().getRandom(3).tolist(), KdeDistribution([1, 2, 4]).getRandom(3).tolist()]
+        self.assertEqual(first, second)
+
+        # distributions use independent streams
+        seeding.seed(1)
+        a = NormalDistribution()
+        b = NormalDistribution()
+        self.assertNotEqual(a.getRandom(3).tolist(), b.getRandom(3).tolist())
+
+        # the global state of numpy is not modified
+        np.random.seed(5)
+        expected = np.random.rand()
+        np.random.seed(5)
+        NormalDistribution().getRandom()
+        self.assertEqual(expected, np.random.rand())
+
+    def test_setSeed(self):
+        self.assertEqual(NormalDistribution().setSeed(3).getRandom(4).tolist(),
+                         NormalDistribution().setSeed(3).getRandom(4).tolist())
+
+    def test_using(self):
+        seeding.seed(1)
+        seeds = seeding.spawn(2)
+        with seeding.using(seeds[0]):
+            value = NormalDistribution().getRandom()
+        with seeding.using(seeds[0]):
+            self.assertEqual(value, NormalDistribution().getRandom())
+        with seeding.using(seeds[1]):
+            self.assertNotEqual(value, NormalDistribution().getRandom())
+
+    def test_workers(self):
+        seeding.seed(7)
+        seeds = seeding.spawn(3)
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_draw, args=(seed, queue)) for seed in seeds]
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        expected = []
+        for seed in seeds:
+            with seeding.using(seed):
+                expected.append(NormalDistribution().getRandom(5).tolist())
+        self.assertEqual(sorted(expected), sorted(results))
+        self.assertEqual(3, len(set(tuple(r) for r in results)))
+
+
+if __name__ == '__main__':
+    unittest.main()
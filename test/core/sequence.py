@@ -1,6 +1,8 @@
 import os
 import unittest
 
+import numpy as np
+
 from core import sequence
 from core.distribution import NormalDistribution, UniformDistribution
 from core.event import Event
@@ -70,6 +72,242 @@ class TestScript(unittest.TestCase):
         self.assertEqual(1, len(vec))
         self.assertEqual(0, vec[0])
 
+    def test_loadDuplicates(self):
+        seq = sequence.load({"length": 5, "firstTimestamp": 0, "events": [
+            {"eventType": "A", "timestamp": "1", "triggered": {"eventType": "B", "timestamp": "2"}},
+            {"eventType": "B", "timestamp": "2", "occurred": "False"},
+            {"eventType": "A", "timestamp": "1"}]})
+
+        self.assertEqual(2, len(seq))
+        self.assertFalse(seq.events[1].occurred)
+        self.assertIs(seq.events[1], seq.events[0].triggered)
+        self.assertEqual(0, len(seq.asVector("B")))
+
+    def test_columnar(self):
+        seq = sequence.fromColumns([5, 3, 4, 7], ["B", "A", "A", "B"], [True, True, False, True])
+        self.assertTrue(seq.isColumnar())
+        self.assertEqual(4, len(seq))
+        self.assertEqual(2, seq.firstTimestamp)
+        self.assertEqual({"A", "B"}, seq.eventTypes)
+        self.assertEqual([1], seq.asVector("A").tolist())
+        self.assertEqual([3, 5], seq.asVector("B").tolist())
+        self.assertEqual(0, len(seq.asVector("C")))
+        self.assertEqual([1], seq.getMissingIdx("A").tolist())
+
+        events = seq.getEvents("A")
+        self.assertEqual([Event("A", 1), Event("A", 2)], events)
+        self.assertFalse(events[1].occurred)
+        self.assertIs(events[0], seq.events[0])
+        self.assertEqual(Event("B", 5), seq.events[3])
+
+    def test_loadColumnar(self):
+        seq = sequence.loadFromFile(INPUT_FILE, columnar=True)
+        self.assertTrue(seq.isColumnar())
+        self.assertEqual(3, len(seq))
+        self.assertEqual(10, seq.length)
+
+        eventA = seq.getEvents("A")[0]
+        self.assertEqual(Event("B", 2), eventA.triggered)
+        self.assertIs(eventA, eventA.triggered.triggeredBy)
+        self.assertIs(eventA.triggered, seq.events[2])
+        self.assertEqual(str(sequence.loadFromFile(INPUT_FILE)), str(seq))
+
+    def test_index(self):
+        seq = Sequence([Event("A", 2), Event("B", 3), Event("A", 5)])
+        self.assertEqual([1, 4], seq.asVector("A").tolist())
+        self.assertEqual(2, seq.getStorage().getCount("A"))
+        self.assertEqual([0, 2], seq.getStorage().getPositions("A").tolist())
+        with self.assertRaises(ValueError):
+            seq.asVector("A")[0] = 0
+
+        seq.addEvents([Event("A", 4), Event("C", 6)])
+        self.assertEqual([1, 3, 4], seq.asVector("A").tolist())
+        self.assertEqual([Event("A", 1), Event("A", 3), Event("A", 4)], seq.getEvents("A"))
+        self.assertEqual([5], seq.asVector("C").tolist())
+        self.assertEqual({"A", "B", "C"}, seq.eventTypes)
+        self.assertEqual(6, seq.length)
+
+        seq.events.append(Event("B", 7))
+        self.assertEqual([2, 7], seq.asVector("B").tolist())
+
+    def test_indexColumnar(self):
+        seq = sequence.fromColumns([2, 3, 5], ["A", "B", "A"])
+        first = seq.getEvents("A")[1]
+        seq.addEvents([Event("A", 4), Event("C", 6)])
+        self.assertEqual([1, 3, 4], seq.asVector("A").tolist())
+        self.assertIs(first, seq.getEvents("A")[2])
+        self.assertEqual([Event("A", 1), Event("B", 2), Event("A", 3), Event("A", 4), Event("C", 5)], seq.events)
+
+    def test_addEvents(self):
+        random = np.random.RandomState(0)
+        for columnar in (False, True):
+            seq = sequence.fromColumns([], []) if columnar else Sequence([])
+            expected = []
+            for batch in range(20):
+                timestamps = 10 * batch + 10 + random.randint(-15, 10, size=random.randint(1, 8))
+                eventTypes = random.choice(["A", "B", "C", "D"], size=len(timestamps))
+                events = [Event(t, float(ts)) for t, ts in zip(eventTypes, timestamps)]
+                expected.extend(Event(e.eventType, e.timestamp) for e in events)
+                seq.getEvents("A")
+                seq.addEvents(events)
+                self.assertTrue(any(e is events[0] for e in seq.getEvents(events[0].eventType)))
+
+            reference = Sequence(expected)
+            self.assertEqual(reference.firstTimestamp, seq.firstTimestamp)
+            self.assertEqual(reference.length, seq.length)
+            self.assertEqual(reference.eventTypes, seq.eventTypes)
+            self.assertEqual(reference.events, seq.events)
+            self.assertEqual([e.timestamp for e in reference.events], [e.timestamp for e in seq.events])
+            for eventType in reference.eventTypes:
+                self.assertEqual(reference.asVector(eventType).tolist(), seq.asVector(eventType).tolist())
+                self.assertEqual(reference.getEvents(eventType), seq.getEvents(eventType))
+
+    def test_addEventsLinks(self):
+        seq = sequence.fromColumns([1, 5, 7], ["A", "B", "C"])
+        seq.getStorage().triggered[:] = [1, 2, -1]
+        seq.addEvents([Event("D", 8), Event("E", 3)])
+        self.assertEqual(["A", "E", "B", "C", "D"], [e.eventType for e in seq.events])
+        self.assertEqual("B", seq.events[0].triggered.eventType)
+        self.assertEqual("C", seq.events[2].triggered.eventType)
+        self.assertIsNone(seq.events[1].triggered)
+
+    def test_addEventsView(self):
+        for seq in (sequence.fromColumns([2, 3, 4, 5, 6], ["A", "B", "A", "B", "A"]),
+                    Sequence([Event("A", 2), Event("B", 3), Event("A", 4), Event("B", 5), Event("A", 6)])):
+            # spare capacity, so the merge could write into the columns shared with the view
+            seq.asVector("A")
+            seq.addEvents([Event("B", 8)])
+            view = seq.window(0, 4)
+            first = seq.events[0]
+            seq.addEvents([Event("C", 1.5)])
+
+            self.assertEqual([Event("A", 1), Event("B", 2), Event("A", 3)], view.events)
+            self.assertIs(first, view.events[0])
+            self.assertEqual([1, 3], view.asVector("A").tolist())
+            self.assertEqual([], view.asVector("C").tolist())
+            self.assertEqual(["C", "A", "B", "A", "B", "A", "B"], [e.eventType for e in seq.events])
+            self.assertEqual([0.5], seq.asVector("C").tolist())
+
+    def test_window(self):
+        for seq in (sequence.fromColumns([2, 3, 5, 6, 8], ["A", "B", "A", "C", "A"]),
+                    Sequence([Event("A", 2), Event("B", 3), Event("A", 5), Event("C", 6), Event("A", 8)])):
+            view = seq.window(2, 5.5)
+            self.assertTrue(view.isView())
+            self.assertEqual([Event("B", 2), Event("A", 4), Event("C", 5)], view.events)
+            self.assertIs(seq.events[1], view.events[0])
+            self.assertEqual({"A", "B", "C"}, view.eventTypes)
+            self.assertEqual([4], view.asVector("A").tolist())
+            self.assertEqual(6, view.length)
+            self.assertEqual(0, len(seq.window(10, 20)))
+
+            head = seq.head(2)
+            self.assertEqual([Event("A", 1), Event("B", 2)], head.getEvents())
+            self.assertEqual({"A", "B"}, head.eventTypes)
+            self.assertEqual(5, len(seq.head(10)))
+
+    def test_windowLinks(self):
+        eventA = Event("A", 1)
+        eventB = Event("B", 2)
+        eventC = Event("C", 4)
+        eventA.setTriggered(eventB)
+        eventB.setTriggered(eventC)
+        seq = Sequence([eventA, eventB, eventC])
+
+        view = seq.window(2, 5)
+        self.assertIs(eventB, view.getEvents("B")[0])
+        self.assertEqual([1, -1], view.asStorage().triggered.tolist())
+
+        seq = sequence.fromColumns([1, 2, 4], ["A", "B", "C"])
+        seq.getStorage().triggered[:] = [1, 2, -1]
+        view = seq.window(2, 5)
+        self.assertEqual([1, -1], view.asStorage().triggered.tolist())
+        self.assertEqual([-1], view.head(1).asStorage().triggered.tolist())
+        self.assertIs(seq.events[2], view.events[0].triggered)
+
+    def test_links(self):
+        for columnar in (False, True):
+            timestamps = [1, 2, 3, 5, 6, 7]
+            eventTypes = ["A", "B", "A", "B", "A", "B"]
+            seq = sequence.fromColumns(timestamps, eventTypes) if columnar \
+                else Sequence([Event(eventTypes[i], timestamps[i]) for i in range(len(timestamps))])
+            self.assertEqual((0, 2), seq.getLinks("A", "B").shape)
+
+            seq.setLinks("A", "B", [[0, 0], [1, 2], [2, 1]])
+            self.assertEqual([[0, 1], [2, 5], [4, 3]], seq.getLinks("A", "B").tolist())
+            self.assertEqual([1, 4, -1], seq.getLags("A", "B").tolist())
+
+            view = seq.window(3, 8)
+            self.assertEqual([[0, 3], [2, 1]], view.getLinks("A", "B").tolist())
+            view.setLinks("A", "B", [[0, 0]])
+            self.assertEqual([[0, 1], [2, 3]], seq.getLinks("A", "B").tolist())
+
+            # links follow events moved by appending earlier events
+            seq.addEvents([Event("C", 0.5)])
+            self.assertEqual([[1, 2], [3, 4]], seq.getLinks("A", "B").tolist())
+            self.assertEqual([1, 2], seq.getLags("A", "B").tolist())
+
+    def test_trueLinks(self):
+        eventA1 = Event("A", 1)
+        eventA2 = Event("A", 2)
+        eventB = Event("B", 4)
+        eventA1.setTriggered(eventB)
+        eventA2.setTriggered(Event("C", 5))
+        eventA2.triggered.occurred = False
+        seq = Sequence([eventA1, eventA2, eventB, eventA2.triggered])
+
+        self.assertEqual([[0, 2]], seq.getTrueLinks("A", "B").tolist())
+        self.assertEqual([[1, 3]], seq.getTrueLinks("A", "C").tolist())
+        self.assertEqual([3], seq.getLags("A", "B", true=True).tolist())
+        self.assertEqual(0, len(seq.getLags("A", "C", true=True)))
+        self.assertEqual(0, len(seq.getTrueLinks("A", "D")))
+
+        # the links are extracted from the events once
+        self.assertIs(seq.asStorage(), seq.asStorage())
+        storage = seq.asStorage()
+        seq.addEvents([Event("A", 0.5)])
+        self.assertIsNot(storage, seq.asStorage())
+        self.assertEqual([[1, 3]], seq.getTrueLinks("A", "B").tolist())
+        storage = seq.asStorage()
+        seq.invalidateIndex()
+        self.assertIsNot(storage, seq.asStorage())
+
+    def test_resolution(self):
+        seq = sequence.fromColumns([1e9 + 0.3, 1e9 + 0.1, 1e9 + 0.7, 1e9 + 0.1], ["A", "B", "A", "C"], resolution=0.1)
+        s = seq.getStorage()
+        self.assertEqual(np.int64, s.timestamps.dtype)
+        self.assertEqual([10, 10, 12, 16], s.timestamps.tolist())
+        self.assertAlmostEqual(1e9 - 0.9, seq.firstTimestamp, places=5)
+        self.assertEqual([1.2, 1.6], seq.asVector("A").tolist())
+        self.assertEqual(["B", "C"], sorted(e.eventType for e in seq.getEventsAt(1.0)))
+        self.assertEqual([], seq.getEventsAt(1.1))
+        self.assertEqual([Event("A", 1.2)], seq.window(1.05, 1.6).events)
+
+        seq.addEvents([Event("D", 1e9 + 0.5)])
+        self.assertEqual([10, 10, 12, 14, 16], s.timestamps.tolist())
+        self.assertEqual([Event("D", 1.4)], seq.getEventsAt(1.4))
+
+        for filename in (TMP_FILE_NAME, TMP_FILE_NAME + ".bseq"):
+            try:
+                seq.store(filename)
+                seq2 = sequence.loadFromFile(filename, columnar=True)
+                self.assertEqual(0.1, seq2.resolution)
+                self.assertEqual(s.timestamps.tolist(), seq2.getStorage().timestamps.tolist())
+                self.assertEqual(seq.firstTimestamp, seq2.firstTimestamp)
+            finally:
+                os.remove(filename)
+
+        seq = Sequence([Event("A", 0.3), Event("B", 0.1 + 0.2)], resolution=0.1)
+        self.assertEqual(2, len(seq.getEventsAt(0.3)))
+
+    def test_windowResolution(self):
+        # 0.07 / 0.01 is not exactly 7, the window has to use the same tick as the stored event
+        seq = sequence.fromColumns([0.5, 0.07, 0.9], ["A", "B", "C"], resolution=0.01)
+        self.assertEqual(["B"], [e.eventType for e in seq.getEventsAt(0.07)])
+        self.assertEqual(["B", "A", "C"], [e.eventType for e in seq.window(0.07, 1).events])
+        self.assertEqual([], seq.window(0, 0.07).events)
+        self.assertEqual(["B"], [e.eventType for e in seq.window(0.065, 0.5).events])
+        self.assertEqual(["A", "C"], [e.eventType for e in seq.window(0.075, np.inf).events])
+
     def test_storeAndLoad(self):
         eventA = Event("A", 0)
         eventB = Event("B", 2)
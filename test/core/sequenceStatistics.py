@@ -0,0 +1,60 @@
+import unittest
+
+from core import sequence
+from core.corpus import SequenceCorpus
+from core.event import Event
+from core.sequence import Sequence
+
+
+class TestScript(unittest.TestCase):
+    def test_statistics(self):
+        for columnar in (False, True):
+            events = [Event("A", 1), Event("B", 2), Event("A", 4), Event("A", 8), Event("B", 9)]
+            seq = sequence.fromColumns([e.timestamp for e in events], [e.eventType for e in events]) if columnar \
+                else Sequence(events)
+            statistics = seq.getStatistics()
+            self.assertIs(statistics, seq.getStatistics())
+
+            self.assertEqual(5, statistics.size)
+            self.assertEqual(10, statistics.duration)
+            self.assertEqual({"A", "B"}, statistics.eventTypes)
+            self.assertEqual(3, statistics.getCount("A"))
+            self.assertEqual(0, statistics.getCount("C"))
+            self.assertAlmostEqual(0.6, statistics.getFrequency("A"))
+            self.assertAlmostEqual(2 / 10, statistics.getRate("B"))
+            self.assertEqual(1, statistics.getFirstTimestamp("A"))
+            self.assertEqual(8, statistics.getLastTimestamp("A"))
+            self.assertIsNone(statistics.getFirstTimestamp("C"))
+            self.assertEqual([3, 4], statistics.getInterArrivalTimes("A").tolist())
+            counts, edges = statistics.getInterArrivalHistogram("A", bins=2)
+            self.assertEqual([1, 1], counts.tolist())
+            self.assertEqual([3, 3.5, 4], edges.tolist())
+
+            seq.addEvents([Event("C", 11)])
+            self.assertIsNot(statistics, seq.getStatistics())
+            self.assertEqual(1, seq.getStatistics().getCount("C"))
+            self.assertEqual(6, seq.getStatistics().size)
+
+    def test_occurred(self):
+        seq = sequence.fromColumns([1, 2, 3], ["A", "A", "B"], occurred=[True, False, True])
+        statistics = seq.getStatistics()
+        self.assertEqual(2, statistics.getCount("A"))
+        self.assertEqual(1, statistics.getOccurredCount("A"))
+        self.assertEqual(len(seq.asVector("A")), statistics.getOccurredCount("A"))
+
+    def test_corpus(self):
+        corpus = SequenceCorpus([sequence.fromColumns([2, 3, 5], ["A", "B", "A"]),
+                                 sequence.fromColumns([4, 10], ["A", "A"])])
+        statistics = corpus.getStatistics()
+        self.assertIs(statistics, corpus.getStatistics())
+        self.assertEqual(5, statistics.size)
+        self.assertEqual(4, statistics.getCount("A"))
+        # inter-arrival times are not computed across sequences
+        self.assertEqual([3, 6], statistics.getInterArrivalTimes("A").tolist())
+
+        corpus[0].addEvents([Event("B", 8)])
+        self.assertEqual(2, corpus.getStatistics().getCount("B"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 
 import provider.generator
-from core.distribution import StaticDistribution
+from core.distribution import NormalDistribution, StaticDistribution, UniformDistribution
 from core.event import Event
 from core.rule import Rule
 
@@ -90,5 +90,41 @@ class TestScript(unittest.TestCase):
         self.assertIsNone(eventA5.triggered)
 
 
+    def test_createSequenceWithResolution(self):
+        # @formatter:off
+        sequence = provider.generator.Generator() \
+            .setSeqLength(6) \
+            .setResolution(0.25) \
+            .setRndNumber(StaticDistribution(rvs=[0])) \
+            .setRules([Rule(Event('A'), Event('B'), StaticDistribution(rvs=[1]), StaticDistribution(rvs=[1]))]) \
+            .create(None)
+        # @formatter:on
+
+        # colliding triggers are moved by one tick
+        self.assertEqual([1, 2, 2.25, 3.25, 3.5, 4.5, 4.75, 5.75], [e.timestamp for e in sequence.events])
+        self.assertEqual(0.25, sequence.resolution)
+        self.assertEqual([Event("A", 2.25)], sequence.getEventsAt(2.25))
+        self.assertEqual([225, 350, 475], (sequence.asVector("A")[1:] * 100).astype(int).tolist())
+
+        with self.assertRaises(ValueError):
+            provider.generator.Generator().setResolution(0.25).setDiscrete()
+        with self.assertRaises(ValueError):
+            provider.generator.Generator().setDiscrete().setResolution(0.25)
+
+    def test_seed(self):
+        def create(seed):
+            return provider.generator.Generator() \
+                .setNumberOfEvents(50) \
+                .setRules([Rule(Event('A'), Event('B'), UniformDistribution(0, 10), NormalDistribution(5, 1),
+                                successResponse=0.8)]) \
+                .setSeed(seed) \
+                .create(None)
+
+        first = create(42)
+        self.assertEqual([(e.eventType, e.timestamp) for e in first.events],
+                         [(e.eventType, e.timestamp) for e in create(42).events])
+        self.assertNotEqual([e.timestamp for e in first.events], [e.timestamp for e in create(43).events])
+
+
 if __name__ == '__main__':
     unittest.main()
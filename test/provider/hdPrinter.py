@@ -0,0 +1,29 @@
+import os
+import unittest
+
+from core import sequence
+from printerLog import PrinterLogTestCase
+from provider.hdPrinter import HDPrinterParser
+
+
+class TestScript(PrinterLogTestCase):
+    def test_chunkSequence(self):
+        log = self.writeLog("printer.csv", [(1, "A"), (2, "0X50010"), (50, "C"), (100, "B"), (110, "A"),
+                                             (120, "0X5001F")])
+        output = os.path.join(self.directory.name, "chunk")
+        HDPrinterParser().chunkSequence(log, output, offset=30)
+        parsed = HDPrinterParser().create(log)
+
+        # latest chunk first
+        chunk = sequence.loadFromFile(output + "-0.seq")
+        self.assertEqual(["B", "A", "0X5001F"], [e.eventType for e in chunk.events])
+        # the chunk is normalized to its own first event
+        self.assertEqual([1, 11, 21], [e.timestamp for e in chunk.events])
+        self.assertEqual(22, chunk.length)
+        self.assertEqual(parsed.firstTimestamp + 99, chunk.firstTimestamp)
+
+        chunk = sequence.loadFromFile(output + "-1.seq")
+        self.assertEqual(["A", "0X50010"], [e.eventType for e in chunk.events])
+        self.assertEqual({"A", "0X50010"}, set(chunk.eventTypes))
+        self.assertEqual(parsed.firstTimestamp, chunk.firstTimestamp)
+        self.assertEqual(3, chunk.length)
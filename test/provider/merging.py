@@ -0,0 +1,42 @@
+import unittest
+
+from printerLog import PrinterLogTestCase
+from provider import LogParser, MergingParser
+from provider.hdPrinter import HDPrinterParser
+
+
+class TestScript(PrinterLogTestCase):
+    def test_merge(self):
+        printer = self.writeLog("printer.csv", [(1, "A"), (4, "B"), (6, "A")])
+        other = self.writeLog("other.csv", [(2, "C"), (4, "D"), (9, "C")])
+
+        seq = MergingParser().addSource(HDPrinterParser(), printer).addSource(HDPrinterParser(), other, "other") \
+            .create(None)
+        self.assertEqual(["A", "C", "B", "D", "A", "C"], [e.eventType for e in seq.events])
+        self.assertEqual([1, 2, 4, 4, 6, 9], [e.timestamp for e in seq.events])
+        self.assertEqual(["printer.csv", "other", "printer.csv", "other", "printer.csv", "other"],
+                         [e.source for e in seq.events])
+
+    def test_filter(self):
+        printer = self.writeLog("printer.csv", [(1, "A"), (4, "B")])
+        other = self.writeLog("other.csv", [(2, "C"), (3, "B")])
+
+        seq = MergingParser().addSource(HDPrinterParser(), printer).addSource(HDPrinterParser(), other) \
+            .create(None, filter=["B"], resolution=0.5)
+        self.assertEqual(["A", "C"], [e.eventType for e in seq.events])
+        self.assertEqual(0.5, seq.resolution)
+
+    def test_noSources(self):
+        with self.assertRaises(ValueError):
+            MergingParser().create(None)
+
+    def test_incompleteParser(self):
+        class IncompleteParser(LogParser):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteParser()
+
+
+if __name__ == '__main__':
+    unittest.main()
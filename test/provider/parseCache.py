@@ -0,0 +1,79 @@
+import os
+import unittest
+
+from core.event import Event
+from printerLog import PrinterLogTestCase
+from provider.hdPrinter import HDPrinterParser
+from provider.parseCache import ParseCache
+
+
+class _CountingParser(HDPrinterParser):
+    calls = 0
+
+    def _parse(self, file, normalization):
+        _CountingParser.calls += 1
+        super()._parse(file, normalization)
+
+
+class TestScript(PrinterLogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ParseCache(os.path.join(self.directory.name, "cache"))
+        _CountingParser.calls = 0
+
+    def test_reuse(self):
+        log = self.writeLog("printer.csv", [(1, "A"), (3, "B"), (4, "A")])
+        seq = _CountingParser().create(log, cache=self.cache)
+        cached = _CountingParser().create(log, cache=self.cache)
+        self.assertEqual(1, _CountingParser.calls)
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(seq.events, cached.events)
+        self.assertEqual([Event("A", 1), Event("B", 3), Event("A", 4)], cached.events)
+
+    def test_settings(self):
+        log = self.writeLog("printer.csv", [(1, "A"), (3, "B"), (4, "A")])
+        _CountingParser().create(log, cache=self.cache)
+        seq = _CountingParser().create(log, whitelist=["A"], cache=self.cache)
+        self.assertEqual(["A", "A"], [e.eventType for e in seq.events])
+        _CountingParser().create(log, normalization=2, cache=self.cache)
+        _CountingParser().create(log, resolution=0.5, cache=self.cache)
+        self.assertEqual(4, _CountingParser.calls)
+
+        # same content in another file
+        copy = self.writeLog("copy.csv", [(1, "A"), (3, "B"), (4, "A")])
+        _CountingParser().create(copy, cache=self.cache)
+        self.assertEqual(4, _CountingParser.calls)
+
+        # modified content
+        self.writeLog("printer.csv", [(1, "A"), (3, "B"), (5, "A")])
+        seq = _CountingParser().create(log, cache=self.cache)
+        self.assertEqual(5, _CountingParser.calls)
+        self.assertEqual(5, seq.events[-1].timestamp)
+
+    def test_eviction(self):
+        first = self.writeLog("first.csv", [(1, "A"), (3, "B")])
+        second = self.writeLog("second.csv", [(1, "A"), (4, "B")])
+        _CountingParser().create(first, cache=self.cache)
+        self.cache.maxSize = self.cache.getSize()
+        key = self.cache.getKey(_CountingParser(), first, [], [], 1, None)
+        os.utime(os.path.join(self.cache.directory, key + ".bseq"), (0, 0))
+
+        _CountingParser().create(second, cache=self.cache)
+        self.assertEqual(1, len(self.cache))
+        self.assertIsNone(self.cache.get(key))
+        _CountingParser().create(second, cache=self.cache)
+        self.assertEqual(2, _CountingParser.calls)
+
+    def test_invalidEntry(self):
+        log = self.writeLog("printer.csv", [(1, "A"), (3, "B")])
+        key = self.cache.getKey(_CountingParser(), log, [], [], 1, None)
+        with open(os.path.join(self.cache.directory, key + ".bseq"), "w") as file:
+            file.write("invalid")
+        seq = _CountingParser().create(log, cache=self.cache)
+        self.assertEqual(1, _CountingParser.calls)
+        self.assertEqual(2, len(seq))
+        self.assertIsNotNone(self.cache.get(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
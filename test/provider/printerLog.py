@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+
+
+class PrinterLogTestCase(unittest.TestCase):
+    """ Base class of tests reading HD printer logs. Provides a temporary directory for the logs. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def writeLog(self, name, rows):
+        """ Writes a log with one event per row (seconds since 2020-01-01T00:00:00, event id) and returns its path. """
+        filename = os.path.join(self.directory.name, name)
+        with open(filename, "w") as file:
+            file.write("id;device;timestamp;event;text;status\n")
+            for second, eventId in rows:
+                file.write("0;0;2020-01-01T00:{:02d}:{:02d}+00:00;{};-;OK\n".format(second // 60, second % 60, eventId))
+        return filename
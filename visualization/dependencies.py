@@ -173,7 +173,7 @@ class DependencyTree(QGraphicsScene):
             if (rule is not None):
                 color = 150 if (rule.data["Mutual Information"] < self._threshold) else 0
                 widget = ResponsiveArrowWidget(startPoint, endPoint, color=color, parent=self)
-                widget._callbackParam = self.__sequence.getCalculatedRule(start, end)
+                widget._callbackParam = rule
                 self.addItem(widget)
 
         for key, value in self.__positions.items():
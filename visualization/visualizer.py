@@ -1,6 +1,5 @@
 """ Automatically generated documentation for Visualizer """
 import logging
-import math
 import os
 import sys
 
@@ -10,6 +9,9 @@ from PySide2.QtWidgets import (
     QVBoxLayout, QWidget)
 
 import core
+from algorithms import RESULT_IDX
+from algorithms.resultStore import ResultStore
+from core import binarySequence, compression
 from core.rule import Rule
 from core.sequence import Sequence
 from visualization import EventWidget, ArrowWidget
@@ -17,6 +19,14 @@ from visualization.dependencies import DependenciesView
 from visualization.details import DetailsContainer
 from visualization.settings import Settings
 
+# json sequences may be compressed
+SEQUENCE_EXTENSIONS = tuple(extension + suffix for extension in (".seq", ".json")
+                            for suffix in ("",) + compression.EXTENSIONS) + (binarySequence.EXTENSION,)
+SEQUENCE_FILTER = "Sequences ({});;All files (*)".format(" ".join("*" + extension for extension in SEQUENCE_EXTENSIONS))
+RESULT_FILTER = "Results (*.db *.sqlite);;All files (*)"
+# number of rules loaded from a result store
+RESULT_LIMIT = 100
+
 
 class ResponsiveEventWidget(EventWidget):
     def __init__(self, event, highLight, pos, size, parent=None):
@@ -51,9 +61,7 @@ class SequenceWidget(QGraphicsScene):
         renderLimit = 1000
         if (len(sequence) > renderLimit):
             logging.info("Truncating sequence to {} events to limit rendering time".format(renderLimit))
-            self.__sequence = Sequence(sequence.events[0: renderLimit],
-                                       math.ceil(sequence.events[renderLimit - 1].timestamp) + 1,
-                                       sequence.rules, sequence.calculatedRules)
+            self.__sequence = sequence.head(renderLimit)
 
         eventCount = 0
         prevTime = -1
@@ -67,29 +75,34 @@ class SequenceWidget(QGraphicsScene):
                 self.__eventWidgets[event2] = widget
                 eventCount += 1
 
-        for event, widget in self.__eventWidgets.items():
-            response = event.triggered
-            if (response is None or response.timestamp >= self.__sequence.length
-                or event.eventType in hidden or response.eventType in hidden):
-                continue
-
-            rule = sequence.getCalculatedRule(event, response)
-            if (rule is None):
-                rule = sequence.getRule(event, response)
-            if (rule is None):
+        # matched links replace the links used to generate the sequence
+        links = {}
+        for rule in self.__sequence.rules:
+            for trigger, response in self.__sequence.getTrueLinks(rule.trigger, rule.response):
+                links[trigger] = (response, rule)
+        for rule in self.__sequence.calculatedRules:
+            for trigger, response in self.__sequence.getLinks(rule.trigger, rule.response):
+                links[trigger] = (response, rule)
+
+        events = self.__sequence.events
+        for trigger, (response, rule) in links.items():
+            event = events[trigger]
+            responseEvent = events[response]
+            if (event.eventType in hidden or responseEvent.eventType in hidden or event not in self.__eventWidgets
+                    or responseEvent not in self.__eventWidgets):
                 continue
 
-            if (event.triggered in self.__eventWidgets):
-                triggeredWidget = self.__eventWidgets[event.triggered]
-                self.addItem(self.__createArrow(event, rule, widget, triggeredWidget))
+            widget = self.__eventWidgets[event]
+            triggeredWidget = self.__eventWidgets[responseEvent]
+            self.addItem(self.__createArrow(event, responseEvent, rule, widget, triggeredWidget))
 
-                # set up callbacks
-                widget._callbackParam = rule
-                triggeredWidget._callbackParam = rule
+            # set up callbacks
+            widget._callbackParam = rule
+            triggeredWidget._callbackParam = rule
 
     @staticmethod
-    def __createArrow(event, rule, widget, triggeredWidget):
-        distance = event.triggered.timestamp - event.timestamp
+    def __createArrow(event, responseEvent, rule, widget, triggeredWidget):
+        distance = responseEvent.timestamp - event.timestamp
         prob = rule.distributionResponse.getRelativePdf(distance)
         color = min(200, (1 - prob) * 255)
 
@@ -163,6 +176,12 @@ class Visualizer(QMainWindow):
         loadAction.triggered.connect(self.__loadSequence)
         sequenceMenu.addAction(loadAction)
 
+        resultsAction = QAction('Load Results', self)
+        resultsAction.setShortcut('Ctrl+R')
+        resultsAction.setStatusTip('Load best rules from result store')
+        resultsAction.triggered.connect(self.__loadResults)
+        sequenceMenu.addAction(resultsAction)
+
         saveAction = QAction('Save Sequence', self)
         saveAction.setShortcut('Ctrl+S')
         saveAction.setStatusTip('Save current sequence')
@@ -189,7 +208,7 @@ class Visualizer(QMainWindow):
 
     def __loadSequence(self):
         # noinspection PyCallByClass
-        fileName = QFileDialog.getOpenFileName(self, "Load Sequence", os.path.expanduser("~"))[0]
+        fileName = QFileDialog.getOpenFileName(self, "Load Sequence", os.path.expanduser("~"), SEQUENCE_FILTER)[0]
         if (len(fileName) == 0):
             return
 
@@ -206,12 +225,39 @@ class Visualizer(QMainWindow):
             return
         self.setSequence(seq)
 
+    def __loadResults(self):
+        if (self.__sequence is None):
+            self.statusBar().showMessage("No sequence loaded")
+            return
+        # noinspection PyCallByClass
+        fileName = QFileDialog.getOpenFileName(self, "Load Results", os.path.expanduser("~"), RESULT_FILTER)[0]
+        if (len(fileName) == 0):
+            return
+
+        logging.info("Loading results from file " + fileName)
+        with ResultStore(fileName) as store:
+            self.setResults(store)
+        self.statusBar().showMessage("Loaded results " + fileName)
+
+    def setResults(self, store, limit=RESULT_LIMIT):
+        """ Replaces the calculated rules of the current sequence by the rules with the highest likelihood in the given
+        ResultStore. """
+        rules = store.getTopRules(limit, assignment=True)
+        for rule in rules:
+            if (RESULT_IDX in rule.data):
+                try:
+                    self.__sequence.setLinks(rule.trigger, rule.response, rule.data[RESULT_IDX])
+                except IndexError:
+                    logging.warning("Stored assignment of {} does not match the events".format(rule))
+        self.__sequence.calculatedRules = rules
+        self.setSequence(self.__sequence)
+
     def __saveSequence(self):
         # noinspection PyCallByClass
-        fileName = QFileDialog.getSaveFileName(self, "Store Sequence", os.path.expanduser("~"))[0]
+        fileName = QFileDialog.getSaveFileName(self, "Store Sequence", os.path.expanduser("~"), SEQUENCE_FILTER)[0]
         if (len(fileName) == 0):
             return
-        if (fileName[-4:] != ".seq"):
+        if (not fileName.lower().endswith(SEQUENCE_EXTENSIONS)):
             fileName += ".seq"
 
         logging.info("Saving sequence to file " + fileName)